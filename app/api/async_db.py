@@ -0,0 +1,31 @@
+# app/api/async_db.py
+from typing import Any, AsyncIterator, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.settings import api_settings
+
+async_engine = create_async_engine(
+    api_settings.async_database_url,
+    pool_size=api_settings.ASYNC_DB_POOL_SIZE,
+    max_overflow=api_settings.ASYNC_DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+async def run_read(db: AsyncSession, fn: Callable[..., Any], *args: Any) -> Any:
+    """Run a sync service read on the async session and return its rows as loaded.
+
+    The smart_common services take a sync ``Session``; ``run_sync`` hands them
+    one bound to the asyncpg connection. FastAPI validates the rows once against
+    the route's ``response_model``, after this returns: the response may only read
+    what the service loaded, since a lazy load there raises ``MissingGreenlet``.
+    """
+    return await db.run_sync(lambda session: fn(session, *args))
@@ -0,0 +1,38 @@
+# app/api/collection_versions.py
+from sqlalchemy import Select, func, select
+
+from smart_common.models.device import Device
+from smart_common.models.installation import Installation
+from smart_common.models.microcontroller import Microcontroller
+from smart_common.models.provider import Provider
+
+# Each query returns (row count, newest updated_at) for the rows behind one listing:
+# an index-only aggregate, with no ORM hydration. Creates change the count or the
+# newest timestamp, updates (soft deletes included) move updated_at, and hard
+# deletes lower the count, so any write changes the version.
+
+
+def _version(model, *where) -> Select:
+    return select(func.count(model.id), func.max(model.updated_at)).where(*where)
+
+
+def installations_version(user_id: int) -> Select:
+    return _version(Installation, Installation.user_id == user_id)
+
+
+def microcontrollers_version(user_id: int, installation_id: int) -> Select:
+    return _version(
+        Microcontroller,
+        Microcontroller.installation_id == installation_id,
+        Microcontroller.installation_id.in_(
+            select(Installation.id).where(Installation.user_id == user_id)
+        ),
+    )
+
+
+def devices_version(microcontroller_id: int) -> Select:
+    return _version(Device, Device.microcontroller_id == microcontroller_id)
+
+
+def providers_version(microcontroller_id: int) -> Select:
+    return _version(Provider, Provider.microcontroller_id == microcontroller_id)
@@ -0,0 +1,138 @@
+import inspect
+import logging
+from typing import Awaitable, Callable, Optional
+
+from fastapi import Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security.base import SecurityBase
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.session import make_transient_to_detached
+
+from app.api.async_db import get_async_db
+from app.api.principal_cache import PrincipalCache, principal_cache
+from smart_common.core.db import get_db
+from smart_common.core.dependencies import get_current_user
+from smart_common.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+def _bearer_token(request: Request) -> Optional[str]:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return token
+
+
+def _detached(snapshot: dict) -> User:
+    # Only the cached principal columns are set; the rest lazy-loads once merged.
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return user
+
+
+def _wrap(
+    resolve: Callable,
+    cache: PrincipalCache,
+    session,
+    attach: Callable[[object, dict], Awaitable[User]],
+    load: Callable[[object, Callable], Awaitable[User]],
+) -> Callable:
+    """Put the principal cache in front of ``resolve``, the token → user dependency.
+
+    ``resolve`` may only depend on security schemes and ``get_db``: the wrapper
+    declares the same schemes (so FastAPI still rejects requests without a token)
+    and hands ``resolve`` its own session. Any other ``resolve`` is returned as is.
+    """
+    schemes, sessions = [], []
+    for name, param in inspect.signature(resolve).parameters.items():
+        dependency = getattr(param.default, "dependency", None)
+        if dependency is get_db:
+            sessions.append(name)
+        elif isinstance(dependency, SecurityBase):
+            schemes.append(param.replace(kind=inspect.Parameter.KEYWORD_ONLY))
+        else:
+            logger.warning(
+                "Principal cache disabled for %s: cannot fill in its parameter %r",
+                resolve.__name__,
+                name,
+            )
+            return resolve
+    if inspect.iscoroutinefunction(resolve):
+        logger.warning("Principal cache disabled for %s: it is a coroutine", resolve.__name__)
+        return resolve
+
+    async def off_loop(fn: Callable, *args):
+        # Only the Redis tier does I/O.
+        if cache.redis is None:
+            return fn(*args)
+        return await run_in_threadpool(fn, *args)
+
+    async def dependency(_principal_request: Request, _principal_db, **credentials) -> User:
+        token = _bearer_token(_principal_request)
+        snapshot = cache.get_local(token) if token else None
+        if snapshot is None and token:
+            snapshot = await off_loop(cache.get, token, User)
+        if snapshot is not None:
+            return await attach(_principal_db, snapshot)
+
+        generation = cache.generation()
+        user = await load(
+            _principal_db, lambda db: resolve(**credentials, **dict.fromkeys(sessions, db))
+        )
+        if token:
+            await off_loop(cache.put, token, user, generation)
+        return user
+
+    dependency.__signature__ = inspect.Signature(
+        [
+            inspect.Parameter(
+                "_principal_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request
+            ),
+            inspect.Parameter("_principal_db", inspect.Parameter.KEYWORD_ONLY, default=session),
+            *schemes,
+        ]
+    )
+    dependency.__name__ = f"cached_{resolve.__name__}"
+    return dependency
+
+
+def cached_current_user(
+    resolve: Callable = get_current_user, cache: PrincipalCache = principal_cache
+) -> Callable:
+    """``resolve`` behind the principal cache, for sync routes.
+
+    ``get_db`` is cached per request, so the user is merged into the same session
+    the route handler gets.
+    """
+
+    async def attach(db: Session, snapshot: dict) -> User:
+        return db.merge(_detached(snapshot), load=False)
+
+    async def load(db: Session, fn: Callable) -> User:
+        return await run_in_threadpool(fn, db)
+
+    return _wrap(resolve, cache, Depends(get_db), attach, load)
+
+
+def async_current_user(
+    resolve: Callable = get_current_user, cache: PrincipalCache = principal_cache
+) -> Callable:
+    """Variant of :func:`cached_current_user` for ``async def`` routes.
+
+    It only depends on the async session: a hit in the in-process tier returns
+    without leaving the event loop, and a miss runs ``resolve`` through
+    ``AsyncSession.run_sync``.
+    """
+
+    async def attach(db: AsyncSession, snapshot: dict) -> User:
+        return await db.merge(_detached(snapshot), load=False)
+
+    async def load(db: AsyncSession, fn: Callable) -> User:
+        return await db.run_sync(fn)
+
+    return _wrap(resolve, cache, Depends(get_async_db), attach, load)
+
+
+get_current_user_async = async_current_user()
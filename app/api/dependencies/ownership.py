@@ -0,0 +1,168 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.api.async_db import get_async_db
+from app.api.dependencies.current_user import get_current_user_async
+from smart_common.core.db import get_db
+from smart_common.core.dependencies import get_current_user
+from smart_common.models.device import Device
+from smart_common.models.installation import Installation
+from smart_common.models.microcontroller import Microcontroller
+from smart_common.models.provider import Provider
+from smart_common.models.user import User
+
+
+@dataclass
+class OwnedDevice:
+    microcontroller: Microcontroller
+    device: Device
+
+
+@dataclass
+class OwnedProvider:
+    microcontroller: Microcontroller
+    provider: Provider
+
+
+def _microcontroller_not_found() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Microcontroller not found")
+
+
+def _owned_microcontroller_query(installation_id: int, microcontroller_uuid: UUID, user_id: int):
+    return (
+        select(Microcontroller)
+        .join(Installation, Installation.id == Microcontroller.installation_id)
+        .where(
+            Microcontroller.uuid == microcontroller_uuid,
+            Microcontroller.installation_id == installation_id,
+            Installation.user_id == user_id,
+        )
+    )
+
+
+def _owned_device_query(
+    installation_id: int, microcontroller_uuid: UUID, device_id: int, user_id: int
+):
+    return (
+        _owned_microcontroller_query(installation_id, microcontroller_uuid, user_id)
+        .add_columns(Device)
+        .outerjoin(
+            Device,
+            and_(Device.microcontroller_id == Microcontroller.id, Device.id == device_id),
+        )
+    )
+
+
+def _owned_device(row) -> OwnedDevice:
+    if row is None:
+        raise _microcontroller_not_found()
+    microcontroller, device = row
+    if device is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Device not found for the selected microcontroller",
+        )
+    return OwnedDevice(microcontroller, device)
+
+
+def _owned_provider_query(
+    installation_id: int, microcontroller_uuid: UUID, provider_id: int, user_id: int
+):
+    return (
+        _owned_microcontroller_query(installation_id, microcontroller_uuid, user_id)
+        .add_columns(Provider)
+        .outerjoin(
+            Provider,
+            and_(Provider.microcontroller_id == Microcontroller.id, Provider.id == provider_id),
+        )
+    )
+
+
+def _owned_provider(row) -> OwnedProvider:
+    if row is None:
+        raise _microcontroller_not_found()
+    microcontroller, provider = row
+    if provider is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Provider not found")
+    return OwnedProvider(microcontroller, provider)
+
+
+def get_installation_microcontroller(
+    installation_id: int,
+    microcontroller_uuid: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Microcontroller:
+    """Resolve the microcontroller of a user's installation in one query."""
+    microcontroller = db.scalars(
+        _owned_microcontroller_query(installation_id, microcontroller_uuid, current_user.id)
+    ).first()
+    if microcontroller is None:
+        raise _microcontroller_not_found()
+    return microcontroller
+
+
+async def get_installation_microcontroller_async(
+    installation_id: int,
+    microcontroller_uuid: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+) -> Microcontroller:
+    """Async-session variant of :func:`get_installation_microcontroller`."""
+    microcontroller = (
+        await db.scalars(
+            _owned_microcontroller_query(installation_id, microcontroller_uuid, current_user.id)
+        )
+    ).first()
+    if microcontroller is None:
+        raise _microcontroller_not_found()
+    return microcontroller
+
+
+def get_owned_device(
+    installation_id: int,
+    microcontroller_uuid: UUID,
+    device_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> OwnedDevice:
+    """Resolve installation → microcontroller → device ownership in one query."""
+    row = db.execute(
+        _owned_device_query(installation_id, microcontroller_uuid, device_id, current_user.id)
+    ).first()
+    return _owned_device(row)
+
+
+async def get_owned_device_async(
+    installation_id: int,
+    microcontroller_uuid: UUID,
+    device_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+) -> OwnedDevice:
+    """Async-session variant of :func:`get_owned_device`."""
+    row = (
+        await db.execute(
+            _owned_device_query(installation_id, microcontroller_uuid, device_id, current_user.id)
+        )
+    ).first()
+    return _owned_device(row)
+
+
+def get_owned_provider(
+    installation_id: int,
+    microcontroller_uuid: UUID,
+    provider_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> OwnedProvider:
+    """Resolve installation → microcontroller → provider ownership in one query."""
+    row = db.execute(
+        _owned_provider_query(installation_id, microcontroller_uuid, provider_id, current_user.id)
+    ).first()
+    return _owned_provider(row)
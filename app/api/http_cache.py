@@ -0,0 +1,73 @@
+# app/api/http_cache.py
+import hashlib
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+
+def strong_etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """``If-None-Match`` check; it uses weak comparison, so ``W/`` prefixes are ignored."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in (tag.removeprefix("W/") for tag in candidates)
+
+
+def not_modified(request: Request, etag: str, cache_control: str) -> Optional[Response]:
+    """A 304 for ``request`` if the client already holds ``etag``, otherwise ``None``."""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": cache_control},
+        )
+    return None
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    """A pre-serialized JSON body with its strong ETag."""
+
+    body: bytes
+    etag: str
+
+    @classmethod
+    def from_bytes(cls, body: bytes) -> "CachedBody":
+        return cls(body, strong_etag(body))
+
+    def response(self, request: Request, cache_control: str) -> Response:
+        return not_modified(request, self.etag, cache_control) or Response(
+            content=self.body,
+            media_type="application/json",
+            headers={"ETag": self.etag, "Cache-Control": cache_control},
+        )
+
+
+def collection_etag(*parts) -> str:
+    """Strong ETag for a collection from its version parts (owner, count, last change...)."""
+    return strong_etag(repr(parts).encode())
+
+
+def conditional_collection(
+    request: Request,
+    response: Response,
+    etag: str,
+    cache_control: str = "private, no-cache",
+) -> Optional[Response]:
+    """Set the validators on ``response``; return a 304 instead if the client is current.
+
+    Only the ETag is a validator: the newest ``updated_at`` does not move when a row is
+    hard-deleted, so it is not sent as ``Last-Modified`` for ``If-Modified-Since``.
+    """
+    cached = not_modified(request, etag, cache_control)
+    if cached is not None:
+        return cached
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return None
@@ -0,0 +1,93 @@
+# app/api/pagination.py
+import base64
+import json
+from datetime import datetime
+from typing import Generic, Literal, Optional, TypeVar
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from smart_common.schemas.pagination_schema import PaginatedResponse, PaginationMeta
+
+T = TypeVar("T")
+
+CountMode = Literal["estimate", "exact", "none"]
+
+
+class CursorPaginationMeta(PaginationMeta):
+    """``PaginationMeta`` extended for cursor pages and count modes.
+
+    An offset page with ``count=exact`` fills the original fields as before.
+    """
+
+    limit: int
+    # Set on offset pages only; cursor pages have no position.
+    offset: Optional[int] = None
+    # None with count=none; planner statistics with count=estimate.
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+    # Pass back as ``cursor`` for the next page; None on the last page.
+    next_cursor: Optional[str] = None
+
+
+class CursorPage(PaginatedResponse[T], Generic[T]):
+    meta: CursorPaginationMeta
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def _planner_rows(db: Session, statement: Select) -> int:
+    plan = db.execute(_Explain(statement)).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_rows(db: Session, model, where: list, mode: CountMode) -> tuple[Optional[int], bool]:
+    """Row count for a filtered listing and whether it is an estimate.
+
+    ``estimate`` reads ``pg_class.reltuples`` when unfiltered and the planner's
+    row estimate otherwise. Both are constant-time and only as fresh as the last
+    ANALYZE; other databases fall back to an exact count.
+    """
+    if mode == "none":
+        return None, False
+    if mode == "estimate" and db.get_bind().dialect.name == "postgresql":
+        if not where:
+            reltuples = db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                {"table": model.__table__.name},
+            ).scalar()
+            # -1 until the table is first vacuumed or analyzed.
+            if reltuples is not None and reltuples >= 0:
+                return int(reltuples), True
+        else:
+            return _planner_rows(db, select(model.id).where(*where)), True
+    return db.scalar(select(func.count(model.id)).where(*where)), False
@@ -0,0 +1,101 @@
+# app/api/power_history_export.py
+import csv
+import io
+from typing import Iterable, Iterator, Sequence
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrow"),
+}
+
+
+def iter_csv(
+    columns: list[tuple[str, str]], partitions: Iterable[Sequence[tuple]]
+) -> Iterator[bytes]:
+    """Encode partitions of rows as CSV, yielding one chunk of bytes per partition."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in columns])
+    timestamp_indexes = [i for i, (_, kind) in enumerate(columns) if kind == "timestamp"]
+
+    for rows in partitions:
+        for row in rows:
+            row = list(row)
+            for i in timestamp_indexes:
+                row[i] = row[i].isoformat()
+            writer.writerow(row)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object whose contents are drained after every row group."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_schema(pa, columns: list[tuple[str, str]]):
+    types = {
+        "string": pa.string(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+        "float": pa.float64(),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in columns])
+
+
+def _arrow_batches(pa, schema, partitions: Iterable[Sequence[tuple]]):
+    for rows in partitions:
+        if rows:
+            yield pa.RecordBatch.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(zip(*rows), schema)],
+                schema=schema,
+            )
+
+
+def iter_parquet(
+    columns: list[tuple[str, str]], partitions: Iterable[Sequence[tuple]]
+) -> Iterator[bytes]:
+    """Encode partitions as a zstd-compressed Parquet file, one row group per partition."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(pa, columns)
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for batch in _arrow_batches(pa, schema, partitions):
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def iter_arrow(
+    columns: list[tuple[str, str]], partitions: Iterable[Sequence[tuple]]
+) -> Iterator[bytes]:
+    """Encode partitions as an Arrow IPC stream, one record batch per partition."""
+    import pyarrow as pa
+
+    schema = _arrow_schema(pa, columns)
+    sink = _ChunkSink()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for batch in _arrow_batches(pa, schema, partitions):
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
@@ -0,0 +1,259 @@
+# app/api/principal_cache.py
+import base64
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from enum import Enum
+from typing import Optional
+
+from redis import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import inspect as sa_inspect
+
+from app.api.settings import api_settings
+
+logger = logging.getLogger(__name__)
+
+# Columns kept in the cache, when the model has them. Everything else (password hash,
+# vendor credentials, ...) stays in the database and lazy-loads if a handler needs it.
+PRINCIPAL_FIELDS = ("id", "email", "role", "is_active", "token_version", "password_changed_at")
+
+
+def token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def token_expiry(token: str) -> Optional[float]:
+    """Return the ``exp`` claim of a JWT without verifying it (it was verified on the miss)."""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _principal_columns(model) -> list:
+    return [attr for attr in sa_inspect(model).column_attrs if attr.key in PRINCIPAL_FIELDS]
+
+
+def snapshot_user(user) -> dict:
+    """The :data:`PRINCIPAL_FIELDS` of a user row, enough to authorize without a query."""
+    return {attr.key: getattr(user, attr.key) for attr in _principal_columns(type(user))}
+
+
+def _encode(snapshot: dict) -> str:
+    def default(value):
+        if isinstance(value, Enum):
+            return value.value
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return str(value)
+
+    return json.dumps(snapshot, default=default)
+
+
+def decode_snapshot(model, data: str) -> dict:
+    """Inverse of the JSON encoding, restoring enums and datetimes from column types."""
+    stored = json.loads(data)
+    snapshot = {}
+    for attr in _principal_columns(model):
+        value = stored.get(attr.key)
+        try:
+            python_type = attr.columns[0].type.python_type
+        except NotImplementedError:
+            python_type = object
+        if value is not None and issubclass(python_type, Enum):
+            value = python_type(value)
+        elif value is not None and issubclass(python_type, (datetime, date)):
+            value = python_type.fromisoformat(value)
+        snapshot[attr.key] = value
+    return snapshot
+
+
+class PrincipalCache:
+    """Authenticated users by access token: a bounded in-process LRU with TTL, optionally
+    backed by Redis as a second tier shared by all API processes.
+
+    Entries live at most ``ttl_seconds`` and never past the token's own expiry.
+    :meth:`invalidate_user` and :meth:`clear` drop entries locally, in Redis, and in
+    the other processes through a pub/sub message (see :meth:`start_listener`).
+    Redis errors are logged and the cache degrades to its in-process tier.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        max_size: int,
+        redis: Optional[Redis] = None,
+        key_prefix: str = "auth:principal",
+        clock=time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.redis = redis
+        self.key_prefix = key_prefix
+        self.channel = f"{key_prefix}:invalidate"
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        # Bumped by every invalidation; see :meth:`generation`.
+        self._generation = 0
+        self._listener: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.key_prefix}:{key}"
+
+    def _user_key(self, user_id: int) -> str:
+        return f"{self.key_prefix}:user:{user_id}"
+
+    def _store_local(self, key: str, snapshot: dict, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def generation(self) -> int:
+        """Read before loading a user and hand to :meth:`put`, so a user invalidated
+        meanwhile is not cached."""
+        return self._generation
+
+    def get_local(self, token: str) -> Optional[dict]:
+        """Look ``token`` up in the in-process tier only; never does I/O."""
+        if not self.enabled:
+            return None
+        key = token_key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, snapshot = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return snapshot
+
+    def get(self, token: str, model) -> Optional[dict]:
+        snapshot = self.get_local(token)
+        if snapshot is not None or self.redis is None or not self.enabled:
+            return snapshot
+        key = token_key(token)
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.get(self._redis_key(key))
+            pipe.pttl(self._redis_key(key))
+            data, pttl = pipe.execute()
+        except RedisError as e:
+            logger.warning(f"[PrincipalCache] Redis read failed: {e}")
+            return None
+        if data is None or pttl is None or pttl <= 0:
+            return None
+
+        snapshot = decode_snapshot(model, data)
+        self._store_local(key, snapshot, min(pttl / 1000, self.ttl_seconds))
+        return snapshot
+
+    def put(self, token: str, user, generation: Optional[int] = None) -> None:
+        """Cache ``user`` for ``token`` unless an invalidation happened since ``generation``."""
+        if not self.enabled or (generation is not None and generation != self._generation):
+            return
+        ttl = float(self.ttl_seconds)
+        expires_at = token_expiry(token)
+        if expires_at is not None:
+            ttl = min(ttl, expires_at - time.time())
+        if ttl <= 0:
+            return
+
+        key = token_key(token)
+        snapshot = snapshot_user(user)
+        self._store_local(key, snapshot, ttl)
+        if self.redis is None:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.set(self._redis_key(key), _encode(snapshot), px=int(ttl * 1000))
+            # Lets invalidate_user find every token of the user.
+            pipe.sadd(self._user_key(user.id), key)
+            pipe.expire(self._user_key(user.id), self.ttl_seconds)
+            pipe.execute()
+        except RedisError as e:
+            logger.warning(f"[PrincipalCache] Redis write failed: {e}")
+
+    def _drop_local(self, user_id: Optional[int]) -> None:
+        with self._lock:
+            self._generation += 1
+            if user_id is None:
+                self._entries.clear()
+                return
+            for key, (_, snapshot) in list(self._entries.items()):
+                if snapshot["id"] == user_id:
+                    del self._entries[key]
+
+    def invalidate_user(self, user_id: int) -> None:
+        self._drop_local(user_id)
+        if self.redis is None:
+            return
+        try:
+            keys = self.redis.smembers(self._user_key(user_id))
+            pipe = self.redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.delete(self._redis_key(key.decode() if isinstance(key, bytes) else key))
+            pipe.delete(self._user_key(user_id))
+            pipe.publish(self.channel, str(user_id))
+            pipe.execute()
+        except RedisError as e:
+            logger.error(f"[PrincipalCache] Could not invalidate user {user_id} in Redis: {e}")
+
+    def clear(self) -> None:
+        self._drop_local(None)
+        if self.redis is None:
+            return
+        try:
+            for key in self.redis.scan_iter(match=f"{self.key_prefix}:*", count=1000):
+                self.redis.delete(key)
+            self.redis.publish(self.channel, "*")
+        except RedisError as e:
+            logger.error(f"[PrincipalCache] Could not clear Redis tier: {e}")
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    data = message["data"]
+                    data = data.decode() if isinstance(data, bytes) else data
+                    self._drop_local(None if data == "*" else int(data))
+            except (RedisError, ValueError) as e:
+                logger.warning(f"[PrincipalCache] Invalidation listener error: {e}")
+                # Entries may have been missed while disconnected.
+                self._drop_local(None)
+                time.sleep(1)
+
+    def start_listener(self) -> None:
+        """Follow invalidations from other processes (only needed with Redis)."""
+        if self.redis is None or not self.enabled or self._listener is not None:
+            return
+        self._listener = threading.Thread(
+            target=self._listen, name="principal-cache-invalidation", daemon=True
+        )
+        self._listener.start()
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=api_settings.AUTH_CACHE_TTL_SECONDS,
+    max_size=api_settings.AUTH_CACHE_MAX_SIZE,
+    redis=Redis.from_url(api_settings.AUTH_CACHE_REDIS_URL)
+    if api_settings.AUTH_CACHE_REDIS_URL
+    else None,
+)
@@ -3,6 +3,7 @@ import logging
 from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
+from app.api.principal_cache import principal_cache
 from smart_common.core.db import get_db
 from smart_common.core.dependencies import get_current_user
 from smart_common.models.user import User
@@ -98,6 +99,8 @@ def confirm_password_reset(
     payload: PasswordResetConfirm, db: Session = Depends(get_db)
 ) -> MessageResponse:
     _get_auth_service(db).reset_password(payload.token, payload.new_password)
+    # The reset token does not name the user here; drop every cached principal.
+    principal_cache.clear()
     return MessageResponse(message="Password has been updated")
 
 
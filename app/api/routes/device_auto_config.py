@@ -3,12 +3,12 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.api.dependencies.ownership import OwnedDevice, get_owned_device
 from smart_common.core.db import get_db
 from smart_common.core.dependencies import get_current_user
 from smart_common.models.user import User
 from smart_common.repositories.device import DeviceRepository
 from smart_common.repositories.device_auto_config import DeviceAutoConfigRepository
-from smart_common.repositories.microcontroller import MicrocontrollerRepository
 from smart_common.repositories.provider import ProviderRepository
 from smart_common.schemas.device_auto_config import (DeviceAutoConfigRequest,
                                                      DeviceAutoConfigResponse,
@@ -27,21 +27,6 @@ service = DeviceAutoConfigService(
 )
 
 
-def _validate_microcontroller(
-    db: Session,
-    installation_id: int,
-    microcontroller_uuid: UUID,
-    user_id: int,
-):
-    repo = MicrocontrollerRepository(db)
-    microcontroller = repo.get_for_user_by_uuid(microcontroller_uuid, user_id)
-    if not microcontroller or microcontroller.installation_id != installation_id:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Microcontroller not found"
-        )
-    return microcontroller
-
-
 @router.get(
     "/",
     response_model=DeviceAutoConfigResponse,
@@ -53,13 +38,11 @@ def get_auto_config(
     installation_id: int,
     microcontroller_uuid: UUID,
     device_id: int,
+    owned: OwnedDevice = Depends(get_owned_device),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> DeviceAutoConfigResponse:
-    microcontroller = _validate_microcontroller(
-        db, installation_id, microcontroller_uuid, current_user.id
-    )
-    config = service.get_config(db, current_user.id, device_id, microcontroller.id)
+    config = service.get_config(db, current_user.id, device_id, owned.microcontroller.id)
     if not config:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="AUTO configuration not found"
@@ -79,14 +62,12 @@ def create_auto_config(
     microcontroller_uuid: UUID,
     device_id: int,
     payload: DeviceAutoConfigRequest,
+    owned: OwnedDevice = Depends(get_owned_device),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> DeviceAutoConfigResponse:
-    microcontroller = _validate_microcontroller(
-        db, installation_id, microcontroller_uuid, current_user.id
-    )
     return service.create_or_update(
-        db, current_user.id, device_id, microcontroller.id, payload.model_dump()
+        db, current_user.id, device_id, owned.microcontroller.id, payload.model_dump()
     )
 
 
@@ -102,14 +83,12 @@ def update_auto_config(
     microcontroller_uuid: UUID,
     device_id: int,
     payload: DeviceAutoConfigRequest,
+    owned: OwnedDevice = Depends(get_owned_device),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> DeviceAutoConfigResponse:
-    microcontroller = _validate_microcontroller(
-        db, installation_id, microcontroller_uuid, current_user.id
-    )
     return service.create_or_update(
-        db, current_user.id, device_id, microcontroller.id, payload.model_dump()
+        db, current_user.id, device_id, owned.microcontroller.id, payload.model_dump()
     )
 
 
@@ -125,10 +104,10 @@ def set_auto_config_status(
     microcontroller_uuid: UUID,
     device_id: int,
     payload: DeviceAutoConfigStatusRequest,
+    owned: OwnedDevice = Depends(get_owned_device),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> DeviceAutoConfigResponse:
-    microcontroller = _validate_microcontroller(
-        db, installation_id, microcontroller_uuid, current_user.id
+    return service.set_enabled(
+        db, current_user.id, device_id, owned.microcontroller.id, payload.enabled
     )
-    return service.set_enabled(db, current_user.id, device_id, microcontroller.id, payload.enabled)
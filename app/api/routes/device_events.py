@@ -1,16 +1,16 @@
 from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from smart_common.core.db import get_db
-from smart_common.core.dependencies import get_current_user
+from app.api.async_db import get_async_db, run_read
+from app.api.dependencies.current_user import get_current_user_async
+from app.api.dependencies.ownership import OwnedDevice, get_owned_device_async
 from smart_common.enums.device_event import DeviceEventType
 from smart_common.models.user import User
 from smart_common.repositories.device import DeviceRepository
 from smart_common.repositories.device_event import DeviceEventRepository
-from smart_common.repositories.microcontroller import MicrocontrollerRepository
 from smart_common.schemas.device_events import DeviceEventTimelineResponse
 from smart_common.services.device_event_service import DeviceEventService
 
@@ -25,21 +25,6 @@ service = DeviceEventService(
 )
 
 
-def _validate_microcontroller(
-    db: Session,
-    installation_id: int,
-    microcontroller_uuid: UUID,
-    user_id: int,
-):
-    repo = MicrocontrollerRepository(db)
-    microcontroller = repo.get_for_user_by_uuid(microcontroller_uuid, user_id)
-    if not microcontroller or microcontroller.installation_id != installation_id:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Microcontroller not found"
-        )
-    return microcontroller
-
-
 @router.get(
     "/",
     response_model=DeviceEventTimelineResponse,
@@ -47,7 +32,7 @@ def _validate_microcontroller(
     summary="List device events",
     description="Returns device events with telemetry summary over a time window.",
 )
-def list_device_events(
+async def list_device_events(
     installation_id: int,
     microcontroller_uuid: UUID,
     device_id: int,
@@ -63,14 +48,13 @@ def list_device_events(
         description="Optional filter for event type",
         example=DeviceEventType.STATE.value,
     ),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    owned: OwnedDevice = Depends(get_owned_device_async),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ) -> DeviceEventTimelineResponse:
-    microcontroller = _validate_microcontroller(
-        db, installation_id, microcontroller_uuid, current_user.id
-    )
-    timeline = service.list_device_events(
+    return await run_read(
         db,
+        service.list_device_events,
         current_user.id,
         device_id,
         limit,
@@ -78,4 +62,3 @@ def list_device_events(
         date_end,
         event_type,
     )
-    return DeviceEventTimelineResponse.model_validate(timeline)
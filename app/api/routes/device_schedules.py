@@ -1,14 +1,14 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.orm import Session
 
+from app.api.dependencies.ownership import OwnedDevice, get_owned_device
 from smart_common.core.db import get_db
 from smart_common.core.dependencies import get_current_user
 from smart_common.models.user import User
 from smart_common.repositories.device import DeviceRepository
 from smart_common.repositories.device_schedule import DeviceScheduleRepository
-from smart_common.repositories.microcontroller import MicrocontrollerRepository
 from smart_common.schemas.device_schedules import (DeviceScheduleCreateRequest,
                                                    DeviceScheduleResponse,
                                                    DeviceScheduleUpdateRequest)
@@ -25,21 +25,6 @@ service = DeviceScheduleService(
 )
 
 
-def _validate_microcontroller(
-    db: Session,
-    installation_id: int,
-    microcontroller_uuid: UUID,
-    user_id: int,
-):
-    repo = MicrocontrollerRepository(db)
-    microcontroller = repo.get_for_user_by_uuid(microcontroller_uuid, user_id)
-    if not microcontroller or microcontroller.installation_id != installation_id:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Microcontroller not found"
-        )
-    return microcontroller
-
-
 @router.get(
     "/",
     response_model=list[DeviceScheduleResponse],
@@ -51,13 +36,11 @@ def list_schedules(
     installation_id: int,
     microcontroller_uuid: UUID,
     device_id: int,
+    owned: OwnedDevice = Depends(get_owned_device),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> list[DeviceScheduleResponse]:
-    microcontroller = _validate_microcontroller(
-        db, installation_id, microcontroller_uuid, current_user.id
-    )
-    return service.list_for_device(db, current_user.id, device_id, microcontroller.id)
+    return service.list_for_device(db, current_user.id, device_id, owned.microcontroller.id)
 
 
 @router.post(
@@ -72,13 +55,13 @@ def create_schedule(
     microcontroller_uuid: UUID,
     device_id: int,
     payload: DeviceScheduleCreateRequest,
+    owned: OwnedDevice = Depends(get_owned_device),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> DeviceScheduleResponse:
-    microcontroller = _validate_microcontroller(
-        db, installation_id, microcontroller_uuid, current_user.id
+    return service.create_schedule(
+        db, current_user.id, owned.microcontroller.id, payload.model_dump()
     )
-    return service.create_schedule(db, current_user.id, microcontroller.id, payload.model_dump())
 
 
 @router.put(
@@ -94,16 +77,14 @@ def update_schedule(
     device_id: int,
     schedule_id: int,
     payload: DeviceScheduleUpdateRequest,
+    owned: OwnedDevice = Depends(get_owned_device),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> DeviceScheduleResponse:
-    microcontroller = _validate_microcontroller(
-        db, installation_id, microcontroller_uuid, current_user.id
-    )
     return service.update_schedule(
         db,
         current_user.id,
-        microcontroller.id,
+        owned.microcontroller.id,
         schedule_id,
         payload.model_dump(exclude_unset=True),
     )
@@ -120,11 +101,9 @@ def delete_schedule(
     microcontroller_uuid: UUID,
     device_id: int,
     schedule_id: int,
+    owned: OwnedDevice = Depends(get_owned_device),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> Response:
-    microcontroller = _validate_microcontroller(
-        db, installation_id, microcontroller_uuid, current_user.id
-    )
-    service.delete_schedule(db, current_user.id, microcontroller.id, schedule_id)
+    service.delete_schedule(db, current_user.id, owned.microcontroller.id, schedule_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,11 +1,21 @@
+import asyncio
+from typing import Any, Coroutine
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.api.async_db import get_async_db, run_read
+from app.api.collection_versions import devices_version
+from app.api.dependencies.current_user import get_current_user_async
+from app.api.dependencies.ownership import (get_installation_microcontroller,
+                                             get_installation_microcontroller_async,
+                                             get_owned_device)
+from app.api.http_cache import collection_etag, conditional_collection
 from smart_common.core.db import get_db
 from smart_common.core.dependencies import get_current_user
-from smart_common.models.device import Device
+from smart_common.models.microcontroller import Microcontroller
 from smart_common.models.user import User
 from smart_common.repositories.device import DeviceRepository
 from smart_common.repositories.microcontroller import MicrocontrollerRepository
@@ -23,24 +33,13 @@ device_service = DeviceService(
 )
 
 
-def _validate_microcontroller(
-    db: Session, installation_id: int, microcontroller_uuid: UUID, user_id: int
-):
-    repo = MicrocontrollerRepository(db)
-    microcontroller = repo.get_for_user_by_uuid(microcontroller_uuid, user_id)
-    if not microcontroller or microcontroller.installation_id != installation_id:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Microcontroller not found"
-        )
-    return microcontroller
-
+def _complete(write: Coroutine[Any, Any, Any]) -> Any:
+    """Run a DeviceService write to completion on the calling threadpool thread.
 
-def _ensure_device_belongs_to(mc_id: int, device: Device):
-    if device.microcontroller_id != mc_id:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Device not found for the selected microcontroller",
-        )
+    The service methods are coroutines but do their work on a sync ``Session``; the
+    write routes are plain ``def`` so that work never blocks the event loop.
+    """
+    return asyncio.run(write)
 
 
 @router.get(
@@ -50,14 +49,27 @@ def _ensure_device_belongs_to(mc_id: int, device: Device):
     summary="List devices",
     description="Lists all devices attached to the selected microcontroller.",
 )
-def list_devices(
+async def list_devices(
     installation_id: int,
     microcontroller_uuid: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    microcontroller: Microcontroller = Depends(get_installation_microcontroller_async),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ) -> list[DeviceResponse]:
-    _validate_microcontroller(db, installation_id, microcontroller_uuid, current_user.id)
-    return device_service.list_for_microcontroller(db, current_user.id, microcontroller_uuid)
+    count, last_modified = (await db.execute(devices_version(microcontroller.id))).one()
+    etag = collection_etag("devices", microcontroller.id, count, last_modified)
+    not_modified = conditional_collection(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
+    return await run_read(
+        db,
+        device_service.list_for_microcontroller,
+        current_user.id,
+        microcontroller_uuid,
+    )
 
 
 @router.post(
@@ -67,16 +79,18 @@ def list_devices(
     summary="Create device",
     description="Registers a new device under the selected microcontroller.",
 )
-async def create_device(
+def create_device(
     installation_id: int,
     microcontroller_uuid: UUID,
     payload: DeviceCreateRequest,
+    microcontroller: Microcontroller = Depends(get_installation_microcontroller),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> DeviceResponse:
-    _validate_microcontroller(db, installation_id, microcontroller_uuid, current_user.id)
-    return await device_service.create_device(
-        db, current_user.id, microcontroller_uuid, payload.model_dump()
+    return _complete(
+        device_service.create_device(
+            db, current_user.id, microcontroller_uuid, payload.model_dump()
+        )
     )
 
 
@@ -86,8 +100,10 @@ async def create_device(
     status_code=200,
     summary="Update device",
     description="Updates a device assigned to the microcontroller.",
+    # Ownership check only: DeviceService takes ids and loads the device itself.
+    dependencies=[Depends(get_owned_device)],
 )
-async def update_device(
+def update_device(
     installation_id: int,
     microcontroller_uuid: UUID,
     device_id: int,
@@ -95,13 +111,10 @@ async def update_device(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> DeviceResponse:
-    microcontroller = _validate_microcontroller(
-        db, installation_id, microcontroller_uuid, current_user.id
-    )
-    device = device_service.get_device(db, device_id, current_user.id)
-    _ensure_device_belongs_to(microcontroller.id, device)
-    return await device_service.update_device(
-        db, current_user.id, device_id, payload.model_dump(exclude_unset=True)
+    return _complete(
+        device_service.update_device(
+            db, current_user.id, device_id, payload.model_dump(exclude_unset=True)
+        )
     )
 
 
@@ -110,18 +123,14 @@ async def update_device(
     status_code=204,
     summary="Delete device",
     description="Deletes a device that belongs to the chosen microcontroller.",
+    dependencies=[Depends(get_owned_device)],
 )
-async def delete_device(
+def delete_device(
     installation_id: int,
     microcontroller_uuid: UUID,
     device_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> Response:
-    microcontroller = _validate_microcontroller(
-        db, installation_id, microcontroller_uuid, current_user.id
-    )
-    device = device_service.get_device(db, device_id, current_user.id)
-    _ensure_device_belongs_to(microcontroller.id, device)
-    await device_service.delete_device(db, current_user.id, device_id)
+    _complete(device_service.delete_device(db, current_user.id, device_id))
     return Response(status_code=status.HTTP_204_NO_CONTENT)
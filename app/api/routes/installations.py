@@ -1,6 +1,11 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.api.async_db import get_async_db, run_read
+from app.api.collection_versions import installations_version
+from app.api.dependencies.current_user import get_current_user_async
+from app.api.http_cache import collection_etag, conditional_collection
 from smart_common.core.db import get_db
 from smart_common.core.dependencies import get_current_user
 from smart_common.models.user import User
@@ -25,11 +30,23 @@ installation_service = InstallationService(lambda db: InstallationRepository(db)
     summary="List user installations",
     description="Returns all active installations owned by the authenticated user.",
 )
-def list_installations(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def list_installations(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ) -> list[InstallationResponse]:
-    return installation_service.list_for_user(db, current_user.id)
+    count, last_modified = (await db.execute(installations_version(current_user.id))).one()
+    etag = collection_etag("installations", current_user.id, count, last_modified)
+    not_modified = conditional_collection(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
+    return await run_read(
+        db,
+        installation_service.list_for_user,
+        current_user.id,
+    )
 
 
 # ------------------------------------
@@ -68,13 +85,14 @@ def create_installation(
     summary="Get installation details",
     description="Returns details for a specific installation if it belongs to the user.",
 )
-def get_installation(
+async def get_installation(
     installation_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ) -> InstallationResponse:
-    return installation_service.get_for_user(
+    return await run_read(
         db,
+        installation_service.get_for_user,
         installation_id,
         current_user.id,
     )
@@ -1,8 +1,13 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.api.async_db import get_async_db, run_read
+from app.api.collection_versions import microcontrollers_version
+from app.api.dependencies.current_user import get_current_user_async
+from app.api.http_cache import collection_etag, conditional_collection
 from smart_common.core.db import get_db
 from smart_common.core.dependencies import get_current_user
 from smart_common.models.user import User
@@ -38,12 +43,29 @@ def _ensure_installation_matches(installation_id: int, microcontroller) -> None:
     summary="List microcontrollers",
     description="Lists all microcontrollers registered under the requested installation.",
 )
-def list_microcontrollers(
+async def list_microcontrollers(
     installation_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ) -> list[MicrocontrollerResponse]:
-    return microcontroller_service.list_for_installation(db, current_user.id, installation_id)
+    count, last_modified = (
+        await db.execute(microcontrollers_version(current_user.id, installation_id))
+    ).one()
+    etag = collection_etag(
+        "microcontrollers", current_user.id, installation_id, count, last_modified
+    )
+    not_modified = conditional_collection(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
+    return await run_read(
+        db,
+        microcontroller_service.list_for_installation,
+        current_user.id,
+        installation_id,
+    )
 
 
 @router.post(
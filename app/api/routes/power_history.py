@@ -0,0 +1,80 @@
+from datetime import datetime
+from importlib.util import find_spec
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.api.power_history_export import EXPORT_FORMATS, iter_arrow, iter_csv, iter_parquet
+from app.api.settings import api_settings
+from app.repositories.inverter_power_export_repository import (INTERVAL_EXPORT_COLUMNS,
+                                                               RECORD_EXPORT_COLUMNS,
+                                                               InverterPowerExportRepository)
+from smart_common.core.db import get_db
+from smart_common.core.dependencies import get_current_user
+from smart_common.models.user import User
+from smart_common.repositories.installation import InstallationRepository
+from smart_common.services.installation_service import InstallationService
+
+router = APIRouter(prefix="/installations", tags=["Power history"])
+
+installation_service = InstallationService(lambda db: InstallationRepository(db))
+
+EXPORT_CHUNK_SIZE = 5000
+
+_ENCODERS = {"csv": iter_csv, "parquet": iter_parquet, "arrow": iter_arrow}
+
+# ------------------------------------
+# EXPORT
+# ------------------------------------
+
+
+@router.get(
+    "/{installation_id}/power-history/export",
+    status_code=status.HTTP_200_OK,
+    summary="Export installation power history",
+    description=(
+        "Streams the power history of all inverters in the installation as CSV, "
+        "Parquet or an Arrow IPC stream. Rows are read through a server-side cursor."
+    ),
+)
+def export_power_history(
+    installation_id: int,
+    date_start: datetime,
+    date_end: datetime,
+    format: Literal["csv", "parquet", "arrow"] = Query("csv"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    installation_service.get_for_user(db, installation_id, current_user.id)
+
+    if date_end < date_start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_end must not be earlier than date_start",
+        )
+    if format != "csv" and find_spec("pyarrow") is None:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"{format} export requires pyarrow to be installed",
+        )
+
+    repo = InverterPowerExportRepository(db)
+    if api_settings.INVERTER_WORKER_STORAGE_MODE == "intervals":
+        columns = INTERVAL_EXPORT_COLUMNS
+        partitions = repo.stream_intervals(installation_id, date_start, date_end, EXPORT_CHUNK_SIZE)
+    else:
+        columns = RECORD_EXPORT_COLUMNS
+        partitions = repo.stream_records(installation_id, date_start, date_end, EXPORT_CHUNK_SIZE)
+
+    media_type, extension = EXPORT_FORMATS[format]
+    filename = (
+        f"installation_{installation_id}_power_"
+        f"{date_start:%Y%m%d}_{date_end:%Y%m%d}.{extension}"
+    )
+    return StreamingResponse(
+        _ENCODERS[format](columns, partitions),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
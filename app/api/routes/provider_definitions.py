@@ -1,5 +1,10 @@
-from fastapi import APIRouter, HTTPException
+import json
 
+from fastapi import APIRouter, HTTPException, Request, Response
+from pydantic import BaseModel
+
+from app.api.http_cache import CachedBody
+from app.api.settings import api_settings
 from smart_common.providers.enums import ProviderVendor
 from smart_common.providers.registry import PROVIDER_DEFINITIONS
 from smart_common.schemas.provider_definitions_schema import (
@@ -15,13 +20,15 @@ router = APIRouter(
     tags=["Provider Definitions"],
 )
 
+CACHE_CONTROL = f"public, max-age={api_settings.PROVIDER_DEFINITIONS_MAX_AGE_SECONDS}"
 
-@router.get(
-    "/",
-    response_model=ProviderDefinitionsResponse,
-    summary="List available provider types and vendors",
-)
-def list_provider_definitions():
+
+# ---------------------------------------
+# Catalog, built once per process: the registry is static per deploy.
+# ---------------------------------------
+
+
+def _catalog() -> ProviderDefinitionsResponse:
     grouped: dict[
         ProviderType,
         list[ProviderVendorSummary],
@@ -48,21 +55,7 @@ def list_provider_definitions():
     return ProviderDefinitionsResponse(provider_types=provider_types)
 
 
-# ---------------------------------------
-# GET /providers/definitions/{vendor}
-# ---------------------------------------
-
-
-@router.get(
-    "/{vendor}",
-    response_model=ProviderDefinitionDetail,
-    summary="Get provider definition and config schema",
-)
-def get_provider_definition(vendor: ProviderVendor):
-    meta = PROVIDER_DEFINITIONS.get(vendor)
-    if not meta:
-        raise HTTPException(status_code=404, detail="Unknown provider vendor")
-
+def _detail(vendor: ProviderVendor, meta: dict) -> ProviderDefinitionDetail:
     return ProviderDefinitionDetail(
         vendor=vendor,
         label=meta["label"],
@@ -74,17 +67,60 @@ def get_provider_definition(vendor: ProviderVendor):
     )
 
 
-@router.get("/{vendor}/config")
-def get_provider_config(vendor: ProviderVendor):
-    meta = PROVIDER_DEFINITIONS.get(vendor)
-    if not meta:
-        raise HTTPException(status_code=404, detail="Unknown provider vendor")
+def _serialized(model: BaseModel) -> CachedBody:
+    # Same field names as FastAPI's response_model serialization, which uses aliases.
+    return CachedBody.from_bytes(model.model_dump_json(by_alias=True).encode())
 
-    config_schema_cls = meta["config_schema"]
 
-    return {
+def _build_config(vendor: ProviderVendor, meta: dict) -> CachedBody:
+    config = {
         "vendor": vendor.value,
         "label": meta["label"],
         "requires_wizard": meta["requires_wizard"],
-        "config_schema": config_schema_cls.model_json_schema(),
+        "config_schema": meta["config_schema"].model_json_schema(),
     }
+    return CachedBody.from_bytes(
+        json.dumps(config, ensure_ascii=False, separators=(",", ":")).encode()
+    )
+
+
+CATALOG = _serialized(_catalog())
+DETAILS = {
+    vendor: _serialized(_detail(vendor, meta)) for vendor, meta in PROVIDER_DEFINITIONS.items()
+}
+CONFIGS = {vendor: _build_config(vendor, meta) for vendor, meta in PROVIDER_DEFINITIONS.items()}
+
+
+def _cached_for(cache: dict[ProviderVendor, CachedBody], vendor: ProviderVendor) -> CachedBody:
+    cached = cache.get(vendor)
+    if cached is None:
+        raise HTTPException(status_code=404, detail="Unknown provider vendor")
+    return cached
+
+
+@router.get(
+    "/",
+    response_model=ProviderDefinitionsResponse,
+    summary="List available provider types and vendors",
+)
+async def list_provider_definitions(request: Request) -> Response:
+    return CATALOG.response(request, CACHE_CONTROL)
+
+
+# ---------------------------------------
+# GET /providers/definitions/{vendor}
+# ---------------------------------------
+
+
+@router.get(
+    "/{vendor}",
+    response_model=ProviderDefinitionDetail,
+    summary="Get provider definition and config schema",
+)
+async def get_provider_definition(vendor: ProviderVendor, request: Request) -> Response:
+    return _cached_for(DETAILS, vendor).response(request, CACHE_CONTROL)
+
+
+@router.get("/{vendor}/config")
+async def get_provider_config(vendor: ProviderVendor, request: Request) -> Response:
+    return _cached_for(CONFIGS, vendor).response(request, CACHE_CONTROL)
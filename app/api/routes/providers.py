@@ -1,10 +1,14 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
 
+from app.api.collection_versions import providers_version
+from app.api.dependencies.ownership import get_installation_microcontroller, get_owned_provider
+from app.api.http_cache import collection_etag, conditional_collection
 from smart_common.core.db import get_db
 from smart_common.core.dependencies import get_current_user
+from smart_common.models.microcontroller import Microcontroller
 from smart_common.models.user import User
 from smart_common.repositories.microcontroller import MicrocontrollerRepository
 from smart_common.repositories.provider import ProviderRepository
@@ -23,21 +27,6 @@ provider_service = ProviderService(
 )
 
 
-def _validate_microcontroller(
-    db: Session,
-    installation_id: int,
-    microcontroller_uuid: UUID,
-    user_id: int,
-):
-    repo = MicrocontrollerRepository(db)
-    microcontroller = repo.get_for_user_by_uuid(microcontroller_uuid, user_id)
-    if not microcontroller or microcontroller.installation_id != installation_id:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Microcontroller not found"
-        )
-    return microcontroller
-
-
 @router.get(
     "/",
     response_model=list[ProviderResponse],
@@ -48,10 +37,18 @@ def _validate_microcontroller(
 def list_providers(
     installation_id: int,
     microcontroller_uuid: UUID,
+    request: Request,
+    response: Response,
+    microcontroller: Microcontroller = Depends(get_installation_microcontroller),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> list[ProviderResponse]:
-    _validate_microcontroller(db, installation_id, microcontroller_uuid, current_user.id)
+    count, last_modified = db.execute(providers_version(microcontroller.id)).one()
+    etag = collection_etag("providers", microcontroller.id, count, last_modified)
+    not_modified = conditional_collection(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
     return provider_service.list_for_microcontroller(db, current_user.id, microcontroller_uuid)
 
 
@@ -66,10 +63,10 @@ def create_provider(
     installation_id: int,
     microcontroller_uuid: UUID,
     payload: ProviderCreateRequest,
+    microcontroller: Microcontroller = Depends(get_installation_microcontroller),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> ProviderResponse:
-    _validate_microcontroller(db, installation_id, microcontroller_uuid, current_user.id)
     return provider_service.create(db, current_user.id, microcontroller_uuid, payload.model_dump())
 
 
@@ -79,6 +76,8 @@ def create_provider(
     status_code=200,
     summary="Update provider",
     description="Updates provider metadata and polling parameters.",
+    # Ownership check only: ProviderService takes ids and loads the provider itself.
+    dependencies=[Depends(get_owned_provider)],
 )
 def update_provider(
     installation_id: int,
@@ -88,13 +87,6 @@ def update_provider(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> ProviderResponse:
-    microcontroller = _validate_microcontroller(
-        db, installation_id, microcontroller_uuid, current_user.id
-    )
-    provider = provider_service.get_provider(db, current_user.id, provider_id)
-    if provider.microcontroller_id != microcontroller.id:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Provider not found")
-
     return provider_service.update(
         db, current_user.id, provider_id, payload.model_dump(exclude_unset=True)
     )
@@ -106,6 +98,7 @@ def update_provider(
     status_code=200,
     summary="Enable/disable provider",
     description="Toggles whether the provider is allowed to emit measurements.",
+    dependencies=[Depends(get_owned_provider)],
 )
 def set_provider_status(
     installation_id: int,
@@ -115,11 +108,4 @@ def set_provider_status(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> ProviderResponse:
-    microcontroller = _validate_microcontroller(
-        db, installation_id, microcontroller_uuid, current_user.id
-    )
-    provider = provider_service.get_provider(db, current_user.id, provider_id)
-    if provider.microcontroller_id != microcontroller.id:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Provider not found")
-
     return provider_service.set_enabled(db, current_user.id, provider_id, payload.enabled)
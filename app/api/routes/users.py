@@ -1,13 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
+from app.api.pagination import (CountMode, CursorPage, CursorPaginationMeta, count_rows,
+                                decode_cursor, encode_cursor)
+from app.api.principal_cache import principal_cache
+from app.repositories.user_list_repository import UserListRepository
 from smart_common.core.db import get_db
 from smart_common.core.dependencies import get_current_active_user, require_role
 from smart_common.enums.user import UserRole
 from smart_common.models.user import User
 from smart_common.repositories.user import UserRepository
 from smart_common.schemas.installations import InstallationResponse
-from smart_common.schemas.pagination_schema import PaginatedResponse, PaginationMeta
 from smart_common.schemas.user_profile_schema import UserProfileResponse, UserProfileUpdate
 from smart_common.schemas.user_schema import (AdminUserUpdate, MessageResponse, UserDetailsResponse,
                                               UserListQuery, UserResponse, UserUpdate)
@@ -22,15 +25,26 @@ router = APIRouter(prefix="/users", tags=["Users"])
 
 @router.get(
     "/list",
-    response_model=PaginatedResponse[UserResponse],
+    response_model=CursorPage[UserResponse],
     summary="List platform users (admin)",
+    description=(
+        "Newest first. Follow meta.next_cursor for constant-time paging at any depth; "
+        "offset is still accepted for the first page or direct jumps. Without cursor and "
+        "count the response is the former paginated shape (meta.total, limit, offset, "
+        "items) plus meta.next_cursor and meta.total_is_estimate; meta.offset is null on "
+        "cursor pages and meta.total is null with count=none."
+    ),
 )
 def list_users(
     query: UserListQuery = Depends(),
+    cursor: str | None = Query(None, description="meta.next_cursor of the previous page"),
+    count: CountMode = Query(
+        "exact", description="exact, estimate (planner statistics) or none"
+    ),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role(UserRole.ADMIN)),
 ):
-    repo = UserRepository(db)
+    repo = UserListRepository(db)
 
     filters = {
         "email": query.email,
@@ -38,20 +52,27 @@ def list_users(
         "role": query.role,
     }
 
-    users = repo.list(
-        limit=query.limit,
-        offset=query.offset,
-        filters=filters,
-        order_by=repo.model.created_at.desc(),
-    )
+    if cursor:
+        users = repo.list_page(filters, query.limit + 1, after=decode_cursor(cursor))
+        offset = None
+    else:
+        users = repo.list_page(filters, query.limit + 1, offset=query.offset)
+        offset = query.offset
 
-    total = repo.count(filters=filters)
+    next_cursor = None
+    if len(users) > query.limit:
+        users = users[: query.limit]
+        next_cursor = encode_cursor(users[-1].created_at, users[-1].id)
 
-    return PaginatedResponse(
-        meta=PaginationMeta(
-            total=total,
+    total, estimated = count_rows(db, User, repo.conditions(filters), count)
+
+    return CursorPage(
+        meta=CursorPaginationMeta(
             limit=query.limit,
-            offset=query.offset,
+            offset=offset,
+            total=total,
+            total_is_estimate=estimated,
+            next_cursor=next_cursor,
         ),
         items=[UserResponse.model_validate(u) for u in users],
     )
@@ -174,6 +195,7 @@ def admin_update_user(
         role=payload.role,
         is_active=payload.is_active,
     )
+    principal_cache.invalidate_user(user.id)
 
     return UserResponse.model_validate(user)
 
@@ -215,6 +237,7 @@ def admin_deactivate_user(
         raise HTTPException(status_code=404, detail="User not found")
 
     repo.deactivate_user(user)
+    principal_cache.invalidate_user(user.id)
 
     return MessageResponse(message="User deactivated successfully")
 
@@ -235,5 +258,6 @@ def update_me(
         current_user,
         email=payload.email,
     )
+    principal_cache.invalidate_user(user.id)
 
     return UserResponse.model_validate(user)
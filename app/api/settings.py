@@ -0,0 +1,48 @@
+# app/api/settings.py
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy.engine import URL
+
+
+class ApiSettings(BaseSettings):
+    """Tuning knobs for the HTTP API (read from env / .env)."""
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    # Seconds an authenticated user is served from the principal cache; 0 disables it.
+    AUTH_CACHE_TTL_SECONDS: int = 30
+    # Max number of tokens kept in the in-process principal cache.
+    AUTH_CACHE_MAX_SIZE: int = 10000
+    # Optional Redis for a shared second cache tier and cross-process invalidation.
+    AUTH_CACHE_REDIS_URL: str = ""
+
+    # Same variable as the inverter worker's: which table holds the power history
+    # ("points" or "intervals"), so the export reads what the worker writes.
+    INVERTER_WORKER_STORAGE_MODE: str = "points"
+
+    # Seconds browsers may reuse the provider definition catalog before revalidating.
+    PROVIDER_DEFINITIONS_MAX_AGE_SECONDS: int = 300
+
+    # Same database as the sync stack; the async engine reaches it through asyncpg.
+    POSTGRES_HOST: str = "localhost"
+    POSTGRES_PORT: int = 5432
+    POSTGRES_NAME: str = "smartenergy"
+    POSTGRES_USER: str = "smartenergy"
+    POSTGRES_PASSWORD: str = ""
+    # Connections kept open by the async engine, per API process.
+    ASYNC_DB_POOL_SIZE: int = 20
+    # Extra connections allowed above the pool size under bursts.
+    ASYNC_DB_MAX_OVERFLOW: int = 10
+
+    @property
+    def async_database_url(self) -> URL:
+        return URL.create(
+            "postgresql+asyncpg",
+            username=self.POSTGRES_USER,
+            password=self.POSTGRES_PASSWORD,
+            host=self.POSTGRES_HOST,
+            port=self.POSTGRES_PORT,
+            database=self.POSTGRES_NAME,
+        )
+
+
+api_settings = ApiSettings()
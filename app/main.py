@@ -6,9 +6,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from app.api.dependencies.current_user import cached_current_user
+from app.api.principal_cache import principal_cache
 from app.api.routes import (auth, device_auto_config, device_events, device_schedules, devices,
-                            installations, microcontrollers, provider_definitions, providers, users)
+                            installations, microcontrollers, power_history, provider_definitions,
+                            providers, users)
 from smart_common.core.config import settings
+from smart_common.core.dependencies import get_current_user
 from smart_common.smart_logging.logger import setup_logging
 
 # ------------------------------------------------------------------
@@ -45,12 +49,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ------------------------------------------------------------------
+# AUTH FAST PATH
+# ------------------------------------------------------------------
+
+# Overrides also apply where get_current_user is nested (get_current_active_user,
+# require_role), so every authenticated route goes through the principal cache.
+app.dependency_overrides[get_current_user] = cached_current_user(get_current_user)
+principal_cache.start_listener()
+
 # ------------------------------------------------------------------
 # ROUTERS
 # ------------------------------------------------------------------
 
 app.include_router(auth.router, prefix="/api")
 app.include_router(installations.router, prefix="/api")
+app.include_router(power_history.router, prefix="/api")
 app.include_router(microcontrollers.router, prefix="/api")
 app.include_router(providers.router, prefix="/api")
 app.include_router(devices.router, prefix="/api")
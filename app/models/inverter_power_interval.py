@@ -0,0 +1,34 @@
+# app/models/inverter_power_interval.py
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class InverterPowerInterval(Base):
+    """Interval-encoded power history: ``active_power`` held from ``start_at`` to ``end_at``.
+
+    The latest interval of an inverter is open: its ``end_at`` is moved forward in
+    place on every unchanged poll and becomes final when the value changes.
+    """
+
+    __tablename__ = "inverter_power_intervals"
+    __table_args__ = (
+        Index(
+            "ux_inverter_power_intervals_inverter_start",
+            "inverter_id",
+            "start_at",
+            unique=True,
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    inverter_id: Mapped[int] = mapped_column(
+        ForeignKey("inverters.id", ondelete="CASCADE"), nullable=False
+    )
+    active_power: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    start_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    end_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,50 @@
+# app/models/inverter_power_rollup.py
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import DateTime, Float, ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+# Rollup granularities, finest first. Buckets are aligned to UTC. Minute rollups
+# are only kept for POWER_ROLLUP_MINUTE_RETENTION_DAYS.
+MINUTE_BUCKET = "1m"
+ROLLUP_BUCKETS: dict[str, timedelta] = {
+    MINUTE_BUCKET: timedelta(minutes=1),
+    "15m": timedelta(minutes=15),
+    "1h": timedelta(hours=1),
+    "1d": timedelta(days=1),
+}
+
+
+def bucket_start(timestamp: datetime, width: timedelta) -> datetime:
+    epoch = timestamp.timestamp()
+    return datetime.fromtimestamp(epoch - epoch % width.total_seconds(), tz=timezone.utc)
+
+
+class InverterPowerRollup(Base):
+    """Per-bucket power aggregates of one inverter.
+
+    ``energy_wh`` integrates the step-function power over ``covered_seconds`` (the
+    part of the bucket with a known reading), so the average power is derived
+    rather than stored and partial buckets can be merged by simple addition.
+    """
+
+    __tablename__ = "inverter_power_rollups"
+
+    inverter_id: Mapped[int] = mapped_column(
+        ForeignKey("inverters.id", ondelete="CASCADE"), primary_key=True
+    )
+    bucket: Mapped[str] = mapped_column(String(3), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    min_power: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    max_power: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    energy_wh: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    covered_seconds: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+    @property
+    def avg_power(self) -> Optional[float]:
+        if not self.covered_seconds:
+            return None
+        return self.energy_wh * 3600 / self.covered_seconds
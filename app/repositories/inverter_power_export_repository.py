@@ -0,0 +1,96 @@
+# app/repositories/inverter_power_export_repository.py
+from datetime import datetime
+from typing import Iterator, Sequence
+
+from sqlalchemy import DateTime, Float, Integer, Row, String, column, select, table
+from sqlalchemy.orm import Session
+
+# The inverter worker owns these tables and their models (app.models.*); the API only
+# reads them, through smart_common's session, so plain table clauses are enough.
+inverters = table(
+    "inverters",
+    column("id", Integer),
+    column("installation_id", Integer),
+    column("serial_number", String),
+)
+inverter_power_records = table(
+    "inverter_power_records",
+    column("inverter_id", Integer),
+    column("timestamp", DateTime(timezone=True)),
+    column("active_power", Float),
+)
+inverter_power_intervals = table(
+    "inverter_power_intervals",
+    column("inverter_id", Integer),
+    column("start_at", DateTime(timezone=True)),
+    column("end_at", DateTime(timezone=True)),
+    column("active_power", Float),
+)
+
+# (name, kind) pairs describing the exported rows; kinds are "string", "timestamp" and "float".
+RECORD_EXPORT_COLUMNS = [
+    ("serial_number", "string"),
+    ("timestamp", "timestamp"),
+    ("active_power", "float"),
+]
+INTERVAL_EXPORT_COLUMNS = [
+    ("serial_number", "string"),
+    ("start_at", "timestamp"),
+    ("end_at", "timestamp"),
+    ("active_power", "float"),
+]
+
+
+class InverterPowerExportRepository:
+    """Reads an installation's power history through a server-side cursor.
+
+    Rows are yielded in partitions of ``chunk_size`` plain tuples, so memory use does
+    not depend on the size of the requested range.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _stream(self, stmt, chunk_size: int) -> Iterator[Sequence[Row]]:
+        result = self.db.execute(stmt.execution_options(yield_per=chunk_size))
+        try:
+            yield from result.partitions()
+        finally:
+            result.close()
+
+    def stream_records(
+        self, installation_id: int, date_start: datetime, date_end: datetime, chunk_size: int
+    ) -> Iterator[Sequence[Row]]:
+        records = inverter_power_records.c
+        stmt = (
+            select(inverters.c.serial_number, records.timestamp, records.active_power)
+            .join(inverters, inverters.c.id == records.inverter_id)
+            .where(
+                inverters.c.installation_id == installation_id,
+                records.timestamp >= date_start,
+                records.timestamp <= date_end,
+            )
+            .order_by(records.inverter_id, records.timestamp)
+        )
+        return self._stream(stmt, chunk_size)
+
+    def stream_intervals(
+        self, installation_id: int, date_start: datetime, date_end: datetime, chunk_size: int
+    ) -> Iterator[Sequence[Row]]:
+        intervals = inverter_power_intervals.c
+        stmt = (
+            select(
+                inverters.c.serial_number,
+                intervals.start_at,
+                intervals.end_at,
+                intervals.active_power,
+            )
+            .join(inverters, inverters.c.id == intervals.inverter_id)
+            .where(
+                inverters.c.installation_id == installation_id,
+                intervals.end_at >= date_start,
+                intervals.start_at <= date_end,
+            )
+            .order_by(intervals.inverter_id, intervals.start_at)
+        )
+        return self._stream(stmt, chunk_size)
@@ -0,0 +1,61 @@
+# app/repositories/inverter_power_interval_repository.py
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.inverter_power_interval import InverterPowerInterval
+
+
+def expand_intervals(
+    intervals: Iterable[InverterPowerInterval],
+) -> list[tuple[datetime, Optional[float]]]:
+    """Expand intervals into ``(timestamp, active_power)`` step-chart points.
+
+    Every interval yields a point at its start and, if it lasted, one at its end, so
+    plateaus get an explicit end marker. Intervals must be ordered by ``start_at``.
+    """
+    points: list[tuple[datetime, Optional[float]]] = []
+    for interval in intervals:
+        points.append((interval.start_at, interval.active_power))
+        if interval.end_at > interval.start_at:
+            points.append((interval.end_at, interval.active_power))
+    return points
+
+
+class InverterPowerIntervalRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def list_for_inverter(
+        self, inverter_id: int, date_start: datetime, date_end: datetime
+    ) -> list[InverterPowerInterval]:
+        stmt = (
+            select(InverterPowerInterval)
+            .where(
+                InverterPowerInterval.inverter_id == inverter_id,
+                InverterPowerInterval.end_at >= date_start,
+                InverterPowerInterval.start_at <= date_end,
+            )
+            .order_by(InverterPowerInterval.start_at)
+        )
+        return list(self.db.scalars(stmt))
+
+    def get_points_for_inverter(
+        self, inverter_id: int, date_start: datetime, date_end: datetime
+    ) -> list[tuple[datetime, Optional[float]]]:
+        return expand_intervals(self.list_for_inverter(inverter_id, date_start, date_end))
+
+    def get_open_for_inverter(self, inverter_id: int) -> Optional[InverterPowerInterval]:
+        stmt = (
+            select(InverterPowerInterval)
+            .where(InverterPowerInterval.inverter_id == inverter_id)
+            .order_by(InverterPowerInterval.start_at.desc())
+            .limit(1)
+        )
+        return self.db.scalars(stmt).first()
+
+    def get_latest_for_inverter(self, inverter_id: int) -> Optional[InverterPowerInterval]:
+        # Same contract as the point repository: the open interval holds the latest value.
+        return self.get_open_for_inverter(inverter_id)
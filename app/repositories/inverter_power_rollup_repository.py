@@ -0,0 +1,89 @@
+# app/repositories/inverter_power_rollup_repository.py
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.inverter_power_rollup import ROLLUP_BUCKETS, InverterPowerRollup
+
+_ROLLUP_KEY = ["inverter_id", "bucket", "bucket_start"]
+
+
+def pick_bucket(date_start: datetime, date_end: datetime, resolution: timedelta) -> str:
+    """Coarsest bucket no wider than the requested resolution nor the window itself."""
+    window = date_end - date_start
+    fitting = [
+        name for name, width in ROLLUP_BUCKETS.items() if width <= resolution and width <= window
+    ]
+    return fitting[-1] if fitting else next(iter(ROLLUP_BUCKETS))
+
+
+class InverterPowerRollupRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def merge_many(self, rows: list[dict]) -> None:
+        """Fold partial bucket totals into existing rollups (min/max, summed energy)."""
+        if not rows:
+            return
+        stmt = pg_insert(InverterPowerRollup)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=_ROLLUP_KEY,
+            set_={
+                "min_power": func.least(InverterPowerRollup.min_power, stmt.excluded.min_power),
+                "max_power": func.greatest(
+                    InverterPowerRollup.max_power, stmt.excluded.max_power
+                ),
+                "energy_wh": InverterPowerRollup.energy_wh + stmt.excluded.energy_wh,
+                "covered_seconds": InverterPowerRollup.covered_seconds
+                + stmt.excluded.covered_seconds,
+            },
+        )
+        self.db.execute(stmt, rows)
+
+    def insert_missing(self, rows: list[dict]) -> None:
+        """Backfill rollups without touching buckets that already exist."""
+        if not rows:
+            return
+        stmt = pg_insert(InverterPowerRollup).on_conflict_do_nothing(index_elements=_ROLLUP_KEY)
+        self.db.execute(stmt, rows)
+
+    def delete_before(self, bucket: str, cutoff: datetime, limit: int) -> int:
+        """Delete up to ``limit`` ``bucket`` rollups that start before ``cutoff``."""
+        key = (
+            InverterPowerRollup.inverter_id,
+            InverterPowerRollup.bucket,
+            InverterPowerRollup.bucket_start,
+        )
+        expired = (
+            select(*key)
+            .where(InverterPowerRollup.bucket == bucket, InverterPowerRollup.bucket_start < cutoff)
+            .limit(limit)
+        )
+        stmt = delete(InverterPowerRollup).where(tuple_(*key).in_(expired))
+        return self.db.execute(stmt).rowcount
+
+    def query(
+        self,
+        inverter_id: int,
+        date_start: datetime,
+        date_end: datetime,
+        resolution: timedelta,
+    ) -> tuple[str, list[InverterPowerRollup]]:
+        """Rollups covering the window at the coarsest bucket that meets ``resolution``.
+
+        Minute rollups only reach back POWER_ROLLUP_MINUTE_RETENTION_DAYS.
+        """
+        bucket = pick_bucket(date_start, date_end, resolution)
+        stmt = (
+            select(InverterPowerRollup)
+            .where(
+                InverterPowerRollup.inverter_id == inverter_id,
+                InverterPowerRollup.bucket == bucket,
+                InverterPowerRollup.bucket_start > date_start - ROLLUP_BUCKETS[bucket],
+                InverterPowerRollup.bucket_start <= date_end,
+            )
+            .order_by(InverterPowerRollup.bucket_start)
+        )
+        return bucket, list(self.db.scalars(stmt))
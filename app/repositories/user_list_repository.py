@@ -0,0 +1,56 @@
+# app/repositories/user_list_repository.py
+from datetime import datetime
+from typing import Optional, Sequence
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from smart_common.models.user import User
+from smart_common.repositories.user import UserRepository
+
+
+class UserListRepository(UserRepository):
+    """Admin user listing with keyset pages on top of smart_common's ``UserRepository``.
+
+    ``filters`` is the dict ``UserRepository.list`` takes: ``email``, ``is_active`` and
+    ``role``, where None means unfiltered. Email is a case-insensitive substring match;
+    ``%`` and ``_`` in it match literally.
+    """
+
+    def __init__(self, db: Session):
+        super().__init__(db)
+        self._session = db
+
+    @staticmethod
+    def conditions(filters: dict) -> list:
+        where = []
+        if filters.get("email"):
+            where.append(User.email.icontains(filters["email"], autoescape=True))
+        if filters.get("is_active") is not None:
+            where.append(User.is_active == filters["is_active"])
+        if filters.get("role") is not None:
+            where.append(User.role == filters["role"])
+        return where
+
+    def list_page(
+        self,
+        filters: dict,
+        limit: int,
+        offset: int = 0,
+        after: Optional[tuple[datetime, int]] = None,
+    ) -> Sequence[User]:
+        """Newest first: ``limit`` users after the ``(created_at, id)`` key, or from ``offset``.
+
+        ``id`` breaks ties between users created in the same instant.
+        """
+        statement = (
+            select(User)
+            .where(*self.conditions(filters))
+            .order_by(User.created_at.desc(), User.id.desc())
+            .limit(limit)
+        )
+        if after is not None:
+            statement = statement.where(tuple_(User.created_at, User.id) < after)
+        else:
+            statement = statement.offset(offset)
+        return self._session.scalars(statement).all()
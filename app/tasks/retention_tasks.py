@@ -0,0 +1,304 @@
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.core.db import SessionLocal
+from app.models.inverter_power_interval import InverterPowerInterval
+from app.models.inverter_power_record import InverterPowerRecord
+from app.models.inverter_power_rollup import MINUTE_BUCKET
+from app.repositories.inverter_power_interval_repository import expand_intervals
+from app.repositories.inverter_power_rollup_repository import InverterPowerRollupRepository
+from app.workers.power_rollups import PowerRollupAccumulator
+from app.workers.retention_app import retention_app
+from app.workers.settings import worker_settings
+
+logger = logging.getLogger(__name__)
+
+_DAY = timedelta(days=1)
+
+
+def _delete_in_chunks(db: Session, record_ids: list[int], chunk_size: int) -> None:
+    # One short transaction per chunk, so row locks are never held for long.
+    for i in range(0, len(record_ids), chunk_size):
+        chunk = record_ids[i : i + chunk_size]
+        db.execute(delete(InverterPowerRecord).where(InverterPowerRecord.id.in_(chunk)))
+        db.commit()
+
+
+def _backfill(
+    rollups: InverterPowerRollupRepository, rows: list[dict], minute_cutoff: datetime
+) -> None:
+    # Minute rollups past their own retention would only be deleted again.
+    rollups.insert_missing(
+        [
+            row
+            for row in rows
+            if row["bucket"] != MINUTE_BUCKET or row["bucket_start"] >= minute_cutoff
+        ]
+    )
+
+
+def _prune_inverter(
+    db: Session, inverter_id: int, cutoff: datetime, minute_cutoff: datetime, chunk_size: int
+) -> int:
+    """Downsample and delete one inverter's records older than ``cutoff``, a day at a time.
+
+    Rollups are only backfilled where the worker has not written them already, and
+    minute rollups only from ``minute_cutoff`` on. The inverter's latest record is
+    always kept: the worker compares new readings to it.
+    """
+    latest_id = db.scalar(
+        select(InverterPowerRecord.id)
+        .where(InverterPowerRecord.inverter_id == inverter_id)
+        .order_by(InverterPowerRecord.timestamp.desc(), InverterPowerRecord.id.desc())
+        .limit(1)
+    )
+    oldest = db.scalar(
+        select(func.min(InverterPowerRecord.timestamp)).where(
+            InverterPowerRecord.inverter_id == inverter_id
+        )
+    )
+    if oldest is None or oldest >= cutoff:
+        return 0
+
+    rollups = InverterPowerRollupRepository(db)
+    # Carries the held value across day boundaries, like the worker does live. Stored
+    # history only has a row per change, so a value holds until the next row however
+    # long the plateau was; failed readings are rows of their own and end the span.
+    accumulator = PowerRollupAccumulator(max_gap=None)
+    columns = (
+        InverterPowerRecord.id,
+        InverterPowerRecord.active_power,
+        InverterPowerRecord.timestamp,
+    )
+    ordering = (InverterPowerRecord.timestamp, InverterPowerRecord.id)
+    pending: list[tuple[int, datetime]] = []
+    deleted = 0
+
+    def settle(boundary: datetime) -> None:
+        # Buckets before ``boundary`` are complete once a later reading closed their span.
+        nonlocal deleted
+        _backfill(rollups, accumulator.take_completed(boundary), minute_cutoff)
+        db.commit()
+        # Raw records are only deleted once their buckets have been written.
+        settled = [(record_id, ts) for record_id, ts in pending if ts < boundary]
+        pending[:] = [(record_id, ts) for record_id, ts in pending if ts >= boundary]
+        record_ids = [record_id for record_id, _ in settled if record_id != latest_id]
+        _delete_in_chunks(db, record_ids, chunk_size)
+        deleted += len(record_ids)
+
+    day = datetime(oldest.year, oldest.month, oldest.day, tzinfo=timezone.utc)
+    while day < cutoff:
+        rows = db.execute(
+            select(*columns)
+            .where(
+                InverterPowerRecord.inverter_id == inverter_id,
+                InverterPowerRecord.timestamp >= day,
+                InverterPowerRecord.timestamp < day + _DAY,
+            )
+            .order_by(*ordering)
+        ).all()
+        db.commit()
+
+        if rows:
+            for record_id, active_power, timestamp in rows:
+                accumulator.observe(
+                    inverter_id, None if active_power is None else float(active_power), timestamp
+                )
+                pending.append((record_id, timestamp))
+            settle(day)
+        day += _DAY
+
+    # The first retained reading closes the span held over from the last pruned one.
+    first_kept = db.execute(
+        select(*columns)
+        .where(
+            InverterPowerRecord.inverter_id == inverter_id,
+            InverterPowerRecord.timestamp >= cutoff,
+        )
+        .order_by(*ordering)
+        .limit(1)
+    ).first()
+    if first_kept is not None:
+        accumulator.observe(
+            inverter_id,
+            None if first_kept.active_power is None else float(first_kept.active_power),
+            first_kept.timestamp,
+        )
+    settle(cutoff)
+
+    return deleted
+
+
+def _prune_inverter_intervals(
+    db: Session, inverter_id: int, cutoff: datetime, minute_cutoff: datetime, chunk_size: int
+) -> int:
+    """Downsample and delete one inverter's intervals that ended before ``cutoff``.
+
+    Works like :func:`_prune_inverter`, ``chunk_size`` intervals per transaction,
+    each replayed as its start and end point. The open interval is always kept: the
+    worker extends it in place.
+    """
+    open_id = db.scalar(
+        select(InverterPowerInterval.id)
+        .where(InverterPowerInterval.inverter_id == inverter_id)
+        .order_by(InverterPowerInterval.start_at.desc())
+        .limit(1)
+    )
+    columns = (
+        InverterPowerInterval.id,
+        InverterPowerInterval.active_power,
+        InverterPowerInterval.start_at,
+        InverterPowerInterval.end_at,
+    )
+    rollups = InverterPowerRollupRepository(db)
+    accumulator = PowerRollupAccumulator(max_gap=None)
+    deleted = 0
+
+    while True:
+        # Pruned chunks are gone, so each query returns the next oldest intervals.
+        intervals = db.execute(
+            select(*columns)
+            .where(
+                InverterPowerInterval.inverter_id == inverter_id,
+                InverterPowerInterval.end_at < cutoff,
+                InverterPowerInterval.id != open_id,
+            )
+            .order_by(InverterPowerInterval.start_at)
+            .limit(chunk_size)
+        ).all()
+        if not intervals:
+            break
+        for at, active_power in expand_intervals(intervals):
+            accumulator.observe(inverter_id, active_power, at)
+        # Intervals are only deleted in the transaction that writes their buckets.
+        _backfill(rollups, accumulator.take_completed(intervals[-1].end_at), minute_cutoff)
+        db.execute(
+            delete(InverterPowerInterval).where(
+                InverterPowerInterval.id.in_([interval.id for interval in intervals])
+            )
+        )
+        db.commit()
+        deleted += len(intervals)
+        if len(intervals) < chunk_size:
+            break
+
+    # The first retained interval closes the span held over from the last pruned one.
+    first_kept = db.execute(
+        select(*columns)
+        .where(InverterPowerInterval.inverter_id == inverter_id)
+        .order_by(InverterPowerInterval.start_at)
+        .limit(1)
+    ).first()
+    if deleted and first_kept is not None:
+        accumulator.observe(inverter_id, first_kept.active_power, first_kept.start_at)
+        _backfill(
+            rollups, accumulator.take_completed(min(first_kept.start_at, cutoff)), minute_cutoff
+        )
+        db.commit()
+
+    return deleted
+
+
+def _cutoffs() -> tuple[datetime, datetime]:
+    """Cutoff of the raw power history and of the minute rollups backfilled from it."""
+    retention = timedelta(days=worker_settings.POWER_RECORD_RETENTION_DAYS)
+    now = datetime.now(timezone.utc)
+    # Whole UTC days only, so daily rollups are built from complete days.
+    cutoff = datetime(now.year, now.month, now.day, tzinfo=timezone.utc) - retention
+    return cutoff, now - timedelta(days=worker_settings.POWER_ROLLUP_MINUTE_RETENTION_DAYS)
+
+
+@retention_app.task(bind=True, acks_late=True)
+def prune_inverter_power_records_task(self) -> dict:
+    cutoff, minute_cutoff = _cutoffs()
+    chunk_size = worker_settings.POWER_RECORD_RETENTION_CHUNK_SIZE
+
+    db: Session = SessionLocal()
+    try:
+        inverter_ids = db.scalars(
+            select(InverterPowerRecord.inverter_id)
+            .where(InverterPowerRecord.timestamp < cutoff)
+            .distinct()
+        ).all()
+        db.commit()
+
+        deleted = 0
+        for inverter_id in inverter_ids:
+            try:
+                deleted += _prune_inverter(db, inverter_id, cutoff, minute_cutoff, chunk_size)
+            except Exception:
+                db.rollback()
+                logger.exception("Retention failed for inverter %s", inverter_id)
+
+        logger.info(
+            "Pruned %s power records older than %s for %s inverters",
+            deleted,
+            cutoff.isoformat(),
+            len(inverter_ids),
+        )
+        return {"deleted": deleted, "inverters": len(inverter_ids), "cutoff": cutoff.isoformat()}
+    finally:
+        db.close()
+
+
+@retention_app.task(bind=True, acks_late=True)
+def prune_inverter_power_intervals_task(self) -> dict:
+    cutoff, minute_cutoff = _cutoffs()
+    chunk_size = worker_settings.POWER_RECORD_RETENTION_CHUNK_SIZE
+
+    db: Session = SessionLocal()
+    try:
+        inverter_ids = db.scalars(
+            select(InverterPowerInterval.inverter_id)
+            .where(InverterPowerInterval.end_at < cutoff)
+            .distinct()
+        ).all()
+        db.commit()
+
+        deleted = 0
+        for inverter_id in inverter_ids:
+            try:
+                deleted += _prune_inverter_intervals(
+                    db, inverter_id, cutoff, minute_cutoff, chunk_size
+                )
+            except Exception:
+                db.rollback()
+                logger.exception("Interval retention failed for inverter %s", inverter_id)
+
+        logger.info(
+            "Pruned %s power intervals ended before %s for %s inverters",
+            deleted,
+            cutoff.isoformat(),
+            len(inverter_ids),
+        )
+        return {"deleted": deleted, "inverters": len(inverter_ids), "cutoff": cutoff.isoformat()}
+    finally:
+        db.close()
+
+
+@retention_app.task(bind=True, acks_late=True)
+def prune_inverter_power_rollups_task(self) -> dict:
+    cutoff = datetime.now(timezone.utc) - timedelta(
+        days=worker_settings.POWER_ROLLUP_MINUTE_RETENTION_DAYS
+    )
+    chunk_size = worker_settings.POWER_RECORD_RETENTION_CHUNK_SIZE
+
+    db: Session = SessionLocal()
+    try:
+        rollups = InverterPowerRollupRepository(db)
+        deleted = 0
+        # One short transaction per chunk, like the record retention.
+        while True:
+            count = rollups.delete_before(MINUTE_BUCKET, cutoff, chunk_size)
+            db.commit()
+            deleted += count
+            if count < chunk_size:
+                break
+
+        logger.info("Pruned %s minute rollups older than %s", deleted, cutoff.isoformat())
+        return {"deleted": deleted, "cutoff": cutoff.isoformat()}
+    finally:
+        db.close()
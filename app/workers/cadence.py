@@ -0,0 +1,131 @@
+# app/workers/cadence.py
+import math
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+_J2000 = 2451545.0
+_UNIX_EPOCH_JD = 2440587.5
+_EARTH_TILT = math.radians(23.4397)
+# Standard altitude of the sun's upper limb at sunrise/sunset, incl. refraction.
+_SUNRISE_ALTITUDE = math.radians(-0.833)
+
+
+def _from_julian(jd: float) -> datetime:
+    return datetime.fromtimestamp((jd - _UNIX_EPOCH_JD) * 86400, tz=timezone.utc)
+
+
+def sun_times(
+    day: date, latitude: float, longitude: float
+) -> tuple[Optional[datetime], Optional[datetime]]:
+    """Sunrise and sunset (UTC) for ``day`` at the given coordinates.
+
+    Offline sunrise equation, accurate to about a minute. Returns ``(None, None)``
+    during polar night and ``(day start, day end)`` during midnight sun.
+    """
+    n = day.toordinal() + 1721425 - _J2000
+    j_star = n - longitude / 360
+    m = math.radians((357.5291 + 0.98560028 * j_star) % 360)
+    c = 1.9148 * math.sin(m) + 0.0200 * math.sin(2 * m) + 0.0003 * math.sin(3 * m)
+    ecliptic_longitude = math.radians((math.degrees(m) + c + 180 + 102.9372) % 360)
+    transit = _J2000 + j_star + 0.0053 * math.sin(m) - 0.0069 * math.sin(2 * ecliptic_longitude)
+
+    declination = math.asin(math.sin(ecliptic_longitude) * math.sin(_EARTH_TILT))
+    phi = math.radians(latitude)
+    cos_hour_angle = (math.sin(_SUNRISE_ALTITUDE) - math.sin(phi) * math.sin(declination)) / (
+        math.cos(phi) * math.cos(declination)
+    )
+
+    if cos_hour_angle > 1:
+        return None, None
+    if cos_hour_angle < -1:
+        start = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+        return start, start + timedelta(days=1)
+
+    half_day = math.degrees(math.acos(cos_hour_angle)) / 360
+    return _from_julian(transit - half_day), _from_julian(transit + half_day)
+
+
+class PollScheduler:
+    """Per-inverter poll times driven by daylight and recent volatility.
+
+    During daylight the interval shrinks from ``max_interval`` towards
+    ``min_interval`` as the EWMA of relative power changes approaches
+    ``volatility_threshold``. Outside daylight (± ``twilight_margin``) the next poll
+    is the coming sunrise, but never later than ``night_interval`` from now.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_interval: timedelta,
+        max_interval: timedelta,
+        night_interval: timedelta,
+        twilight_margin: timedelta = timedelta(minutes=30),
+        volatility_threshold: float = 0.1,
+        smoothing: float = 0.3,
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.night_interval = night_interval
+        self.twilight_margin = twilight_margin
+        self.volatility_threshold = volatility_threshold
+        self.smoothing = smoothing
+        self._next_due: dict[int, datetime] = {}
+        self._last_power: dict[int, float] = {}
+        self._volatility: dict[int, float] = {}
+
+    def is_due(self, inverter_id: int, now: datetime) -> bool:
+        next_due = self._next_due.get(inverter_id)
+        return next_due is None or next_due <= now
+
+    def _update_volatility(self, inverter_id: int, active_power: Optional[float]) -> float:
+        previous = self._last_power.get(inverter_id)
+        volatility = self._volatility.get(inverter_id, 0.0)
+        if active_power is None:
+            self._last_power.pop(inverter_id, None)
+            return volatility
+
+        if previous is not None:
+            # 100 W floor keeps near-zero readings at dawn from looking infinitely volatile.
+            change = abs(active_power - previous) / max(abs(previous), 100.0)
+            volatility = self.smoothing * change + (1 - self.smoothing) * volatility
+            self._volatility[inverter_id] = volatility
+        self._last_power[inverter_id] = active_power
+        return volatility
+
+    def _next_daylight(
+        self, now: datetime, latitude: float, longitude: float
+    ) -> Optional[datetime]:
+        """Start of the current or next daylight window (``now`` if it is daylight)."""
+        for offset in range(3):
+            sunrise, sunset = sun_times((now + timedelta(days=offset)).date(), latitude, longitude)
+            if sunrise is None:
+                continue
+            start, end = sunrise - self.twilight_margin, sunset + self.twilight_margin
+            if now < start:
+                return start
+            if now <= end:
+                return now
+        return None
+
+    def schedule(
+        self,
+        inverter_id: int,
+        now: datetime,
+        active_power: Optional[float],
+        latitude: float,
+        longitude: float,
+    ) -> datetime:
+        volatility = self._update_volatility(inverter_id, active_power)
+        daylight = self._next_daylight(now, latitude, longitude)
+
+        if daylight is None or daylight > now:
+            next_due = min(daylight or now + self.night_interval, now + self.night_interval)
+        elif active_power is None:
+            next_due = now + self.max_interval
+        else:
+            ratio = min(1.0, volatility / self.volatility_threshold)
+            next_due = now + self.max_interval - (self.max_interval - self.min_interval) * ratio
+
+        self._next_due[inverter_id] = next_due
+        return next_due
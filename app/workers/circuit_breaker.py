@@ -0,0 +1,150 @@
+# app/workers/circuit_breaker.py
+import logging
+from enum import IntEnum
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# A circuit is one hash per account: 'failures' (consecutive), 'open_until' (ms, set
+# once the circuit opened), 'cooldown' (ms of the current open period) and 'probe_until'
+# (ms, lease of the half-open probe). Time comes from the Redis server.
+# Returns 1 when the account may be polled, 2 when it may be polled as the half-open
+# probe, 0 when the circuit is open.
+_ALLOW_SCRIPT = """
+local key = KEYS[1]
+local probe_ms = tonumber(ARGV[1])
+
+local state = redis.call('HMGET', key, 'open_until', 'probe_until')
+local open_until = tonumber(state[1])
+if not open_until then
+    return 1
+end
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+if open_until > now or (tonumber(state[2]) or 0) > now then
+    return 0
+end
+
+redis.call('HSET', key, 'probe_until', now + probe_ms)
+return 2
+"""
+
+# Counts a failure. A closed circuit opens after `threshold` consecutive failures; a
+# failed half-open probe re-opens it with the cooldown doubled (up to `max_cooldown`).
+# Returns the cooldown in ms when the circuit (re)opened, otherwise 0.
+_FAILURE_SCRIPT = """
+local key = KEYS[1]
+local threshold = tonumber(ARGV[1])
+local base_ms = tonumber(ARGV[2])
+local max_ms = tonumber(ARGV[3])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+local state = redis.call('HMGET', key, 'failures', 'open_until', 'cooldown')
+local failures = (tonumber(state[1]) or 0) + 1
+local cooldown = 0
+
+if state[2] then
+    if tonumber(state[2]) > now then
+        -- Already open; a late result from before the circuit opened.
+        redis.call('HSET', key, 'failures', failures)
+        return 0
+    end
+    cooldown = math.min(max_ms, (tonumber(state[3]) or base_ms) * 2)
+elseif failures >= threshold then
+    cooldown = base_ms
+end
+
+if cooldown > 0 then
+    redis.call(
+        'HSET', key, 'failures', failures, 'open_until', now + cooldown,
+        'cooldown', cooldown, 'probe_until', 0
+    )
+    redis.call('PEXPIRE', key, cooldown + max_ms)
+else
+    redis.call('HSET', key, 'failures', failures)
+    redis.call('PEXPIRE', key, max_ms)
+end
+return cooldown
+"""
+
+
+class Admission(IntEnum):
+    """Verdict of :meth:`AccountCircuitBreaker.allow`; falsy only when denied."""
+
+    DENIED = 0
+    CLOSED = 1
+    # Half-open: the caller may make exactly one vendor call to test the account.
+    PROBE = 2
+
+
+class AccountCircuitBreaker:
+    """Shared per-account circuit breaker for vendor adapters.
+
+    After ``failure_threshold`` consecutive failed cycles an account is skipped for
+    ``base_cooldown_seconds``. Then one worker gets to probe it (half-open): success
+    closes the circuit, failure re-opens it with the cooldown doubled, up to
+    ``max_cooldown_seconds``. State lives in Redis, so it survives restarts and is
+    shared by all replicas. If Redis is unavailable the breaker stays closed.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        failure_threshold: int = 5,
+        base_cooldown_seconds: float = 300,
+        max_cooldown_seconds: float = 6 * 3600,
+        probe_lease_seconds: float = 120,
+        key_prefix: str = "circuit",
+    ):
+        self.redis = redis
+        self.failure_threshold = failure_threshold
+        self.base_cooldown_ms = int(base_cooldown_seconds * 1000)
+        self.max_cooldown_ms = int(max_cooldown_seconds * 1000)
+        self.probe_lease_ms = int(probe_lease_seconds * 1000)
+        self.key_prefix = key_prefix
+        self._allow = redis.register_script(_ALLOW_SCRIPT)
+        self._failure = redis.register_script(_FAILURE_SCRIPT)
+
+    def _key(self, vendor: str, account: str) -> str:
+        return f"{self.key_prefix}:{vendor}:{account}"
+
+    async def allow(self, vendor: str, account: str) -> Admission:
+        try:
+            raw = await self._allow(keys=[self._key(vendor, account)], args=[self.probe_lease_ms])
+            verdict = Admission(int(raw))
+        except RedisError as e:
+            logger.warning(f"[CircuitBreaker] Redis unavailable, allowing {vendor}/{account}: {e}")
+            return Admission.CLOSED
+        if verdict == Admission.PROBE:
+            logger.info(f"[CircuitBreaker] Probing {vendor}/{account} (half-open)")
+        return verdict
+
+    async def record_success(self, vendor: str, account: str) -> None:
+        try:
+            if await self.redis.delete(self._key(vendor, account)):
+                logger.info(f"[CircuitBreaker] {vendor}/{account} recovered; circuit closed")
+        except RedisError as e:
+            logger.warning(f"[CircuitBreaker] Could not record success for {vendor}/{account}: {e}")
+
+    async def record_failure(self, vendor: str, account: str) -> None:
+        try:
+            cooldown_ms = int(
+                await self._failure(
+                    keys=[self._key(vendor, account)],
+                    args=[self.failure_threshold, self.base_cooldown_ms, self.max_cooldown_ms],
+                )
+            )
+        except RedisError as e:
+            logger.warning(f"[CircuitBreaker] Could not record failure for {vendor}/{account}: {e}")
+            return
+        if cooldown_ms:
+            logger.warning(
+                f"[CircuitBreaker] {vendor}/{account} failing; circuit open for "
+                f"{cooldown_ms / 1000:.0f}s"
+            )
@@ -0,0 +1,82 @@
+# app/workers/event_pipeline.py
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+PLATEAU_POLICY_ALWAYS = "always"
+PLATEAU_POLICY_SUPPRESS = "suppress"
+PLATEAU_POLICY_HEARTBEAT = "heartbeat"
+
+
+class EventPublishPipeline:
+    """Publishes events without awaiting each JetStream ack in turn.
+
+    At most ``max_in_flight`` publishes are outstanding; :meth:`submit` only waits
+    when the window is full. :meth:`drain` collects all remaining acks at once.
+    """
+
+    def __init__(
+        self,
+        publish: Callable[..., Awaitable[Any]],
+        max_in_flight: int = 256,
+    ):
+        self._publish = publish
+        self._window = asyncio.Semaphore(max_in_flight)
+        self._pending: set[asyncio.Task] = set()
+        self.published = 0
+        self.failed = 0
+
+    async def submit(self, subject: str, event: Any) -> None:
+        await self._window.acquire()
+        task = asyncio.create_task(self._send(subject, event))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _send(self, subject: str, event: Any) -> None:
+        try:
+            await self._publish(subject, event=event)
+            self.published += 1
+            logger.debug("[EventPipeline] Ack received for %s", subject, extra={"event": "ack"})
+        except Exception as e:
+            self.failed += 1
+            logger.error("[EventPipeline] Failed to publish %s: %s", subject, e)
+        finally:
+            self._window.release()
+
+    async def drain(self) -> None:
+        while self._pending:
+            await asyncio.gather(*list(self._pending))
+
+
+class PlateauPolicy:
+    """Decides whether an unchanged ("plateau") reading is worth an event.
+
+    ``always`` publishes every reading, ``suppress`` never publishes plateaus and
+    ``heartbeat`` publishes one plateau event every ``heartbeat_cycles`` readings.
+    Streaks are kept per inverter and reset on every change or failure.
+    """
+
+    def __init__(self, mode: str = PLATEAU_POLICY_ALWAYS, heartbeat_cycles: int = 10):
+        if mode not in (PLATEAU_POLICY_ALWAYS, PLATEAU_POLICY_SUPPRESS, PLATEAU_POLICY_HEARTBEAT):
+            raise ValueError(f"Unknown plateau policy: {mode}")
+        self.mode = mode
+        self.heartbeat_cycles = max(1, heartbeat_cycles)
+        self._streaks: dict[int, int] = {}
+
+    def reset(self, inverter_id: int) -> None:
+        self._streaks.pop(inverter_id, None)
+
+    def should_publish(self, inverter_id: int) -> bool:
+        if self.mode == PLATEAU_POLICY_ALWAYS:
+            return True
+        if self.mode == PLATEAU_POLICY_SUPPRESS:
+            return False
+
+        streak = self._streaks.get(inverter_id, 0) + 1
+        if streak >= self.heartbeat_cycles:
+            self._streaks[inverter_id] = 0
+            return True
+        self._streaks[inverter_id] = streak
+        return False
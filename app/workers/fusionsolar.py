@@ -0,0 +1,61 @@
+# app/workers/fusionsolar.py
+from typing import Optional
+
+import requests
+
+# FusionSolar's northbound API sets this cookie at login and expects it echoed back
+# as a request header.
+XSRF_TOKEN = "XSRF-TOKEN"
+# getDevRealKpi device type of string inverters.
+INVERTER_DEV_TYPE_ID = 1
+# failCode values of the northbound API.
+FAIL_CODE_MUST_RELOGIN = 305
+FAIL_CODE_RATE_LIMITED = 407
+
+
+class FusionSolarError(Exception):
+    def __init__(self, fail_code: Optional[int], message: str = ""):
+        super().__init__(f"FusionSolar failCode={fail_code}: {message}")
+        self.fail_code = fail_code
+
+
+def http_session(adapter) -> Optional[requests.Session]:
+    """The ``requests`` session the Huawei adapter logged in with, if it has one."""
+    session = getattr(adapter, "session", None)
+    return session if isinstance(session, requests.Session) else None
+
+
+def logged_in(session: requests.Session) -> bool:
+    return session.cookies.get(XSRF_TOKEN) is not None
+
+
+def get_production_many(
+    session: requests.Session, base_url: str, device_ids: list[str], timeout: float = 30
+) -> dict[str, list]:
+    """Real-time KPIs of several inverters in one ``getDevRealKpi`` call.
+
+    ``session`` must be logged in (see :func:`logged_in`); the device ids go out
+    comma-separated, at most 100 per call. Returns ``{device_id: [kpi item]}``, the
+    shape the adapter's ``get_production`` returns for one device; devices missing
+    from the answer are missing from the dict. Raises :class:`FusionSolarError` when
+    the API reports a failure.
+    """
+    response = session.post(
+        f"{base_url.rstrip('/')}/getDevRealKpi",
+        json={"devIds": ",".join(device_ids), "devTypeId": INVERTER_DEV_TYPE_ID},
+        headers={XSRF_TOKEN: session.cookies.get(XSRF_TOKEN)},
+        timeout=timeout,
+    )
+    response.raise_for_status()
+    body = response.json()
+    if not body.get("success"):
+        raise FusionSolarError(body.get("failCode"), body.get("message") or "")
+
+    wanted = set(device_ids)
+    production: dict[str, list] = {}
+    for item in body.get("data") or []:
+        # Items carry the devId they were asked for; sn covers inverters addressed by serial.
+        for key in (item.get("devId"), item.get("sn")):
+            if key is not None and str(key) in wanted:
+                production[str(key)] = [item]
+    return production
@@ -0,0 +1,157 @@
+# app/workers/inverter_service.py
+"""Long-running inverter worker.
+
+Keeps one event loop, one NATS connection and warm DB/HTTP pools for the life of
+the process, unlike ``start_inverter_scheduler`` which spins up a new loop per tick.
+
+Run with ``python -m app.workers.inverter_service``.
+"""
+import asyncio
+import logging
+import os
+import signal
+import socket
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.nats.module import nats_module
+from app.workers.inverter_worker import (ensure_nats_ready, run_inverter_production_cycle,
+                                         warm_caches)
+from app.workers.last_value_cache import last_value_cache
+from app.workers.power_interval_buffer import open_interval_index
+from app.workers.power_rollups import power_rollups
+from app.workers.metrics import start_metrics_server
+from app.workers.redis_client import get_redis
+from app.workers.settings import worker_settings
+from app.workers.sharding import ShardCoordinator
+from app.workers.worker_logging import configure_worker_logging
+from smart_common.smart_logging.logger import setup_logging
+
+logger = logging.getLogger(__name__)
+
+
+class InverterWorkerService:
+    def __init__(self, interval_seconds: float, sharding_enabled: bool = False):
+        self.interval_seconds = interval_seconds
+        self.sharding_enabled = sharding_enabled
+        self.shards: ShardCoordinator | None = None
+        self._stop_event: asyncio.Event | None = None
+        self._lease_task: asyncio.Task | None = None
+
+    def stop(self) -> None:
+        if self._stop_event is not None and not self._stop_event.is_set():
+            logger.info("[InverterService] Stop requested; finishing current cycle...")
+            self._stop_event.set()
+
+    async def _rebalance_shards(self) -> None:
+        gained = await self.shards.rebalance()
+        if gained:
+            # Another worker may have written these inverters while it owned them.
+            def gained_inverter(inverter_id: int) -> bool:
+                return self.shards.shard_for(inverter_id) in gained
+
+            last_value_cache.invalidate_where(gained_inverter)
+            # Its open intervals too; extending a stale start_at would update no row.
+            open_interval_index.invalidate_where(gained_inverter)
+            # And the held rollup readings, or the span polled elsewhere is integrated twice.
+            power_rollups.forget_where(gained_inverter)
+
+    async def _keep_leases(self) -> None:
+        # Renew well within the lease lifetime so ownership survives long cycles.
+        renew_every = worker_settings.INVERTER_WORKER_SHARD_LEASE_SECONDS / 3
+        while not self._stop_event.is_set():
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=renew_every)
+            except asyncio.TimeoutError:
+                try:
+                    await self._rebalance_shards()
+                except Exception:
+                    # A dead renewal task would let every lease lapse; retry next round.
+                    logger.exception("[InverterService] Shard rebalance failed")
+
+    async def start(self) -> None:
+        start_metrics_server(worker_settings.INVERTER_WORKER_METRICS_PORT)
+        await ensure_nats_ready()
+
+        if self.sharding_enabled:
+            self.shards = ShardCoordinator(
+                get_redis(),
+                f"{socket.gethostname()}:{os.getpid()}",
+                shard_count=worker_settings.INVERTER_WORKER_SHARD_COUNT,
+                lease_seconds=worker_settings.INVERTER_WORKER_SHARD_LEASE_SECONDS,
+            )
+            await self._rebalance_shards()
+            self._lease_task = asyncio.create_task(self._keep_leases())
+
+        db = SessionLocal()
+        try:
+            warm_caches(db)
+        finally:
+            db.close()
+
+    async def shutdown(self) -> None:
+        if self.shards is not None:
+            if self._lease_task is not None:
+                self._lease_task.cancel()
+            await self.shards.release_all()
+
+        try:
+            await nats_module.client.close()
+        except Exception as e:
+            logger.warning(f"[InverterService] Error while closing NATS connection: {e}")
+        logger.info("[InverterService] Stopped.")
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self.stop)
+
+        await self.start()
+        logger.info(f"[InverterService] Started (interval = {self.interval_seconds}s).")
+
+        # Ticks are anchored to the loop clock, so cycle duration never causes drift.
+        next_run = loop.time()
+        try:
+            while not self._stop_event.is_set():
+                started = loop.time()
+                await run_inverter_production_cycle(
+                    owns=self.shards.owns if self.shards is not None else None
+                )
+                finished = loop.time()
+
+                next_run += self.interval_seconds
+                if finished > next_run:
+                    missed = int((finished - next_run) // self.interval_seconds) + 1
+                    logger.warning(
+                        f"[InverterService] Cycle overran: took {finished - started:.1f}s "
+                        f"(interval {self.interval_seconds}s); skipping {missed} tick(s)."
+                    )
+                    next_run += missed * self.interval_seconds
+
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), timeout=next_run - loop.time())
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self.shutdown()
+
+
+def main() -> None:
+    setup_logging()
+    configure_worker_logging()
+    if worker_settings.INVERTER_WORKER_ADAPTIVE_CADENCE:
+        # Tick at the fastest cadence; each cycle only polls inverters that are due.
+        interval_seconds = worker_settings.INVERTER_WORKER_CADENCE_MIN_INTERVAL_SECONDS
+    else:
+        interval_seconds = settings.GET_PRODUCTION_INTERVAL_MINUTES * 60
+
+    service = InverterWorkerService(
+        interval_seconds,
+        sharding_enabled=worker_settings.INVERTER_WORKER_SHARDING_ENABLED,
+    )
+    asyncio.run(service.run())
+
+
+if __name__ == "__main__":
+    main()
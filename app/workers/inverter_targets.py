@@ -0,0 +1,87 @@
+# app/workers/inverter_targets.py
+import asyncio
+import logging
+from typing import AsyncIterator, NamedTuple
+
+from sqlalchemy import and_, not_, select
+from sqlalchemy.orm import Session
+
+from app.models.installation import Installation
+from app.models.inverter import Inverter
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+class InverterTarget(NamedTuple):
+    """Everything the worker needs to poll one inverter, without the ORM graph."""
+
+    user_id: int
+    account: str
+    installation_id: int
+    inverter_id: int
+    serial: str
+
+
+def _has_credentials():
+    return and_(
+        User.huawei_username.is_not(None),
+        User.huawei_username != "",
+        User.huawei_password_encrypted.is_not(None),
+        User.huawei_password_encrypted != "",
+    )
+
+
+def _skipped_users_query():
+    return (
+        select(User.email)
+        .join(Installation, Installation.user_id == User.id)
+        .join(Inverter, Inverter.installation_id == Installation.id)
+        .where(not_(_has_credentials()))
+        .distinct()
+    )
+
+
+def _inverter_targets_query():
+    return (
+        select(
+            User.id,
+            User.huawei_username,
+            Installation.id,
+            Inverter.id,
+            Inverter.serial_number,
+        )
+        .join(Installation, Installation.user_id == User.id)
+        .join(Inverter, Inverter.installation_id == Installation.id)
+        .where(_has_credentials())
+        # Grouped order lets the worker batch per account/installation while streaming.
+        .order_by(User.id, Installation.id, Inverter.id)
+    )
+
+
+async def stream_inverter_targets(
+    db: Session, chunk_size: int = 500
+) -> AsyncIterator[list[InverterTarget]]:
+    """Yield pollable inverters in chunks, read through a server-side cursor.
+
+    Only one chunk of compact tuples is held at a time and rows are fetched off the
+    event loop. ``db`` must be a session dedicated to the enumeration: committing on
+    it would close the server-side cursor. Users whose Huawei username or password
+    is missing or empty are skipped, and listed at DEBUG level.
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        skipped = await asyncio.to_thread(lambda: db.scalars(_skipped_users_query()).all())
+        for email in skipped:
+            logger.debug("[Worker] Skipping user %s: missing Huawei credentials", email)
+
+    stmt = _inverter_targets_query().execution_options(yield_per=chunk_size)
+    result = await asyncio.to_thread(db.execute, stmt)
+    partitions = result.partitions()
+    try:
+        while True:
+            rows = await asyncio.to_thread(next, partitions, None)
+            if rows is None:
+                return
+            yield [InverterTarget(*row) for row in rows]
+    finally:
+        result.close()
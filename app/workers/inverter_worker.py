@@ -1,7 +1,11 @@
 # app/workers/inverter_worker.py
 import asyncio
 import logging
-from datetime import datetime, timezone
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Callable, Optional
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from sqlalchemy.orm import Session
@@ -11,34 +15,560 @@ from app.core.config import settings
 from app.core.db import SessionLocal
 from app.core.exceptions import HuaweiRateLimitException
 from app.events.inverter_event import InverterEvent, InverterEventPayload
+from app.models.user import User
 from app.nats.module import nats_module
+from app.repositories.inverter_power_interval_repository import InverterPowerIntervalRepository
 from app.repositories.inverter_power_record_repository import InverterPowerRepository
-from app.repositories.user_repository import UserRepository
+from app.workers.cadence import PollScheduler
+from app.workers.circuit_breaker import AccountCircuitBreaker, Admission
+from app.workers.event_pipeline import EventPublishPipeline, PlateauPolicy
+from app.workers import fusionsolar, metrics
+from app.workers.inverter_targets import InverterTarget, stream_inverter_targets
+from app.workers.last_value_cache import last_value_cache
+from app.workers.power_interval_buffer import PowerIntervalBuffer, open_interval_index
+from app.workers.power_record_buffer import PowerRecordBuffer
+from app.workers.power_rollups import power_rollups
+from app.workers.rate_limiter import BucketPolicy, VendorRateLimiter
+from app.workers.redis_client import get_redis
+from app.workers.settings import worker_settings
+from app.workers.vendor_sessions import VendorSessionStore, adapter_pool, build_session_store
 
 logger = logging.getLogger(__name__)
 scheduler = BackgroundScheduler()
 
+HUAWEI_VENDOR = "huawei"
+STORAGE_MODE_INTERVALS = "intervals"
+
+
+plateau_policy = PlateauPolicy(
+    worker_settings.INVERTER_WORKER_PLATEAU_POLICY,
+    heartbeat_cycles=worker_settings.INVERTER_WORKER_PLATEAU_HEARTBEAT_CYCLES,
+)
+
+
+poll_scheduler = PollScheduler(
+    min_interval=timedelta(seconds=worker_settings.INVERTER_WORKER_CADENCE_MIN_INTERVAL_SECONDS),
+    max_interval=timedelta(seconds=worker_settings.INVERTER_WORKER_CADENCE_MAX_INTERVAL_SECONDS),
+    night_interval=timedelta(
+        seconds=worker_settings.INVERTER_WORKER_CADENCE_NIGHT_INTERVAL_SECONDS
+    ),
+)
+
+
+@dataclass
+class CycleContext:
+    """Per-cycle state shared by all inverter polls."""
+
+    db: Session
+    # Latest-value source for cache misses, matching the storage mode.
+    repo: InverterPowerRepository | InverterPowerIntervalRepository
+    records: PowerRecordBuffer | PowerIntervalBuffer
+    events: EventPublishPipeline
+    global_limit: asyncio.Semaphore
+    rate_limiter: VendorRateLimiter
+    breaker: AccountCircuitBreaker
+    sessions: VendorSessionStore
+
+
+def _build_rate_limiter() -> VendorRateLimiter:
+    return VendorRateLimiter(
+        get_redis(),
+        vendor_policy=BucketPolicy(
+            rate_per_second=worker_settings.HUAWEI_RATE_LIMIT_PER_SECOND,
+            burst=worker_settings.HUAWEI_RATE_LIMIT_BURST,
+            min_rate_per_second=worker_settings.HUAWEI_RATE_LIMIT_PER_SECOND,
+            recovery_per_second=0.0,
+        ),
+        account_policy=BucketPolicy(
+            rate_per_second=worker_settings.HUAWEI_ACCOUNT_RATE_LIMIT_PER_SECOND,
+            burst=worker_settings.HUAWEI_ACCOUNT_RATE_LIMIT_BURST,
+            min_rate_per_second=worker_settings.HUAWEI_ACCOUNT_RATE_LIMIT_MIN_PER_SECOND,
+            recovery_per_second=worker_settings.HUAWEI_ACCOUNT_RATE_LIMIT_RECOVERY_PER_SECOND,
+        ),
+        throttle_backoff_seconds=worker_settings.HUAWEI_THROTTLE_BACKOFF_SECONDS,
+    )
+
+
+def _build_circuit_breaker() -> AccountCircuitBreaker:
+    return AccountCircuitBreaker(
+        get_redis(),
+        failure_threshold=worker_settings.INVERTER_WORKER_BREAKER_FAILURE_THRESHOLD,
+        base_cooldown_seconds=worker_settings.INVERTER_WORKER_BREAKER_BASE_COOLDOWN_SECONDS,
+        max_cooldown_seconds=worker_settings.INVERTER_WORKER_BREAKER_MAX_COOLDOWN_SECONDS,
+        probe_lease_seconds=worker_settings.INVERTER_WORKER_BREAKER_PROBE_LEASE_SECONDS,
+    )
+
+
+def _build_latest_repo(db: Session) -> InverterPowerRepository | InverterPowerIntervalRepository:
+    if worker_settings.INVERTER_WORKER_STORAGE_MODE == STORAGE_MODE_INTERVALS:
+        return InverterPowerIntervalRepository(db)
+    return InverterPowerRepository(db)
+
+
+def warm_caches(db: Session) -> None:
+    """Warm the last-value cache (and the open-interval index) from the active storage."""
+    try:
+        if worker_settings.INVERTER_WORKER_STORAGE_MODE == STORAGE_MODE_INTERVALS:
+            if not (open_interval_index.warmed and last_value_cache.warmed):
+                # The latest value of an inverter is its open interval's power.
+                open_interval_index.warm(db, last_value_cache)
+        elif not last_value_cache.warmed:
+            last_value_cache.warm(db)
+    except Exception as e:
+        # Not fatal: lookups fall back to the DB until the next warm-up attempt.
+        logger.exception("[Worker] Could not warm last-value cache: %s", e)
+        db.rollback()
+
 
-async def publish_inverter_event(payload: InverterEventPayload):
+def _build_record_buffer(db: Session) -> PowerRecordBuffer | PowerIntervalBuffer:
+    flush_size = worker_settings.INVERTER_WORKER_WRITE_BATCH_SIZE
+    if worker_settings.INVERTER_WORKER_STORAGE_MODE == STORAGE_MODE_INTERVALS:
+        return PowerIntervalBuffer(db, last_value_cache, flush_size=flush_size)
+    return PowerRecordBuffer(db, last_value_cache, flush_size=flush_size)
+
+
+async def publish_inverter_event(events: EventPublishPipeline, payload: InverterEventPayload):
     subject = f"device_communication.inverter.{payload.serial_number}.production.update"
     event = InverterEvent(payload=payload)
 
+    logger.info(
+        "[NATS] Publishing inverter event subject=%s status=%s active_power=%s timestamp=%s",
+        subject,
+        payload.status,
+        payload.active_power,
+        payload.timestamp,
+        extra={"event": "publish", "serial": payload.serial_number},
+    )
+    # submit() waits when the publish window is full, so this is NATS back-pressure.
+    with metrics.STAGE_SECONDS.labels("nats").time():
+        await events.submit(subject, event)
+
+
+def _observe_rollups(inverter_id: int, active_power: Optional[float], at: datetime) -> None:
+    if worker_settings.INVERTER_WORKER_ROLLUPS_ENABLED:
+        power_rollups.observe(inverter_id, active_power, at)
+
+
+async def _persist_failure(ctx: CycleContext, inverter_id: int, serial: str, reason: str) -> None:
+    change_time = datetime.now(timezone.utc)
+    has_latest, latest_power = last_value_cache.lookup(ctx.repo, inverter_id)
+    latest_is_none = has_latest and latest_power is None
+
+    if latest_is_none:
+        logger.info(
+            "[Worker] Skipping duplicate None power for inverter %s",
+            serial,
+            extra={"event": "failed_repeat", "serial": serial},
+        )
+        ctx.records.record_unchanged(inverter_id, None, change_time)
+    else:
+        ctx.records.record_change(inverter_id, latest_power, None, change_time)
+
+    _observe_rollups(inverter_id, None, change_time)
+    plateau_policy.reset(inverter_id)
+    metrics.POLL_OUTCOMES.labels("failed").inc()
+    payload = InverterEventPayload(
+        inverter_id=inverter_id,
+        serial_number=serial,
+        active_power=None,
+        status="failed",
+        error_message=reason,
+        timestamp=change_time,
+    )
+    await publish_inverter_event(ctx.events, payload)
+    logger.error(
+        "[Worker] Persisted None active_power for inverter %s at %s reason=%s; latest_is_none=%s",
+        serial,
+        change_time,
+        reason,
+        latest_is_none,
+        extra={"event": "failed", "serial": serial},
+    )
+
+
+async def _persist_reading(ctx: CycleContext, inverter_id: int, serial: str, active_power) -> None:
+    _, latest_power = last_value_cache.lookup(ctx.repo, inverter_id)
+
+    latest_value = round(latest_power, 2) if latest_power is not None else None
+
+    current_value = round(float(active_power), 2)
+
+    change_time = datetime.now(timezone.utc)
+
+    should_persist = latest_value is None or latest_value != current_value
+    _observe_rollups(inverter_id, current_value, change_time)
+
+    if should_persist:
+        ctx.records.record_change(inverter_id, latest_value, current_value, change_time)
+        plateau_policy.reset(inverter_id)
+        metrics.POLL_OUTCOMES.labels("updated").inc()
+        logger.info(
+            "[Worker] Saved new power record for inverter %s: %s",
+            serial,
+            current_value,
+            extra={"event": "updated", "serial": serial, "active_power": current_value},
+        )
+    else:
+        ctx.records.record_unchanged(inverter_id, current_value, change_time)
+        logger.info(
+            "[Worker] Power unchanged for inverter %s: %s; plateau extended",
+            serial,
+            current_value,
+            extra={"event": "plateau", "serial": serial, "active_power": current_value},
+        )
+        if not plateau_policy.should_publish(inverter_id):
+            metrics.POLL_OUTCOMES.labels("plateau_suppressed").inc()
+            logger.debug(
+                "[Worker] Plateau event suppressed for inverter %s",
+                serial,
+                extra={"event": "plateau", "serial": serial},
+            )
+            return
+        metrics.POLL_OUTCOMES.labels("plateau").inc()
+
+    payload = InverterEventPayload(
+        inverter_id=inverter_id,
+        serial_number=serial,
+        active_power=current_value,
+        status="updated",
+        timestamp=change_time,
+    )
+    await publish_inverter_event(ctx.events, payload)
+
+    logger.info(
+        "[Worker] Published %s event for inverter %s: %s",
+        "production update" if should_persist else "plateau update",
+        serial,
+        current_value,
+        extra={"event": "published", "serial": serial, "active_power": current_value},
+    )
+
+
+@dataclass
+class _Account:
+    user: object
+    adapter: object
+    limit: asyncio.Semaphore
+    # Half-open circuit: only one inverter of the account is polled this cycle.
+    probe: bool = False
+    dispatched: bool = False
+    # Outcome of the cycle, reported to the circuit breaker once per account.
+    succeeded: bool = False
+    failed: bool = False
+
+
+def _observe_fetch(started: float, result: str) -> None:
+    elapsed = time.perf_counter() - started
+    metrics.FETCH_LATENCY.labels(HUAWEI_VENDOR, result).observe(elapsed)
+    metrics.STAGE_SECONDS.labels("vendor").observe(elapsed)
+
+
+async def _vendor_call(ctx: CycleContext, account: _Account, fn: Callable, *args):
+    """Run one blocking vendor call off the event loop, rate limited and timed on its own.
+
+    Every call takes a token before it holds a global slot; an adapter that is not
+    logged in yet logs in on its first call, which costs the vendor a second request.
+    """
+    session = fusionsolar.http_session(account.adapter)
+    tokens = 2 if session is not None and not fusionsolar.logged_in(session) else 1
+    # Wait for quota before taking a global slot, so throttled accounts don't block others.
+    with metrics.STAGE_SECONDS.labels("rate_limit_wait").time():
+        for _ in range(tokens):
+            await ctx.rate_limiter.acquire(HUAWEI_VENDOR, account.user.huawei_username)
+
+    async with ctx.global_limit:
+        started = time.perf_counter()
+        try:
+            # Vendor adapters are blocking (requests); keep them off the event loop.
+            result = await asyncio.to_thread(fn, *args)
+        except HuaweiRateLimitException:
+            _observe_fetch(started, "rate_limited")
+            metrics.RATE_LIMIT_HITS.labels(HUAWEI_VENDOR).inc()
+            raise
+        except Exception:
+            _observe_fetch(started, "error")
+            raise
+        _observe_fetch(started, "ok")
+        return result
+
+
+def _fetch_kpi_batch(session, serials: list[str]) -> dict[str, list]:
+    """One getDevRealKpi call for ``serials``; runs in a worker thread."""
+    try:
+        return fusionsolar.get_production_many(session, settings.HUAWEI_API_URL, serials)
+    except fusionsolar.FusionSolarError as e:
+        if e.fail_code == fusionsolar.FAIL_CODE_RATE_LIMITED:
+            raise HuaweiRateLimitException(str(e)) from e
+        raise
+
+
+async def _fetch_one_by_one(
+    ctx: CycleContext, account: _Account, serials: list[str]
+) -> tuple[dict[str, list], dict[str, Exception]]:
+    production_by_serial: dict[str, list] = {}
+    errors: dict[str, Exception] = {}
+    for position, serial in enumerate(serials):
+        try:
+            production_by_serial[serial] = await _vendor_call(
+                ctx, account, account.adapter.get_production, serial
+            )
+        except HuaweiRateLimitException as e:
+            errors.update((rest, e) for rest in serials[position:])
+            break
+        except Exception as e:
+            logger.exception(
+                "[Worker] Failed to fetch production data for inverter %s: %s", serial, e
+            )
+            errors[serial] = e
+    return production_by_serial, errors
+
+
+# Adapter types already reported as lacking a requests session to batch on.
+_unbatched_adapters: set[str] = set()
+
+
+async def _fetch_production_many(
+    ctx: CycleContext, account: _Account, serials: list[str]
+) -> tuple[dict[str, list], dict[str, Exception]]:
+    """Fetch production for several devices of one account with as few vendor calls as possible.
+
+    The devices go out in one getDevRealKpi call (comma-separated devIds) on the
+    adapter's logged-in ``requests`` session. An adapter that is not logged in yet
+    fetches the first device through ``get_production``, which logs it in. Without a
+    session to batch on, or when FusionSolar asks for a new login, every serial gets
+    its own ``get_production``; there a failing serial only fails itself, and a rate
+    limit ends the loop early since the remaining serials would be throttled as well.
+    Returns ``({serial: production_data}, {serial: error})``.
+    """
+    adapter = account.adapter
+    session = fusionsolar.http_session(adapter)
+    if session is None:
+        adapter_type = type(adapter).__name__
+        if adapter_type not in _unbatched_adapters:
+            _unbatched_adapters.add(adapter_type)
+            logger.warning(
+                "[Worker] %s has no requests session; fetching inverters one by one",
+                adapter_type,
+            )
+        return await _fetch_one_by_one(ctx, account, serials)
+
+    production_by_serial: dict[str, list] = {}
+    pending = serials
+    if not fusionsolar.logged_in(session):
+        production_by_serial[serials[0]] = await _vendor_call(
+            ctx, account, adapter.get_production, serials[0]
+        )
+        pending = serials[1:]
+    if not pending:
+        return production_by_serial, {}
+
+    try:
+        production_by_serial.update(
+            await _vendor_call(ctx, account, _fetch_kpi_batch, session, pending)
+        )
+    except fusionsolar.FusionSolarError as e:
+        if e.fail_code != fusionsolar.FAIL_CODE_MUST_RELOGIN:
+            raise
+        # The session expired; the adapter's own calls log in again.
+        logger.info(
+            "[Worker] Session of user %s expired; fetching inverters one by one",
+            account.user.email,
+        )
+        fetched, errors = await _fetch_one_by_one(ctx, account, pending)
+        production_by_serial.update(fetched)
+        return production_by_serial, errors
+    return production_by_serial, {}
+
+
+# Installations whose cadence already logged the configured-location fallback.
+_fallback_located: set[int] = set()
+
+
+def _target_coordinates(target: InverterTarget) -> tuple[float, float]:
+    # Installations carry no coordinates in the schema; daylight uses the configured location.
+    if target.installation_id not in _fallback_located:
+        _fallback_located.add(target.installation_id)
+        logger.warning(
+            "[Worker] Installation %s has no coordinates; "
+            "adaptive cadence uses the default location (%s, %s)",
+            target.installation_id,
+            worker_settings.INVERTER_WORKER_DEFAULT_LATITUDE,
+            worker_settings.INVERTER_WORKER_DEFAULT_LONGITUDE,
+        )
+    return (
+        worker_settings.INVERTER_WORKER_DEFAULT_LATITUDE,
+        worker_settings.INVERTER_WORKER_DEFAULT_LONGITUDE,
+    )
+
+
+def _schedule_next_polls(
+    targets: list[InverterTarget], readings: dict[str, Optional[float]]
+) -> None:
+    if not worker_settings.INVERTER_WORKER_ADAPTIVE_CADENCE:
+        return
+    now = datetime.now(timezone.utc)
+    for target in targets:
+        poll_scheduler.schedule(
+            target.inverter_id, now, readings.get(target.serial), *_target_coordinates(target)
+        )
+
+
+async def _poll_batch(ctx: CycleContext, account: _Account, targets: list[InverterTarget]) -> None:
+    readings: dict[str, Optional[float]] = {}
     try:
+        await _poll_and_persist(ctx, account, targets, readings)
+    finally:
+        _schedule_next_polls(targets, readings)
+
+
+async def _poll_and_persist(
+    ctx: CycleContext,
+    account: _Account,
+    targets: list[InverterTarget],
+    readings: dict[str, Optional[float]],
+) -> None:
+    user = account.user
+    serials = [target.serial for target in targets]
+
+    # Account slot first, so an account waiting on its own limit never holds a global slot.
+    async with account.limit:
         logger.info(
-            f"[NATS] Publishing inverter event subject={subject} status={payload.status} "
-            f"active_power={payload.active_power} timestamp={payload.timestamp.isoformat()}"
+            "[Worker] Processing inverters %s for user %s...",
+            serials,
+            user.email,
+            extra={"event": "fetch"},
         )
-        await nats_module.events.publish_event(subject, event=event)
-        logger.info(f"NATS publish → {subject}: {event.model_dump(mode='json')}")
 
+        metrics.FETCH_BATCH_SIZE.observe(len(serials))
+        try:
+            production_by_serial, errors = await _fetch_production_many(ctx, account, serials)
+        except HuaweiRateLimitException as e:
+            production_by_serial, errors = {}, {serial: e for serial in serials}
+        except Exception as e:
+            logger.exception(
+                "[Worker] Failed to fetch production data for inverters %s: %s", serials, e
+            )
+            production_by_serial, errors = {}, {serial: e for serial in serials}
+
+    logger.debug(
+        "[Worker] Production data for %s: %s",
+        serials,
+        production_by_serial,
+        extra={"event": "fetch"},
+    )
+    throttled = any(isinstance(e, HuaweiRateLimitException) for e in errors.values())
+    if production_by_serial:
+        account.succeeded = True
+        await adapter_pool.after_success(user, ctx.sessions)
+    elif errors and not throttled:
+        account.failed = True
+    if throttled:
+        logger.warning("[Worker] Huawei rate limit for user %s's inverters", user.email)
+        # Throttling says nothing about the account's health; the breaker ignores it.
+        await ctx.rate_limiter.report_throttled(HUAWEI_VENDOR, user.huawei_username)
+
+    for target in targets:
+        serial = target.serial
+        error = errors.get(serial)
+        if isinstance(error, HuaweiRateLimitException):
+            metrics.FAILURES.labels("rate_limit").inc()
+            await _persist_failure(
+                ctx, target.inverter_id, serial, "Huawei API rate limit exceeded"
+            )
+            continue
+        if error is not None:
+            metrics.FAILURES.labels("fetch_error").inc()
+            await _persist_failure(ctx, target.inverter_id, serial, str(error))
+            continue
+
+        production_data = production_by_serial.get(serial) or [{}]
+        active_power = production_data[0].get("dataItemMap", {}).get("active_power")
+        if active_power is None:
+            msg = f"Inverter {serial} returned no 'active_power'"
+            metrics.FAILURES.labels("no_data").inc()
+            logger.warning("[Worker] %s", msg)
+            await _persist_failure(ctx, target.inverter_id, serial, msg)
+            continue
+
+        readings[serial] = float(active_power)
+        await _persist_reading(ctx, target.inverter_id, serial, active_power)
+
+
+def _build_adapter(user_id: int):
+    """Construct (and possibly log in) an account's adapter; runs in a worker thread.
+
+    The cycle's session belongs to the event loop, so the thread reads the user
+    through a session of its own.
+    """
+    with SessionLocal() as db:
+        return get_adapter_for_user(db, db.get(User, user_id))
+
+
+async def _open_account(ctx: CycleContext, user_id: int, account: str) -> Optional[_Account]:
+    # An open circuit skips the account before any DB read or vendor login.
+    admission = await ctx.breaker.allow(HUAWEI_VENDOR, account)
+    if not admission:
+        logger.info("[Worker] Circuit open for account %s; skipping it this cycle", account)
+        return None
+
+    # The credentials (the pool key) are read here; the adapter itself is built off the loop.
+    with metrics.STAGE_SECONDS.labels("db").time():
+        user = ctx.db.get(User, user_id)
+    if not adapter_pool.has(user):
+        # Building an adapter may log in to the vendor; that request needs a token too.
+        with metrics.STAGE_SECONDS.labels("rate_limit_wait").time():
+            await ctx.rate_limiter.acquire(HUAWEI_VENDOR, account)
+    try:
+        adapter = await adapter_pool.get(
+            user, HUAWEI_VENDOR, ctx.sessions, partial(_build_adapter, user_id)
+        )
     except Exception as e:
-        logger.error(f"Failed to publish inverter event ({event.payload.serial_number}): {e}")
+        logger.error("[Worker] Could not initialize HuaweiAdapter for %s: %s", user.email, e)
+        await ctx.breaker.record_failure(HUAWEI_VENDOR, account)
+        return None
+    return _Account(
+        user=user,
+        adapter=adapter,
+        limit=asyncio.Semaphore(worker_settings.INVERTER_WORKER_ACCOUNT_CONCURRENCY),
+        probe=admission == Admission.PROBE,
+    )
 
 
-async def fetch_inverter_production_async():
-    logger.info("=" * 80)
-    logger.info("[Worker] Starting inverter production update cycle...")
+async def _report_accounts(ctx: CycleContext, accounts: list[_Account]) -> None:
+    """Feed each account's cycle outcome to the circuit breaker, once per account."""
+    for account in accounts:
+        name = account.user.huawei_username
+        if account.succeeded:
+            await ctx.breaker.record_success(HUAWEI_VENDOR, name)
+        elif account.failed:
+            await ctx.breaker.record_failure(HUAWEI_VENDOR, name)
+
 
+async def _finish_cycle(ctx: CycleContext) -> None:
+    """Deliver the queued events and merge rollups, whatever happened to the records."""
+    try:
+        with metrics.STAGE_SECONDS.labels("nats").time():
+            await ctx.events.drain()
+    except Exception as e:
+        logger.exception("[Worker] Could not drain inverter events: %s", e)
+    metrics.EVENTS.labels("published").inc(ctx.events.published)
+    metrics.EVENTS.labels("failed").inc(ctx.events.failed)
+    logger.info(
+        "[Worker] Published %d inverter events this cycle (%d failed).",
+        ctx.events.published,
+        ctx.events.failed,
+    )
+
+    if worker_settings.INVERTER_WORKER_ROLLUPS_ENABLED:
+        try:
+            with metrics.STAGE_SECONDS.labels("db").time():
+                power_rollups.flush(ctx.db)
+        except Exception as e:
+            # Totals stay in memory and are merged on the next cycle.
+            logger.error("[Worker] Could not update power rollups: %s", e)
+
+
+async def ensure_nats_ready():
     logger.info("[Worker] Ensuring NATS connection + stream...")
     if not nats_module.client.connected or nats_module.client.js is None:
         await nats_module.client.connect()
@@ -48,209 +578,135 @@ async def fetch_inverter_production_async():
         f"(connected={nats_module.client.connected}, js_ready={nats_module.client.js is not None})"
     )
 
+
+async def run_inverter_production_cycle(owns: Optional[Callable[[int], bool]] = None):
+    """Run one polling cycle; expects NATS to be connected already.
+
+    ``owns`` restricts the cycle to the inverters this worker is responsible for
+    when the fleet is sharded across replicas.
+    """
+    logger.info("=" * 80)
+    logger.info("[Worker] Starting inverter production update cycle...")
+    timer_started = time.perf_counter()
+
     db: Session = SessionLocal()
+    # Separate session: commits on ``db`` would close the enumeration's server-side cursor.
+    enumeration_db: Session = SessionLocal()
+    ctx: Optional[CycleContext] = None
 
     try:
-        user_repo = UserRepository()
-        users = user_repo.get_all_with_installations_and_inverters(db)
-        logger.info(f"[Worker] Retrieved {len(users)} users with installations & inverters.")
-
-        if not users:
-            logger.warning("[Worker] No users with installations found.")
-            return
+        warm_caches(db)
+
+        # Semaphores are bound to the running loop, so they are created per cycle.
+        ctx = CycleContext(
+            db=db,
+            repo=_build_latest_repo(db),
+            records=_build_record_buffer(db),
+            events=EventPublishPipeline(
+                nats_module.events.publish_event,
+                max_in_flight=worker_settings.INVERTER_WORKER_PUBLISH_WINDOW,
+            ),
+            global_limit=asyncio.Semaphore(worker_settings.INVERTER_WORKER_CONCURRENCY),
+            rate_limiter=_build_rate_limiter(),
+            breaker=_build_circuit_breaker(),
+            sessions=build_session_store(get_redis(), settings.FERNET_KEY),
+        )
+        adaptive = worker_settings.INVERTER_WORKER_ADAPTIVE_CADENCE
+        batch_size = worker_settings.INVERTER_WORKER_BATCH_SIZE
+        cycle_started = datetime.now(timezone.utc)
+
+        accounts: dict[int, Optional[_Account]] = {}
+        polls: list[asyncio.Task] = []
+        batch: list[InverterTarget] = []
+        enumerated = 0
+        polled = 0
+
+        async def dispatch(targets: list[InverterTarget]) -> None:
+            nonlocal polled
+            user_id = targets[0].user_id
+            if user_id not in accounts:
+                accounts[user_id] = await _open_account(ctx, user_id, targets[0].account)
+            account = accounts[user_id]
+            if account is None or (account.probe and account.dispatched):
+                metrics.POLL_OUTCOMES.labels("skipped").inc(len(targets))
+                return
+            if account.probe:
+                # The half-open probe is a single vendor call for a single inverter.
+                metrics.POLL_OUTCOMES.labels("skipped").inc(len(targets) - 1)
+                targets = targets[:1]
+            account.dispatched = True
+            polls.append(asyncio.create_task(_poll_batch(ctx, account, targets)))
+            polled += len(targets)
+
+        # One installation maps to one FusionSolar station, so its inverters share a call.
+        # Batches are dispatched while the enumeration is still streaming.
+        async for chunk in stream_inverter_targets(
+            enumeration_db, chunk_size=worker_settings.INVERTER_WORKER_ENUMERATION_CHUNK_SIZE
+        ):
+            enumerated += len(chunk)
+            for target in chunk:
+                if owns is not None and not owns(target.inverter_id):
+                    continue
+                if adaptive and not poll_scheduler.is_due(target.inverter_id, cycle_started):
+                    continue
+                if batch and (
+                    len(batch) >= batch_size
+                    or (target.user_id, target.installation_id)
+                    != (batch[0].user_id, batch[0].installation_id)
+                ):
+                    await dispatch(batch)
+                    batch = []
+                batch.append(target)
+        if batch:
+            await dispatch(batch)
+
+        if not enumerated:
+            logger.warning("[Worker] No inverters with Huawei credentials found.")
 
-        for user in users:
-
-            if not user.huawei_username or not user.huawei_password_encrypted:
-                logger.warning(f"[Worker] Skipping user {user.email}: missing Huawei credentials.")
-                continue
-
-            try:
-                adapter = get_adapter_for_user(db, user)
-            except Exception as e:
-                logger.error(f"[Worker] Could not initialize HuaweiAdapter for {user.email}: {e}")
-                continue
-
-            for installation in user.installations:
-                for inverter in installation.inverters:
-
-                    serial = inverter.serial_number
-                    inverter_id = inverter.id
-                    repo = InverterPowerRepository(db)
-
-                    logger.info(
-                        f"[Worker] Processing inverter {serial} (ID={inverter_id}) "
-                        f"for user {user.email}..."
-                    )
-
-                    try:
-                        production_data = adapter.get_production(serial)
-                        logger.debug(f"[Worker] Production data for {serial}: {production_data}")
-
-                    except HuaweiRateLimitException as e:
-                        logger.warning(f"[Worker] Huawei rate limit for inverter {serial}: {e}")
-                        change_time = datetime.now(timezone.utc)
-                        latest = repo.get_latest_for_inverter(inverter_id)
-                        latest_is_none = latest and latest.active_power is None
-
-                        if latest_is_none:
-                            logger.info(
-                                f"[Worker] Skipping duplicate None power for inverter {serial}"
-                            )
-                        else:
-                            if latest and latest.active_power is not None:
-                                repo.create_record(
-                                    inverter_id, float(latest.active_power), timestamp=change_time
-                                )
-                            repo.create_record(inverter_id, None, timestamp=change_time)
-
-                        payload = InverterEventPayload(
-                            inverter_id=inverter_id,
-                            serial_number=serial,
-                            active_power=None,
-                            status="failed",
-                            error_message="Huawei API rate limit exceeded",
-                            timestamp=change_time,
-                        )
-                        await publish_inverter_event(payload)
-                        logger.error(
-                            f"[Worker] Persisted None active_power for inverter {serial} at {change_time.isoformat()} "
-                            f"reason=Huawei API rate limit exceeded; latest_is_none={latest_is_none}"
-                        )
-                        await asyncio.sleep(1.2)
-                        continue
-
-                    except Exception as e:
-                        logger.exception(
-                            f"[Worker] Failed to fetch production data for inverter {serial}: {e}"
-                        )
-                        change_time = datetime.now(timezone.utc)
-                        latest = repo.get_latest_for_inverter(inverter_id)
-                        latest_is_none = latest and latest.active_power is None
-
-                        if latest_is_none:
-                            logger.info(
-                                f"[Worker] Skipping duplicate None power for inverter {serial}"
-                            )
-                        else:
-                            if latest and latest.active_power is not None:
-                                repo.create_record(
-                                    inverter_id, float(latest.active_power), timestamp=change_time
-                                )
-                            repo.create_record(inverter_id, None, timestamp=change_time)
-                            logger.error(
-                                f"[Worker] Persisted None active_power for inverter {serial} at {change_time.isoformat()} "
-                                f"reason={e}"
-                            )
-
-                        payload = InverterEventPayload(
-                            inverter_id=inverter_id,
-                            serial_number=serial,
-                            active_power=None,
-                            status="failed",
-                            error_message=str(e),
-                            timestamp=change_time,
-                        )
-                        await publish_inverter_event(payload)
-                        logger.error(
-                            f"[Worker] Reported failed reading for inverter {serial} at {change_time.isoformat()} "
-                            f"reason={e}; latest_is_none={latest_is_none}"
-                        )
-                        continue
-
-                    active_power = production_data[0].get("dataItemMap", {}).get("active_power")
-                    if active_power is None:
-                        msg = f"Inverter {serial} returned no 'active_power'"
-                        logger.warning(f"[Worker] {msg}")
-                        change_time = datetime.now(timezone.utc)
-                        latest = repo.get_latest_for_inverter(inverter_id)
-                        latest_is_none = latest and latest.active_power is None
-
-                        if latest_is_none:
-                            logger.info(
-                                f"[Worker] Skipping duplicate None power for inverter {serial}"
-                            )
-                        else:
-                            if latest and latest.active_power is not None:
-                                repo.create_record(
-                                    inverter_id, float(latest.active_power), timestamp=change_time
-                                )
-                            repo.create_record(inverter_id, None, timestamp=change_time)
-
-                        payload = InverterEventPayload(
-                            inverter_id=inverter_id,
-                            serial_number=serial,
-                            active_power=None,
-                            status="failed",
-                            error_message=msg,
-                            timestamp=change_time,
-                        )
-                        await publish_inverter_event(payload)
-                        logger.error(
-                            f"[Worker] Persisted None active_power for inverter {serial} at {change_time.isoformat()} "
-                            f"reason={msg}; latest_is_none={latest_is_none}"
-                        )
-                        continue
-
-                    latest = repo.get_latest_for_inverter(inverter_id)
-
-                    latest_value = (
-                        round(float(latest.active_power), 2)
-                        if latest and latest.active_power is not None
-                        else None
-                    )
-
-                    current_value = round(float(active_power), 2)
-
-                    change_time = datetime.now(timezone.utc)
-
-                    if latest_value is not None and latest_value != current_value:
-                        repo.create_record(inverter_id, latest_value, timestamp=change_time)
-
-                    should_persist = latest_value is None or latest_value != current_value
-
-                    if should_persist:
-                        repo.create_record(inverter_id, current_value, timestamp=change_time)
-                        logger.info(
-                            f"[Worker] Saved new power record for inverter {serial}: {current_value}"
-                        )
-
-                        payload = InverterEventPayload(
-                            inverter_id=inverter_id,
-                            serial_number=serial,
-                            active_power=current_value,
-                            status="updated",
-                            timestamp=change_time,
-                        )
-                        await publish_inverter_event(payload)
-                        logger.info(
-                            f"[Worker] Published production update event for inverter {serial}: {current_value}"
-                        )
-                    else:
-                        logger.info(
-                            f"[Worker] Power unchanged for inverter {serial}: {current_value}; plateau extended"
-                        )
-                        payload = InverterEventPayload(
-                            inverter_id=inverter_id,
-                            serial_number=serial,
-                            active_power=current_value,
-                            status="updated",
-                            timestamp=change_time,
-                        )
-                        await publish_inverter_event(payload)
-                        logger.info(
-                            f"[Worker] Published plateau update for inverter {serial}: {current_value}"
-                        )
+        logger.info(
+            "[Worker] Polling %d inverter batches out of %d inverters "
+            "(concurrency=%d, per_account=%d)",
+            len(polls),
+            enumerated,
+            worker_settings.INVERTER_WORKER_CONCURRENCY,
+            worker_settings.INVERTER_WORKER_ACCOUNT_CONCURRENCY,
+        )
+        results = await asyncio.gather(*polls, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("[Worker] Inverter batch poll crashed: %r", result)
+        await _report_accounts(ctx, [account for account in accounts.values() if account])
+
+        metrics.CYCLE_INVERTERS.labels("enumerated").set(enumerated)
+        metrics.CYCLE_INVERTERS.labels("polled").set(polled)
+
+        try:
+            with metrics.STAGE_SECONDS.labels("db").time():
+                ctx.records.flush()
+        except Exception as e:
+            # The buffer logged and rolled back; the cycle's events are still delivered.
+            logger.error("[Worker] Could not persist the cycle's remaining power records: %s", e)
+        logger.info("[Worker] Persisted %d power records this cycle.", ctx.records.written)
 
     except Exception as e:
-        logger.exception(f"[Worker] Fatal worker error: {e}")
+        logger.exception("[Worker] Fatal worker error: %s", e)
 
     finally:
+        if ctx is not None:
+            await _finish_cycle(ctx)
+        enumeration_db.close()
         db.close()
+        metrics.CYCLE_DURATION.observe(time.perf_counter() - timer_started)
+        logger.info("[Worker] Last-value cache stats: %s", last_value_cache.stats())
         logger.info("[Worker] Finished inverter production update cycle.")
         logger.info("=" * 80)
 
 
+async def fetch_inverter_production_async():
+    await ensure_nats_ready()
+    await run_inverter_production_cycle()
+
+
 def fetch_inverter_production():
     asyncio.run(fetch_inverter_production_async())
 
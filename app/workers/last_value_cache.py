@@ -0,0 +1,89 @@
+# app/workers/last_value_cache.py
+import logging
+from typing import Callable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.inverter_power_record import InverterPowerRecord
+from app.repositories.inverter_power_record_repository import InverterPowerRepository
+
+logger = logging.getLogger(__name__)
+
+# Marks inverters that are known to have no power records yet.
+_NO_HISTORY = object()
+
+
+class LastValueCache:
+    """Worker-side cache of the latest persisted ``active_power`` per inverter.
+
+    Warmed once with a single ``DISTINCT ON (inverter_id)`` query, kept current by
+    :meth:`set` on every write and falling back to the repository only on a miss.
+    In interval storage the repository is the interval one and :meth:`load` seeds
+    the cache from the open intervals.
+    """
+
+    def __init__(self):
+        self._values: dict[int, object] = {}
+        self.warmed = False
+        self.hits = 0
+        self.misses = 0
+
+    def warm(self, db: Session) -> None:
+        # A change writes the previous and the new value with the same timestamp;
+        # the higher id is the newer row.
+        stmt = select(InverterPowerRecord.inverter_id, InverterPowerRecord.active_power).order_by(
+            InverterPowerRecord.inverter_id,
+            InverterPowerRecord.timestamp.desc(),
+            InverterPowerRecord.id.desc(),
+        )
+        if db.get_bind().dialect.name == "postgresql":
+            stmt = stmt.distinct(InverterPowerRecord.inverter_id)
+
+        values: dict[int, Optional[float]] = {}
+        for inverter_id, active_power in db.execute(stmt):
+            # The first row per inverter is its latest.
+            values.setdefault(inverter_id, None if active_power is None else float(active_power))
+        self.load(values)
+
+    def load(self, values: dict[int, Optional[float]]) -> None:
+        """Replace the cache with known latest values, e.g. read from open intervals."""
+        self._values = dict(values)
+        self.warmed = True
+        logger.info(f"[LastValueCache] Warmed with {len(self._values)} inverters.")
+
+    def lookup(
+        self, repo: InverterPowerRepository, inverter_id: int
+    ) -> tuple[bool, Optional[float]]:
+        """Return ``(has_history, active_power)`` for the inverter's latest record."""
+        if inverter_id in self._values:
+            self.hits += 1
+            value = self._values[inverter_id]
+        else:
+            self.misses += 1
+            latest = repo.get_latest_for_inverter(inverter_id)
+            if latest is None:
+                value = _NO_HISTORY
+            else:
+                value = None if latest.active_power is None else float(latest.active_power)
+            self._values[inverter_id] = value
+
+        if value is _NO_HISTORY:
+            return False, None
+        return True, value
+
+    def set(self, inverter_id: int, active_power: Optional[float]) -> None:
+        self._values[inverter_id] = active_power
+
+    def invalidate(self, inverter_id: int) -> None:
+        self._values.pop(inverter_id, None)
+
+    def invalidate_where(self, predicate: Callable[[int], bool]) -> None:
+        for inverter_id in [i for i in self._values if predicate(i)]:
+            del self._values[inverter_id]
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._values)}
+
+
+last_value_cache = LastValueCache()
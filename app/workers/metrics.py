@@ -0,0 +1,71 @@
+# app/workers/metrics.py
+"""Prometheus metrics of the inverter worker.
+
+Exposed on ``INVERTER_WORKER_METRICS_PORT`` by the long-running service. Stage
+timings are summaries, so ``rate(..._sum) / rate(..._count)`` gives the mean and
+``rate(..._sum)`` the share of wall time spent in each stage.
+"""
+import logging
+
+from prometheus_client import Counter, Gauge, Histogram, Summary, start_http_server
+
+logger = logging.getLogger(__name__)
+
+CYCLE_DURATION = Histogram(
+    "inverter_worker_cycle_duration_seconds",
+    "Wall time of one polling cycle.",
+    buckets=(1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600),
+)
+CYCLE_INVERTERS = Gauge(
+    "inverter_worker_cycle_inverters",
+    "Inverters handled by the last cycle.",
+    ["state"],  # enumerated | polled
+)
+FETCH_LATENCY = Histogram(
+    "inverter_worker_vendor_fetch_seconds",
+    "Latency of one vendor production call (one batch of inverters).",
+    ["vendor", "result"],  # result: ok | rate_limited | error
+    buckets=(0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60),
+)
+FETCH_BATCH_SIZE = Histogram(
+    "inverter_worker_vendor_fetch_batch_size",
+    "Inverters fetched per vendor call.",
+    buckets=(1, 2, 5, 10, 20, 50, 100),
+)
+STAGE_SECONDS = Summary(
+    "inverter_worker_stage_seconds",
+    "Time spent in a worker stage.",
+    ["stage"],  # vendor | rate_limit_wait | db | nats
+)
+RATE_LIMIT_HITS = Counter(
+    "inverter_worker_rate_limit_hits_total",
+    "Vendor calls rejected by the vendor's rate limit.",
+    ["vendor"],
+)
+POLL_OUTCOMES = Counter(
+    "inverter_worker_poll_outcomes_total",
+    "Per-inverter poll outcomes.",
+    ["outcome"],  # updated | plateau | plateau_suppressed | failed
+)
+FAILURES = Counter(
+    "inverter_worker_failures_total",
+    "Per-inverter failures by reason.",
+    ["reason"],  # rate_limit | fetch_error | no_data
+)
+EVENTS = Counter(
+    "inverter_worker_events_total",
+    "Inverter events handed to NATS.",
+    ["result"],  # published | failed
+)
+
+_server_started = False
+
+
+def start_metrics_server(port: int) -> None:
+    """Serve ``/metrics`` on ``port``; a port of 0 disables the endpoint."""
+    global _server_started
+    if port <= 0 or _server_started:
+        return
+    start_http_server(port)
+    _server_started = True
+    logger.info(f"[Metrics] Serving Prometheus metrics on :{port}/metrics")
@@ -0,0 +1,188 @@
+# app/workers/power_interval_buffer.py
+import logging
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.inverter_power_interval import InverterPowerInterval
+from app.repositories.inverter_power_interval_repository import InverterPowerIntervalRepository
+from app.workers.last_value_cache import LastValueCache
+
+logger = logging.getLogger(__name__)
+
+_intervals = InverterPowerInterval.__table__
+
+
+class OpenIntervalIndex:
+    """``start_at`` of each inverter's open interval, which identifies the row to extend."""
+
+    def __init__(self):
+        self._starts: dict[int, Optional[datetime]] = {}
+        self.warmed = False
+
+    def warm(self, db: Session, cache: Optional[LastValueCache] = None) -> None:
+        """Read every inverter's open interval; also seed ``cache`` with their power."""
+        stmt = (
+            select(
+                InverterPowerInterval.inverter_id,
+                InverterPowerInterval.start_at,
+                InverterPowerInterval.active_power,
+            )
+            .order_by(InverterPowerInterval.inverter_id, InverterPowerInterval.start_at.desc())
+        )
+        if db.get_bind().dialect.name == "postgresql":
+            stmt = stmt.distinct(InverterPowerInterval.inverter_id)
+
+        starts: dict[int, Optional[datetime]] = {}
+        values: dict[int, Optional[float]] = {}
+        for inverter_id, start_at, active_power in db.execute(stmt):
+            # The first row per inverter is its open interval.
+            if inverter_id not in starts:
+                starts[inverter_id] = start_at
+                values[inverter_id] = None if active_power is None else float(active_power)
+        self._starts = starts
+        self.warmed = True
+        logger.info(f"[OpenIntervalIndex] Warmed with {len(self._starts)} inverters.")
+        if cache is not None:
+            cache.load(values)
+
+    def get(self, repo: InverterPowerIntervalRepository, inverter_id: int) -> Optional[datetime]:
+        if inverter_id not in self._starts:
+            interval = repo.get_open_for_inverter(inverter_id)
+            self._starts[inverter_id] = interval.start_at if interval else None
+        return self._starts[inverter_id]
+
+    def set(self, inverter_id: int, start_at: datetime) -> None:
+        self._starts[inverter_id] = start_at
+
+    def invalidate(self, inverter_id: int) -> None:
+        self._starts.pop(inverter_id, None)
+
+    def invalidate_where(self, predicate: Callable[[int], bool]) -> None:
+        for inverter_id in [i for i in self._starts if predicate(i)]:
+            del self._starts[inverter_id]
+
+
+open_interval_index = OpenIntervalIndex()
+
+
+class PowerIntervalBuffer:
+    """Interval-encoded counterpart of :class:`PowerRecordBuffer`.
+
+    A change closes the open interval at the change time and opens a new one; an
+    unchanged poll only moves the open interval's ``end_at``. Pending inserts absorb
+    extensions in memory, and each flush writes one batched UPDATE plus one
+    multi-row INSERT in a single transaction.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        cache: LastValueCache,
+        index: OpenIntervalIndex = open_interval_index,
+        flush_size: int = 1000,
+    ):
+        self.db = db
+        self.cache = cache
+        self.index = index
+        self.repo = InverterPowerIntervalRepository(db)
+        self.flush_size = flush_size
+        self.written = 0
+        self._inserts: dict[tuple[int, datetime], dict] = {}
+        self._extends: dict[tuple[int, datetime], datetime] = {}
+
+    def _pending(self) -> int:
+        return len(self._inserts) + len(self._extends)
+
+    def _extend(self, inverter_id: int, start_at: datetime, end_at: datetime) -> None:
+        key = (inverter_id, start_at)
+        if key in self._inserts:
+            self._inserts[key]["end_at"] = end_at
+        else:
+            self._extends[key] = end_at
+
+    def _open(self, inverter_id: int, active_power: Optional[float], at: datetime) -> None:
+        self._inserts[(inverter_id, at)] = {
+            "inverter_id": inverter_id,
+            "active_power": active_power,
+            "start_at": at,
+            "end_at": at,
+        }
+        self.index.set(inverter_id, at)
+        self.cache.set(inverter_id, active_power)
+
+    def record_change(
+        self,
+        inverter_id: int,
+        previous: Optional[float],
+        current: Optional[float],
+        timestamp: datetime,
+    ) -> None:
+        start_at = self.index.get(self.repo, inverter_id)
+        if start_at is not None:
+            self._extend(inverter_id, start_at, timestamp)
+        self._open(inverter_id, current, timestamp)
+        if self._pending() >= self.flush_size:
+            self._auto_flush()
+
+    def record_unchanged(
+        self, inverter_id: int, active_power: Optional[float], timestamp: datetime
+    ) -> None:
+        start_at = self.index.get(self.repo, inverter_id)
+        if start_at is None:
+            # No interval yet (e.g. history still stored as points): start one now.
+            self._open(inverter_id, active_power, timestamp)
+        else:
+            self._extend(inverter_id, start_at, timestamp)
+        if self._pending() >= self.flush_size:
+            self._auto_flush()
+
+    def _auto_flush(self) -> None:
+        try:
+            self.flush()
+        except Exception:
+            # Already logged and rolled back by flush(); the cycle goes on.
+            pass
+
+    def flush(self) -> int:
+        if not self._pending():
+            return 0
+
+        inserts, self._inserts = self._inserts, {}
+        extends, self._extends = self._extends, {}
+        try:
+            if extends:
+                self.db.execute(
+                    update(_intervals)
+                    .where(
+                        _intervals.c.inverter_id == bindparam("b_inverter_id"),
+                        _intervals.c.start_at == bindparam("b_start_at"),
+                    )
+                    .values(end_at=bindparam("b_end_at")),
+                    [
+                        {"b_inverter_id": inverter_id, "b_start_at": start_at, "b_end_at": end_at}
+                        for (inverter_id, start_at), end_at in extends.items()
+                    ],
+                )
+            if inserts:
+                self.db.execute(insert(InverterPowerInterval), list(inserts.values()))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            for inverter_id, _ in [*inserts, *extends]:
+                self.cache.invalidate(inverter_id)
+                self.index.invalidate(inverter_id)
+            logger.exception(
+                f"[PowerIntervalBuffer] Failed to write {len(inserts)} new and "
+                f"{len(extends)} extended power intervals"
+            )
+            raise
+
+        self.written += len(inserts)
+        logger.info(
+            f"[PowerIntervalBuffer] Wrote {len(inserts)} new and "
+            f"{len(extends)} extended power intervals"
+        )
+        return len(inserts) + len(extends)
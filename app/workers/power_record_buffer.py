@@ -0,0 +1,82 @@
+# app/workers/power_record_buffer.py
+import logging
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.inverter_power_record import InverterPowerRecord
+from app.workers.last_value_cache import LastValueCache
+
+logger = logging.getLogger(__name__)
+
+
+class PowerRecordBuffer:
+    """Collects power records of a cycle and writes them with one multi-row INSERT.
+
+    Rows are flushed automatically once ``flush_size`` is reached and explicitly at
+    the end of the cycle; each flush is a single transaction. If a flush fails the
+    affected inverters are dropped from the last-value cache so they are re-read;
+    an automatic flush swallows the error so the rest of the cycle still runs.
+    """
+
+    def __init__(self, db: Session, cache: LastValueCache, flush_size: int = 1000):
+        self.db = db
+        self.cache = cache
+        self.flush_size = flush_size
+        self.written = 0
+        self._rows: list[dict] = []
+
+    def add(self, inverter_id: int, active_power: Optional[float], timestamp: datetime) -> None:
+        self._rows.append(
+            {"inverter_id": inverter_id, "active_power": active_power, "timestamp": timestamp}
+        )
+        self.cache.set(inverter_id, active_power)
+        if len(self._rows) >= self.flush_size:
+            self._auto_flush()
+
+    def record_change(
+        self,
+        inverter_id: int,
+        previous: Optional[float],
+        current: Optional[float],
+        timestamp: datetime,
+    ) -> None:
+        # Step-function encoding: repeat the previous value at the change time, then the new one.
+        if previous is not None:
+            self.add(inverter_id, previous, timestamp)
+        self.add(inverter_id, current, timestamp)
+
+    def record_unchanged(
+        self, inverter_id: int, active_power: Optional[float], timestamp: datetime
+    ) -> None:
+        # Plateaus are implicit in point storage.
+        return None
+
+    def _auto_flush(self) -> None:
+        try:
+            self.flush()
+        except Exception:
+            # Already logged and rolled back by flush(); the cycle goes on.
+            pass
+
+    def flush(self) -> int:
+        if not self._rows:
+            return 0
+
+        rows, self._rows = self._rows, []
+        try:
+            # executemany path: SQLAlchemy batches the rows into multi-VALUES statements.
+            self.db.execute(insert(InverterPowerRecord), rows)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            for row in rows:
+                self.cache.invalidate(row["inverter_id"])
+            logger.exception(f"[PowerRecordBuffer] Failed to write {len(rows)} power records")
+            raise
+
+        self.written += len(rows)
+        logger.info(f"[PowerRecordBuffer] Wrote {len(rows)} power records")
+        return len(rows)
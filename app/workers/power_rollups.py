@@ -0,0 +1,155 @@
+# app/workers/power_rollups.py
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.inverter_power_rollup import ROLLUP_BUCKETS, bucket_start
+from app.repositories.inverter_power_rollup_repository import InverterPowerRollupRepository
+from app.workers.settings import worker_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _BucketTotals:
+    min_power: Optional[float] = None
+    max_power: Optional[float] = None
+    energy_wh: float = 0.0
+    covered_seconds: float = 0.0
+
+    def add_sample(self, active_power: float) -> None:
+        if self.min_power is None or active_power < self.min_power:
+            self.min_power = active_power
+        if self.max_power is None or active_power > self.max_power:
+            self.max_power = active_power
+
+    def add_span(self, active_power: float, seconds: float) -> None:
+        self.add_sample(active_power)
+        self.energy_wh += active_power * seconds / 3600
+        self.covered_seconds += seconds
+
+
+class PowerRollupAccumulator:
+    """Maintains 1m/15m/1h/1d rollups incrementally from the worker's readings.
+
+    Each reading is held until the next one (step function); the span between two
+    readings is split on bucket boundaries and integrated into energy. Spans longer
+    than ``max_gap`` (worker downtime) are not integrated; without one, a value is
+    held until the next reading however long that takes. Totals are kept in memory
+    and merged into the rollup table by :meth:`flush`; on failure they are kept for
+    the next flush, up to ``max_pending`` buckets.
+    """
+
+    def __init__(self, max_gap: Optional[timedelta], max_pending: Optional[int] = None):
+        self.max_gap = max_gap
+        self.max_pending = max_pending
+        self._last: dict[int, tuple[datetime, Optional[float]]] = {}
+        self._totals: dict[tuple[int, str, datetime], _BucketTotals] = {}
+
+    def _bucket(self, inverter_id: int, bucket: str, start: datetime) -> _BucketTotals:
+        key = (inverter_id, bucket, start)
+        totals = self._totals.get(key)
+        if totals is None:
+            totals = self._totals[key] = _BucketTotals()
+        return totals
+
+    def _add_span(
+        self, inverter_id: int, active_power: float, start: datetime, end: datetime
+    ) -> None:
+        for bucket, width in ROLLUP_BUCKETS.items():
+            cursor = start
+            while cursor < end:
+                current_bucket = bucket_start(cursor, width)
+                piece_end = min(end, current_bucket + width)
+                self._bucket(inverter_id, bucket, current_bucket).add_span(
+                    active_power, (piece_end - cursor).total_seconds()
+                )
+                cursor = piece_end
+
+    def observe(self, inverter_id: int, active_power: Optional[float], at: datetime) -> None:
+        last = self._last.get(inverter_id)
+        if last is not None:
+            since, held_power = last
+            elapsed = at - since
+            if (
+                held_power is not None
+                and elapsed > timedelta(0)
+                and (self.max_gap is None or elapsed <= self.max_gap)
+            ):
+                self._add_span(inverter_id, held_power, since, at)
+
+        if active_power is not None:
+            for bucket, width in ROLLUP_BUCKETS.items():
+                self._bucket(inverter_id, bucket, bucket_start(at, width)).add_sample(active_power)
+
+        self._last[inverter_id] = (at, active_power)
+
+    def forget_where(self, predicate: Callable[[int], bool]) -> None:
+        """Drop the held readings of matching inverters, e.g. after another worker polled them.
+
+        Their next reading starts a new span instead of integrating over time this
+        accumulator did not observe.
+        """
+        for inverter_id in [i for i in self._last if predicate(i)]:
+            del self._last[inverter_id]
+
+    def _trim(self) -> None:
+        if self.max_pending is None or len(self._totals) <= self.max_pending:
+            return
+        oldest = sorted(self._totals, key=lambda key: key[2])
+        dropped = oldest[: len(self._totals) - self.max_pending]
+        for key in dropped:
+            del self._totals[key]
+        logger.warning(f"[PowerRollups] Dropped {len(dropped)} unmerged rollup buckets")
+
+    def pending_rows(self) -> list[dict]:
+        return [
+            {
+                "inverter_id": inverter_id,
+                "bucket": bucket,
+                "bucket_start": start,
+                "min_power": totals.min_power,
+                "max_power": totals.max_power,
+                "energy_wh": totals.energy_wh,
+                "covered_seconds": totals.covered_seconds,
+            }
+            for (inverter_id, bucket, start), totals in self._totals.items()
+        ]
+
+    def take_completed(self, before: datetime) -> list[dict]:
+        """Remove and return totals of buckets that end at or before ``before``."""
+        rows = [
+            row
+            for row in self.pending_rows()
+            if row["bucket_start"] + ROLLUP_BUCKETS[row["bucket"]] <= before
+        ]
+        for row in rows:
+            del self._totals[(row["inverter_id"], row["bucket"], row["bucket_start"])]
+        return rows
+
+    def flush(self, db: Session) -> int:
+        rows = self.pending_rows()
+        if not rows:
+            return 0
+
+        try:
+            InverterPowerRollupRepository(db).merge_many(rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception(f"[PowerRollups] Failed to merge {len(rows)} rollup buckets")
+            self._trim()
+            raise
+
+        self._totals = {}
+        logger.info(f"[PowerRollups] Merged {len(rows)} rollup buckets")
+        return len(rows)
+
+
+power_rollups = PowerRollupAccumulator(
+    max_gap=timedelta(seconds=worker_settings.INVERTER_WORKER_ROLLUP_MAX_GAP_SECONDS),
+    max_pending=worker_settings.INVERTER_WORKER_ROLLUP_MAX_PENDING_BUCKETS,
+)
@@ -0,0 +1,162 @@
+# app/workers/rate_limiter.py
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# Token bucket with adaptive refill rate. State lives in one hash per bucket and time
+# comes from the Redis server, so every worker replica shares the same view.
+# Returns 0 when a token was taken, otherwise the number of ms to wait before retrying.
+_ACQUIRE_SCRIPT = """
+local key = KEYS[1]
+local max_rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local recovery = tonumber(ARGV[3])
+local ttl_ms = tonumber(ARGV[4])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+local state = redis.call('HMGET', key, 'tokens', 'ts', 'rate', 'blocked_until')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+local rate = tonumber(state[3]) or max_rate
+local blocked_until = tonumber(state[4]) or 0
+
+if blocked_until > now then
+    return blocked_until - now
+end
+
+local elapsed = math.max(0, now - ts) / 1000
+rate = math.min(max_rate, rate + recovery * elapsed)
+tokens = math.min(capacity, tokens + elapsed * rate)
+
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) * 1000 / rate)
+end
+
+redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', now, 'rate', tostring(rate))
+redis.call('PEXPIRE', key, ttl_ms)
+return wait
+"""
+
+# Multiplicative decrease after the vendor signalled throttling: halve (by default)
+# the refill rate, empty the bucket and block it for the backoff period.
+_THROTTLE_SCRIPT = """
+local key = KEYS[1]
+local max_rate = tonumber(ARGV[1])
+local min_rate = tonumber(ARGV[2])
+local factor = tonumber(ARGV[3])
+local backoff_ms = tonumber(ARGV[4])
+local ttl_ms = tonumber(ARGV[5])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+local rate = tonumber(redis.call('HGET', key, 'rate')) or max_rate
+rate = math.max(min_rate, rate * factor)
+
+redis.call(
+    'HSET', key, 'tokens', '0', 'ts', now, 'rate', tostring(rate),
+    'blocked_until', now + backoff_ms
+)
+redis.call('PEXPIRE', key, ttl_ms)
+return tostring(rate)
+"""
+
+
+@dataclass(frozen=True)
+class BucketPolicy:
+    rate_per_second: float
+    burst: int
+    min_rate_per_second: float
+    # Refill-rate increase per second while no throttling is reported (additive increase).
+    recovery_per_second: float
+
+
+class VendorRateLimiter:
+    """Shared per-vendor and per-account token buckets for vendor API calls.
+
+    Every adapter call takes one token from the vendor-wide bucket and one from the
+    account bucket. When the vendor reports throttling, :meth:`report_throttled`
+    cuts the account's refill rate and blocks it for a backoff period; the rate then
+    recovers gradually (AIMD). If Redis is unavailable the limiter fails open.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        vendor_policy: BucketPolicy,
+        account_policy: BucketPolicy,
+        *,
+        throttle_factor: float = 0.5,
+        throttle_backoff_seconds: float = 5.0,
+        key_prefix: str = "ratelimit",
+        ttl_seconds: int = 3600,
+    ):
+        self.redis = redis
+        self.vendor_policy = vendor_policy
+        self.account_policy = account_policy
+        self.throttle_factor = throttle_factor
+        self.throttle_backoff_seconds = throttle_backoff_seconds
+        self.key_prefix = key_prefix
+        self.ttl_ms = ttl_seconds * 1000
+        self._acquire = redis.register_script(_ACQUIRE_SCRIPT)
+        self._throttle = redis.register_script(_THROTTLE_SCRIPT)
+
+    def _vendor_key(self, vendor: str) -> str:
+        return f"{self.key_prefix}:{vendor}"
+
+    def _account_key(self, vendor: str, account: str) -> str:
+        return f"{self.key_prefix}:{vendor}:{account}"
+
+    async def _take(self, key: str, policy: BucketPolicy) -> None:
+        while True:
+            wait_ms = await self._acquire(
+                keys=[key],
+                args=[
+                    policy.rate_per_second,
+                    policy.burst,
+                    policy.recovery_per_second,
+                    self.ttl_ms,
+                ],
+            )
+            if not wait_ms:
+                return
+            await asyncio.sleep(int(wait_ms) / 1000)
+
+    async def acquire(self, vendor: str, account: str) -> None:
+        try:
+            await self._take(self._account_key(vendor, account), self.account_policy)
+            await self._take(self._vendor_key(vendor), self.vendor_policy)
+        except RedisError as e:
+            logger.warning(f"[RateLimiter] Redis unavailable, not limiting {vendor}/{account}: {e}")
+
+    async def report_throttled(self, vendor: str, account: str) -> None:
+        policy = self.account_policy
+        try:
+            rate = await self._throttle(
+                keys=[self._account_key(vendor, account)],
+                args=[
+                    policy.rate_per_second,
+                    policy.min_rate_per_second,
+                    self.throttle_factor,
+                    int(self.throttle_backoff_seconds * 1000),
+                    self.ttl_ms,
+                ],
+            )
+            logger.warning(
+                f"[RateLimiter] {vendor}/{account} throttled by vendor; "
+                f"rate reduced to {float(rate):.3f}/s"
+            )
+        except RedisError as e:
+            logger.warning(f"[RateLimiter] Could not record throttling for {vendor}/{account}: {e}")
+            # Without shared state, at least back off this caller.
+            await asyncio.sleep(self.throttle_backoff_seconds)
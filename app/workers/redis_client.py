@@ -0,0 +1,24 @@
+# app/workers/redis_client.py
+import asyncio
+
+from redis.asyncio import Redis
+
+from app.workers.settings import worker_settings
+
+_client: Redis | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_redis() -> Redis:
+    """Return the worker's async Redis client, bound to the running event loop.
+
+    The long-running service reuses one client for its whole life; the legacy
+    APScheduler path (new loop per tick) transparently gets a fresh one per loop.
+    """
+    global _client, _client_loop
+
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = Redis.from_url(worker_settings.INVERTER_WORKER_REDIS_URL)
+        _client_loop = loop
+    return _client
@@ -0,0 +1,49 @@
+# app/workers/retention_app.py
+"""Celery app for power-history retention.
+
+Kept apart from ``app.celery_app``: the retention task reads the worker's power
+records through ``app.core.db`` and ``app.models``, which the email worker does not
+have. It uses its own queue, so the email worker never receives it.
+
+Run with ``celery -A app.workers.retention_app worker --beat -Q retention``.
+"""
+from celery import Celery
+from celery.schedules import crontab
+
+from smart_common.core.config import settings
+
+RETENTION_QUEUE = "retention"
+
+retention_app = Celery(
+    "smart_energy_retention",
+    broker=f"redis://{settings.REDIS_HOST}:6379/0",
+    backend=f"redis://{settings.REDIS_HOST}:6379/1",
+)
+
+retention_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    result_serializer="json",
+    timezone="Europe/Warsaw",
+    enable_utc=True,
+    task_default_queue=RETENTION_QUEUE,
+    beat_schedule={
+        "prune-inverter-power-records": {
+            "task": "app.tasks.retention_tasks.prune_inverter_power_records_task",
+            "schedule": crontab(hour=3, minute=30),
+            "options": {"queue": RETENTION_QUEUE},
+        },
+        "prune-inverter-power-intervals": {
+            "task": "app.tasks.retention_tasks.prune_inverter_power_intervals_task",
+            "schedule": crontab(hour=3, minute=45),
+            "options": {"queue": RETENTION_QUEUE},
+        },
+        "prune-inverter-power-rollups": {
+            "task": "app.tasks.retention_tasks.prune_inverter_power_rollups_task",
+            "schedule": crontab(hour=3, minute=0),
+            "options": {"queue": RETENTION_QUEUE},
+        },
+    },
+)
+
+import app.tasks.retention_tasks  # noqa
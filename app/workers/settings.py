@@ -0,0 +1,90 @@
+# app/workers/settings.py
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class WorkerSettings(BaseSettings):
+    """Tuning knobs for the inverter production worker (read from env / .env)."""
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    # Max number of inverters polled at the same time across all accounts.
+    INVERTER_WORKER_CONCURRENCY: int = 16
+    # Max number of in-flight vendor calls per vendor account.
+    INVERTER_WORKER_ACCOUNT_CONCURRENCY: int = 1
+    # Max number of devices fetched in one vendor call (FusionSolar caps devIds at 100).
+    INVERTER_WORKER_BATCH_SIZE: int = 100
+    # Rows fetched per round-trip when streaming the inverters to poll.
+    INVERTER_WORKER_ENUMERATION_CHUNK_SIZE: int = 500
+    # Power records collected before they are written in one bulk INSERT/commit.
+    INVERTER_WORKER_WRITE_BATCH_SIZE: int = 1000
+    # Power history encoding: "points" (step rows) or "intervals" (value, start, end).
+    INVERTER_WORKER_STORAGE_MODE: str = "points"
+    # Maintain 1m/15m/1h/1d power/energy rollups while ingesting readings; needs the
+    # inverter_power_rollups table, so only enable it once that table exists.
+    INVERTER_WORKER_ROLLUPS_ENABLED: bool = False
+    # Longer gaps between two readings (e.g. worker downtime) are not integrated into energy.
+    INVERTER_WORKER_ROLLUP_MAX_GAP_SECONDS: int = 3600
+    # Unmerged rollup buckets kept in memory while the merge keeps failing; oldest go first.
+    INVERTER_WORKER_ROLLUP_MAX_PENDING_BUCKETS: int = 100000
+    # Raw power records older than this many days are downsampled and deleted.
+    POWER_RECORD_RETENTION_DAYS: int = 90
+    # Rows deleted per retention transaction.
+    POWER_RECORD_RETENTION_CHUNK_SIZE: int = 5000
+    # Minute rollups older than this many days are deleted; coarser buckets are kept.
+    POWER_ROLLUP_MINUTE_RETENTION_DAYS: int = 7
+    # Max number of NATS publishes awaiting their JetStream ack at the same time.
+    INVERTER_WORKER_PUBLISH_WINDOW: int = 256
+    # What to publish for unchanged readings: "always", "suppress" or "heartbeat".
+    INVERTER_WORKER_PLATEAU_POLICY: str = "always"
+    # With the "heartbeat" policy, publish one plateau event every N unchanged readings.
+    INVERTER_WORKER_PLATEAU_HEARTBEAT_CYCLES: int = 10
+    # Port of the Prometheus /metrics endpoint of the inverter service; 0 disables it.
+    INVERTER_WORKER_METRICS_PORT: int = 9108
+    # Worker log format: "text" or "json" (one JSON object per line).
+    INVERTER_WORKER_LOG_FORMAT: str = "text"
+    # Per-event log sampling in the hot loop, e.g. "plateau=10,published=10" (1 in N).
+    INVERTER_WORKER_LOG_SAMPLING: str = ""
+    # Max hot-loop log lines per second for each event type; 0 disables the limit.
+    INVERTER_WORKER_LOG_RATE_LIMIT_PER_SECOND: float = 0.0
+
+    # Redis used for state shared between worker replicas (rate limits, shard leases).
+    INVERTER_WORKER_REDIS_URL: str = "redis://localhost:6379/2"
+
+    # Split the fleet across worker replicas (long-running service only).
+    INVERTER_WORKER_SHARDING_ENABLED: bool = False
+    INVERTER_WORKER_SHARD_COUNT: int = 64
+    INVERTER_WORKER_SHARD_LEASE_SECONDS: int = 30
+
+    # Per-inverter poll times from daylight and volatility instead of one global interval.
+    INVERTER_WORKER_ADAPTIVE_CADENCE: bool = False
+    INVERTER_WORKER_CADENCE_MIN_INTERVAL_SECONDS: int = 60
+    INVERTER_WORKER_CADENCE_MAX_INTERVAL_SECONDS: int = 600
+    INVERTER_WORKER_CADENCE_NIGHT_INTERVAL_SECONDS: int = 3600
+    # Daylight location for adaptive cadence; installations have no coordinates (centre of Poland).
+    INVERTER_WORKER_DEFAULT_LATITUDE: float = 52.07
+    INVERTER_WORKER_DEFAULT_LONGITUDE: float = 19.48
+
+    # Huawei token buckets: whole vendor quota and per-account quota (calls per second).
+    HUAWEI_RATE_LIMIT_PER_SECOND: float = 5.0
+    HUAWEI_RATE_LIMIT_BURST: int = 10
+    HUAWEI_ACCOUNT_RATE_LIMIT_PER_SECOND: float = 0.5
+    HUAWEI_ACCOUNT_RATE_LIMIT_BURST: int = 2
+    # Floor and additive recovery (per second) of the adaptive account rate.
+    HUAWEI_ACCOUNT_RATE_LIMIT_MIN_PER_SECOND: float = 0.02
+    HUAWEI_ACCOUNT_RATE_LIMIT_RECOVERY_PER_SECOND: float = 0.005
+    # How long an account is blocked after Huawei reports throttling.
+    HUAWEI_THROTTLE_BACKOFF_SECONDS: float = 5.0
+    # Idle lifetime of a FusionSolar login session; stored sessions expire with it.
+    HUAWEI_SESSION_TTL_SECONDS: int = 1800
+    # Max live vendor adapters kept in memory (least recently used are dropped).
+    INVERTER_WORKER_ADAPTER_POOL_SIZE: int = 1000
+
+    # Per-account circuit breaker: skip an account after N consecutive failed polls,
+    # probe it again after a cooldown that doubles on every failed probe.
+    INVERTER_WORKER_BREAKER_FAILURE_THRESHOLD: int = 5
+    INVERTER_WORKER_BREAKER_BASE_COOLDOWN_SECONDS: int = 300
+    INVERTER_WORKER_BREAKER_MAX_COOLDOWN_SECONDS: int = 6 * 3600
+    INVERTER_WORKER_BREAKER_PROBE_LEASE_SECONDS: int = 120
+
+
+worker_settings = WorkerSettings()
@@ -0,0 +1,133 @@
+# app/workers/sharding.py
+import hashlib
+import logging
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# Take the lease if it is free, or extend it if we already hold it.
+_CLAIM_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if current == ARGV[1] then
+    redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    return 1
+end
+if not current then
+    redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# Delete the lease only if we still hold it.
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class ShardCoordinator:
+    """Splits inverters across worker replicas using Redis leases.
+
+    Inverters map to a fixed number of shards by a stable hash of their ID. Live
+    workers announce themselves with expiring membership keys; each shard is assigned
+    to a member by rendezvous (highest-random-weight) hashing, so a join or leave only
+    moves the shards of that member. A worker polls a shard only while it holds the
+    shard's lease, which it renews on every :meth:`rebalance`; leases of dead workers
+    expire and are picked up by their new owners.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        worker_id: str,
+        *,
+        shard_count: int = 64,
+        lease_seconds: int = 30,
+        key_prefix: str = "inverter_worker",
+    ):
+        self.redis = redis
+        self.worker_id = worker_id
+        self.shard_count = shard_count
+        self.lease_ms = lease_seconds * 1000
+        self.key_prefix = key_prefix
+        self.owned: set[int] = set()
+        self._claim = redis.register_script(_CLAIM_SCRIPT)
+        self._release = redis.register_script(_RELEASE_SCRIPT)
+
+    def _member_key(self, worker_id: str) -> str:
+        return f"{self.key_prefix}:members:{worker_id}"
+
+    def _lease_key(self, shard: int) -> str:
+        return f"{self.key_prefix}:shards:{shard}"
+
+    def shard_for(self, inverter_id: int) -> int:
+        return _hash(str(inverter_id)) % self.shard_count
+
+    def owns(self, inverter_id: int) -> bool:
+        return self.shard_for(inverter_id) in self.owned
+
+    def assign(self, members: list[str]) -> set[int]:
+        """Shards this worker should own for the given set of live members."""
+        return {
+            shard
+            for shard in range(self.shard_count)
+            if max(members, key=lambda member: _hash(f"{member}:{shard}")) == self.worker_id
+        }
+
+    async def _live_members(self) -> list[str]:
+        prefix = self._member_key("")
+        members = {self.worker_id}
+        async for key in self.redis.scan_iter(match=f"{prefix}*"):
+            key = key.decode() if isinstance(key, bytes) else key
+            members.add(key[len(prefix) :])
+        return sorted(members)
+
+    async def rebalance(self) -> set[int]:
+        """Renew membership and leases; returns the shards gained in this round."""
+        try:
+            await self.redis.set(self._member_key(self.worker_id), 1, px=self.lease_ms)
+            desired = self.assign(await self._live_members())
+
+            owned = set()
+            for shard in desired:
+                claimed = await self._claim(
+                    keys=[self._lease_key(shard)], args=[self.worker_id, self.lease_ms]
+                )
+                if claimed:
+                    owned.add(shard)
+
+            for shard in self.owned - desired:
+                await self._release(keys=[self._lease_key(shard)], args=[self.worker_id])
+
+        except RedisError as e:
+            # Leases can no longer be renewed, so stop polling rather than risk double-polls.
+            logger.error(f"[Sharding] Could not renew leases for {self.worker_id}: {e}")
+            self.owned = set()
+            return set()
+
+        gained = owned - self.owned
+        if gained or owned != self.owned:
+            logger.info(
+                f"[Sharding] {self.worker_id} owns {len(owned)}/{self.shard_count} shards "
+                f"(gained {len(gained)}, released {len(self.owned - owned)})"
+            )
+        self.owned = owned
+        return gained
+
+    async def release_all(self) -> None:
+        try:
+            for shard in self.owned:
+                await self._release(keys=[self._lease_key(shard)], args=[self.worker_id])
+            await self.redis.delete(self._member_key(self.worker_id))
+        except RedisError as e:
+            logger.warning(f"[Sharding] Could not release leases for {self.worker_id}: {e}")
+        self.owned = set()
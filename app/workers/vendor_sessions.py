@@ -0,0 +1,203 @@
+# app/workers/vendor_sessions.py
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from cryptography.fernet import Fernet, InvalidToken
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from requests.utils import dict_from_cookiejar
+
+from app.workers import fusionsolar
+from app.workers.settings import worker_settings
+
+logger = logging.getLogger(__name__)
+
+
+class VendorSessionStore:
+    """Vendor login sessions in Redis, Fernet-encrypted, shared by all worker processes.
+
+    Keys expire after ``ttl_seconds`` (the vendor's idle session lifetime), so a
+    stored session is only ever handed out while the vendor still accepts it.
+    Redis errors are logged and treated as a cache miss.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        fernet: Fernet,
+        ttl_seconds: int,
+        key_prefix: str = "vendor_session",
+    ):
+        self.redis = redis
+        self.fernet = fernet
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+
+    def _key(self, vendor: str, account: str) -> str:
+        return f"{self.key_prefix}:{vendor}:{account}"
+
+    async def load(self, vendor: str, account: str) -> Optional[dict]:
+        try:
+            token = await self.redis.get(self._key(vendor, account))
+        except RedisError as e:
+            logger.warning(f"[VendorSessions] Could not load session for {vendor}/{account}: {e}")
+            return None
+        if token is None:
+            return None
+        try:
+            return json.loads(self.fernet.decrypt(token))
+        except (InvalidToken, ValueError):
+            # Written with another key or corrupted; the adapter will log in again.
+            logger.warning(f"[VendorSessions] Discarding unreadable session for {vendor}/{account}")
+            return None
+
+    async def save(self, vendor: str, account: str, session: dict) -> None:
+        token = self.fernet.encrypt(json.dumps(session).encode())
+        try:
+            await self.redis.set(self._key(vendor, account), token, ex=self.ttl_seconds)
+        except RedisError as e:
+            logger.warning(f"[VendorSessions] Could not save session for {vendor}/{account}: {e}")
+
+    async def touch(self, vendor: str, account: str) -> None:
+        try:
+            await self.redis.expire(self._key(vendor, account), self.ttl_seconds)
+        except RedisError as e:
+            logger.warning(
+                f"[VendorSessions] Could not refresh session for {vendor}/{account}: {e}"
+            )
+
+
+@dataclass
+class _PooledAdapter:
+    adapter: object
+    vendor: str
+    account: str
+    # Serialized form of the session last written to Redis, to skip redundant writes.
+    saved_session: Optional[str] = None
+    touched_at: float = 0.0
+
+
+class AdapterPool:
+    """Bounded LRU of live vendor adapters, backed by :class:`VendorSessionStore`.
+
+    A new adapter restores the account's stored session, so restarts and extra
+    replicas do not log in again. After successful calls the adapter's session is
+    written back whenever it changed, and its TTL is refreshed otherwise.
+
+    The session is the cookie jar (FusionSolar's XSRF-TOKEN) of the adapter's
+    ``requests`` session; adapters may instead provide ``export_session`` and
+    ``restore_session`` hooks.
+    """
+
+    def __init__(self, max_size: int = 1000):
+        self.max_size = max_size
+        self._entries: OrderedDict[tuple, _PooledAdapter] = OrderedDict()
+        self.restored = 0
+
+    @staticmethod
+    def _key(user) -> tuple:
+        # New credentials must not reuse an adapter logged in with the old ones.
+        return (user.id, user.huawei_username, user.huawei_password_encrypted)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def has(self, user) -> bool:
+        return self._key(user) in self._entries
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_size:
+            _, entry = self._entries.popitem(last=False)
+            close = getattr(entry.adapter, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except Exception as e:
+                    logger.debug(f"[AdapterPool] Error while closing evicted adapter: {e}")
+
+    async def get(self, user, vendor: str, store: VendorSessionStore, build: Callable[[], object]):
+        """The pooled adapter for ``user``, or a new one made by ``build``.
+
+        ``build`` constructs the adapter, which may log in to the vendor; it runs in a
+        worker thread together with the session restore, never on the event loop.
+        """
+        key = self._key(user)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry.adapter
+
+        account = user.huawei_username
+        session = await store.load(vendor, account)
+        adapter, restored = await asyncio.to_thread(self._build, build, session)
+        entry = _PooledAdapter(adapter, vendor, account)
+        if restored:
+            entry.saved_session = json.dumps(session, sort_keys=True)
+            entry.touched_at = time.monotonic()
+            self.restored += 1
+
+        # Another poll of the same account may have finished building first.
+        current = self._entries.get(key)
+        if current is not None:
+            return current.adapter
+        self._entries[key] = entry
+        self._evict()
+        return adapter
+
+    @staticmethod
+    def _build(build: Callable[[], object], session: Optional[dict]) -> tuple[object, bool]:
+        adapter = build()
+        if session is None:
+            return adapter, False
+        restore = getattr(adapter, "restore_session", None)
+        if restore is not None:
+            restore(session)
+            return adapter, True
+        http_session = fusionsolar.http_session(adapter)
+        if http_session is None or "cookies" not in session:
+            return adapter, False
+        http_session.cookies.update(session["cookies"])
+        return adapter, True
+
+    @staticmethod
+    def _export(adapter) -> Optional[dict]:
+        export = getattr(adapter, "export_session", None)
+        if export is not None:
+            return export()
+        http_session = fusionsolar.http_session(adapter)
+        if http_session is None or not fusionsolar.logged_in(http_session):
+            return None
+        return {"cookies": dict_from_cookiejar(http_session.cookies)}
+
+    async def after_success(self, user, store: VendorSessionStore) -> None:
+        entry = self._entries.get(self._key(user))
+        session = self._export(entry.adapter) if entry is not None else None
+        if session is None:
+            return
+
+        serialized = json.dumps(session, sort_keys=True)
+        now = time.monotonic()
+        if serialized != entry.saved_session:
+            await store.save(entry.vendor, entry.account, session)
+            entry.saved_session = serialized
+            entry.touched_at = now
+        elif now - entry.touched_at > store.ttl_seconds / 4:
+            # The vendor extends sessions on use; keep the stored copy alive with it.
+            await store.touch(entry.vendor, entry.account)
+            entry.touched_at = now
+
+
+def build_session_store(redis: Redis, fernet_key: str) -> VendorSessionStore:
+    return VendorSessionStore(
+        redis,
+        Fernet(fernet_key),
+        ttl_seconds=worker_settings.HUAWEI_SESSION_TTL_SECONDS,
+    )
+
+
+adapter_pool = AdapterPool(max_size=worker_settings.INVERTER_WORKER_ADAPTER_POOL_SIZE)
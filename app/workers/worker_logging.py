@@ -0,0 +1,121 @@
+# app/workers/worker_logging.py
+"""Low-overhead logging for the worker hot loop.
+
+Hot-loop calls use lazy ``%`` formatting and tag records with an event type
+(``extra={"event": ...}``). :class:`EventSamplingFilter` keeps 1 in N records per
+event type and caps each type at a rate, before the message is ever formatted.
+:class:`JsonLogFormatter` renders records, including their extra fields, as one
+JSON object per line.
+"""
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.workers.settings import worker_settings
+
+# Loggers whose records are sampled; the per-inverter lines all come from these.
+HOT_LOOP_LOGGERS = ("app.workers.inverter_worker", "app.workers.event_pipeline")
+
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+def parse_sampling(spec: str) -> dict[str, int]:
+    """Parse ``"plateau=10,published=5"`` into ``{"plateau": 10, "published": 5}``."""
+    sampling: dict[str, int] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        event, _, every = item.partition("=")
+        try:
+            sampling[event.strip()] = max(1, int(every))
+        except ValueError:
+            raise ValueError(f"Invalid log sampling entry: {item!r}") from None
+    return sampling
+
+
+class EventSamplingFilter(logging.Filter):
+    """Samples and rate-limits records that carry an ``event`` attribute.
+
+    Records of an event type listed in ``sample_every`` pass once every N times.
+    With ``max_per_second`` set, each event type is additionally capped by a token
+    bucket of that rate (burst of one second). Warnings and errors, and records
+    without an event type, always pass.
+    """
+
+    def __init__(
+        self,
+        sample_every: Optional[dict[str, int]] = None,
+        max_per_second: float = 0.0,
+        clock=time.monotonic,
+    ):
+        super().__init__()
+        self.sample_every = sample_every or {}
+        self.max_per_second = max_per_second
+        self._clock = clock
+        self._seen: dict[str, int] = {}
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self.dropped = 0
+
+    def _take_token(self, event: str) -> bool:
+        now = self._clock()
+        tokens, updated = self._buckets.get(event, (self.max_per_second, now))
+        tokens = min(self.max_per_second, tokens + (now - updated) * self.max_per_second)
+        if tokens < 1:
+            self._buckets[event] = (tokens, now)
+            return False
+        self._buckets[event] = (tokens - 1, now)
+        return True
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        event = getattr(record, "event", None)
+        if event is None or record.levelno >= logging.WARNING:
+            return True
+
+        every = self.sample_every.get(event, 1)
+        if every > 1:
+            seen = self._seen.get(event, 0)
+            self._seen[event] = seen + 1
+            if seen % every:
+                self.dropped += 1
+                return False
+
+        if self.max_per_second > 0 and not self._take_token(event):
+            self.dropped += 1
+            return False
+        return True
+
+
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per record; extra fields are emitted as top-level keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_worker_logging() -> None:
+    """Install sampling on the hot-loop loggers and, in ``json`` mode, the JSON formatter.
+
+    Call after the regular logging setup.
+    """
+    sampling_filter = EventSamplingFilter(
+        parse_sampling(worker_settings.INVERTER_WORKER_LOG_SAMPLING),
+        max_per_second=worker_settings.INVERTER_WORKER_LOG_RATE_LIMIT_PER_SECOND,
+    )
+    for name in HOT_LOOP_LOGGERS:
+        logging.getLogger(name).addFilter(sampling_filter)
+
+    if worker_settings.INVERTER_WORKER_LOG_FORMAT == "json":
+        formatter = JsonLogFormatter()
+        for handler in logging.getLogger().handlers:
+            handler.setFormatter(formatter)
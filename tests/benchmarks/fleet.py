@@ -0,0 +1,151 @@
+"""Synthetic inverter fleet and vendor profiles for worker benchmarks.
+
+Seeds the worker's own models (``app.models.user``, ``installation``, ``inverter``),
+so it imports only where the inverter worker's modules are deployed.
+"""
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import HuaweiRateLimitException
+from app.models.installation import Installation
+from app.models.inverter import Inverter
+from app.models.user import User
+from app.workers.fusionsolar import FAIL_CODE_RATE_LIMITED, FusionSolarError
+from tests.mocks import FakeFusionSolar, FakeHuaweiAdapter
+
+
+@dataclass(frozen=True)
+class VendorProfile:
+    """Behaviour of the simulated vendor API for one benchmark run.
+
+    Rates are per getDevRealKpi request (one request fetches a whole installation);
+    ``plateau_rate`` is the share of readings that repeat the previous value.
+    """
+
+    latency_seconds: float = 0.0
+    jitter_seconds: float = 0.0
+    failure_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    missing_power_rate: float = 0.0
+    plateau_rate: float = 0.7
+
+
+PROFILES: Dict[str, VendorProfile] = {
+    "instant": VendorProfile(),
+    "realistic": VendorProfile(latency_seconds=0.2, jitter_seconds=0.1, failure_rate=0.01),
+    "degraded": VendorProfile(
+        latency_seconds=1.0, jitter_seconds=1.0, failure_rate=0.1, missing_power_rate=0.05
+    ),
+    "throttled": VendorProfile(latency_seconds=0.2, jitter_seconds=0.1, rate_limit_rate=0.2),
+}
+
+
+class ProfiledFusionSolar(FakeFusionSolar):
+    """``FakeFusionSolar`` whose KPI requests get simulated latency, failures and throttling."""
+
+    def __init__(self, profile: VendorProfile, seed: int = 0):
+        super().__init__({})
+        self.profile = profile
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _next_power(self, device_id: str) -> Optional[float]:
+        if self._random.random() < self.profile.missing_power_rate:
+            return None
+        previous = self.power_map.get(device_id)
+        if previous is not None and self._random.random() < self.profile.plateau_rate:
+            return previous
+        return round(self._random.uniform(0, 10000), 2)
+
+    def get_dev_real_kpi(self, body: Dict, token: Optional[str]) -> Dict:
+        # Called from worker threads; the RNG and power map are shared per account.
+        with self._lock:
+            delay = self.profile.latency_seconds + self._random.uniform(
+                0, self.profile.jitter_seconds
+            )
+            roll = self._random.random()
+            if roll >= self.profile.rate_limit_rate + self.profile.failure_rate:
+                for device_id in body["devIds"].split(","):
+                    self.power_map[device_id] = self._next_power(device_id)
+            answer = super().get_dev_real_kpi(body, token)
+
+        time.sleep(delay)
+        if roll < self.profile.rate_limit_rate:
+            return {"success": False, "failCode": 407, "message": "ACCESS_FREQUENCY_IS_TOO_HIGH"}
+        if roll < self.profile.rate_limit_rate + self.profile.failure_rate:
+            return {"success": False, "failCode": 20400, "message": "Simulated vendor failure"}
+        return answer
+
+
+class ProfiledHuaweiAdapter(FakeHuaweiAdapter):
+    """``FakeHuaweiAdapter`` on a :class:`ProfiledFusionSolar`; ``calls`` counts vendor requests."""
+
+    def __init__(self, profile: VendorProfile, seed: int = 0):
+        transport = ProfiledFusionSolar(profile, seed)
+        super().__init__(transport.power_map, transport)
+
+    @property
+    def calls(self) -> int:
+        return self.transport.calls
+
+    def get_production(self, device_id: str) -> List[Dict]:
+        # The real adapter reports throttling as HuaweiRateLimitException.
+        try:
+            return super().get_production(device_id)
+        except FusionSolarError as e:
+            if e.fail_code == FAIL_CODE_RATE_LIMITED:
+                raise HuaweiRateLimitException(str(e)) from e
+            raise
+
+
+def seed_fleet(
+    db: Session,
+    inverters: int,
+    inverters_per_installation: int = 4,
+    installations_per_user: int = 2,
+) -> None:
+    """Insert users, installations and inverters for a fleet of ``inverters``."""
+    installation_count = -(-inverters // inverters_per_installation)
+    user_count = -(-installation_count // installations_per_user)
+
+    db.execute(
+        insert(User),
+        [
+            {
+                "id": user_id,
+                "email": f"bench{user_id}@example.com",
+                "huawei_username": f"bench{user_id}",
+                "huawei_password_encrypted": "bench",
+            }
+            for user_id in range(1, user_count + 1)
+        ],
+    )
+    db.execute(
+        insert(Installation),
+        [
+            {
+                "id": installation_id,
+                "user_id": (installation_id - 1) // installations_per_user + 1,
+                "name": f"Installation {installation_id}",
+            }
+            for installation_id in range(1, installation_count + 1)
+        ],
+    )
+    db.execute(
+        insert(Inverter),
+        [
+            {
+                "id": inverter_id,
+                "installation_id": (inverter_id - 1) // inverters_per_installation + 1,
+                "serial_number": f"BENCH{inverter_id:08d}",
+            }
+            for inverter_id in range(1, inverters + 1)
+        ],
+    )
+    db.commit()
@@ -0,0 +1,56 @@
+"""Command-line entry point for the worker benchmark.
+
+    python -m tests.benchmarks.run --inverters 10000 --profile realistic
+
+Exits non-zero when a budget is exceeded, so it can gate CI.
+"""
+import argparse
+import json
+import sys
+
+from tests.benchmarks.fleet import PROFILES
+from tests.benchmarks.harness import run_benchmark
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--inverters", type=int, default=10_000)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="instant")
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--database-url", help="defaults to BENCHMARK_DATABASE_URL or SQLite")
+    parser.add_argument("--max-cycle-seconds", type=float)
+    parser.add_argument("--max-statements-per-inverter", type=float)
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(args.inverters, args.profile, args.cycles, args.database_url)
+
+    if args.json:
+        print(json.dumps(result.as_dict(), indent=2))
+    else:
+        print(f"{result.inverters} inverters, profile={result.profile}, db={result.database}")
+        for i, cycle in enumerate(result.cycles, start=1):
+            print(
+                f"  cycle {i}: {cycle.seconds:.2f}s, {cycle.statements} statements "
+                f"({cycle.statements / result.inverters:.3f}/inverter), "
+                f"{cycle.events_published} events, {cycle.vendor_calls} vendor calls"
+            )
+
+    failed = False
+    if args.max_cycle_seconds is not None and result.cycle_seconds > args.max_cycle_seconds:
+        print(f"Cycle time {result.cycle_seconds:.2f}s exceeds {args.max_cycle_seconds}s")
+        failed = True
+    if (
+        args.max_statements_per_inverter is not None
+        and result.statements_per_inverter > args.max_statements_per_inverter
+    ):
+        print(
+            f"{result.statements_per_inverter:.3f} statements per inverter exceeds "
+            f"{args.max_statements_per_inverter}"
+        )
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+if not os.environ.get("RUN_BENCHMARKS"):
+    pytest.skip("set RUN_BENCHMARKS=1 to run worker benchmarks", allow_module_level=True)
+# The harness drives the real worker, which needs its own DB and model modules.
+for module in ("app.core.db", "app.core.exceptions", "app.models.inverter"):
+    pytest.importorskip(module, reason="inverter worker modules are not installed")
+
+from tests.benchmarks.harness import run_benchmark  # noqa: E402
+
+INVERTERS = int(os.environ.get("BENCHMARK_INVERTERS", "10000"))
+
+# Budgets for steady-state cycles; tighten them as the worker gets faster.
+# Mostly the per-account user lookup; record writes are batched.
+MAX_STATEMENTS_PER_INVERTER = 0.2
+MAX_CYCLE_SECONDS = float(os.environ.get("BENCHMARK_MAX_CYCLE_SECONDS", "60"))
+
+
+def test_instant_vendor_cycle_stays_within_budget():
+    result = run_benchmark(INVERTERS, profile="instant", cycles=3)
+
+    for cycle in result.cycles:
+        assert cycle.events_published == INVERTERS
+    assert result.statements_per_inverter <= MAX_STATEMENTS_PER_INVERTER
+    assert result.cycle_seconds <= MAX_CYCLE_SECONDS
+
+
+def test_failures_and_throttling_are_absorbed():
+    result = run_benchmark(INVERTERS // 10, profile="throttled", cycles=2)
+
+    # Failed and throttled batches still publish one "failed" event per inverter.
+    for cycle in result.cycles:
+        assert cycle.events_published == INVERTERS // 10
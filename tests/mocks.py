@@ -1,24 +1,121 @@
+import json
 from types import SimpleNamespace
 from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests import Response
+from requests.adapters import BaseAdapter
+
+from app.workers.fusionsolar import (
+    FAIL_CODE_MUST_RELOGIN,
+    XSRF_TOKEN,
+    FusionSolarError,
+    get_production_many,
+)
+
+
+class FakeFusionSolar(BaseAdapter):
+    """In-process FusionSolar northbound API, mounted on a ``requests.Session``.
+
+    Serves ``/login`` and ``/getDevRealKpi`` from ``power_map``; a KPI request whose
+    XSRF-TOKEN header is not a token handed out by ``/login`` gets failCode 305.
+    """
+
+    def __init__(self, power_map: Dict[str, Optional[float]]):
+        super().__init__()
+        self.power_map = power_map
+        self.tokens: List[str] = []
+        # JSON bodies of the getDevRealKpi requests, in order.
+        self.kpi_requests: List[Dict[str, Any]] = []
+
+    @property
+    def calls(self) -> int:
+        return len(self.tokens) + len(self.kpi_requests)
+
+    def login(self) -> Dict[str, Any]:
+        token = f"fake-xsrf-{len(self.tokens) + 1}"
+        self.tokens.append(token)
+        return {"success": True, "failCode": 0, "data": token}
+
+    def get_dev_real_kpi(self, body: Dict[str, Any], token: Optional[str]) -> Dict[str, Any]:
+        self.kpi_requests.append(body)
+        if token not in self.tokens:
+            return {"success": False, "failCode": 305, "message": "USER_MUST_RELOGIN"}
+        return {
+            "success": True,
+            "failCode": 0,
+            "data": [
+                {"devId": dev_id, "dataItemMap": {"active_power": self.power_map.get(dev_id)}}
+                for dev_id in body["devIds"].split(",")
+                if dev_id in self.power_map
+            ],
+        }
+
+    def send(self, request, **kwargs) -> Response:
+        path = urlparse(request.url).path
+        if path.endswith("/login"):
+            body = self.login()
+        elif path.endswith("/getDevRealKpi"):
+            body = self.get_dev_real_kpi(json.loads(request.body), request.headers.get(XSRF_TOKEN))
+        else:
+            body = {"success": False, "failCode": 404, "message": path}
+
+        response = Response()
+        response.status_code = 200
+        response.url = request.url
+        response.request = request
+        response.headers["Content-Type"] = "application/json"
+        response._content = json.dumps(body).encode()
+        return response
+
+    def close(self):
+        pass
 
 
 class FakeHuaweiAdapter:
-    """Lightweight Huawei adapter mock that returns predefined power readings."""
+    """Huawei adapter double talking to a :class:`FakeFusionSolar` over ``requests``.
 
-    def __init__(self, power_map: Optional[Dict[str, Optional[float]]] = None):
-        self.power_map = power_map or {}
+    Like the real adapter it keeps its login in ``session`` (the XSRF-TOKEN cookie)
+    and logs in on the first ``get_production``.
+    """
+
+    base_url = "https://fusionsolar.test/thirdData"
+
+    def __init__(
+        self,
+        power_map: Optional[Dict[str, Optional[float]]] = None,
+        transport: Optional[FakeFusionSolar] = None,
+    ):
+        self.power_map = power_map if power_map is not None else {}
+        self.transport = transport or FakeFusionSolar(self.power_map)
+        self.session = requests.Session()
+        self.session.mount("https://", self.transport)
+        self.session.mount("http://", self.transport)
         self.login_calls = 0
-        self.logged_in = False
+
+    @property
+    def logged_in(self) -> bool:
+        return self.session.cookies.get(XSRF_TOKEN) is not None
 
     def _login(self):
         self.login_calls += 1
-        self.logged_in = True
-        return {"success": True}
+        body = self.session.post(f"{self.base_url}/login", json={}).json()
+        # The real API sets the token as a cookie; the fake transport returns it in the body.
+        self.session.cookies.set(XSRF_TOKEN, body["data"])
+        return body
 
     def get_production(self, device_id: str) -> List[Dict[str, Any]]:
         if not self.logged_in:
             self._login()
-        return [{"dataItemMap": {"active_power": self.power_map.get(device_id)}}]
+        try:
+            production = get_production_many(self.session, self.base_url, [device_id])
+        except FusionSolarError as e:
+            if e.fail_code != FAIL_CODE_MUST_RELOGIN:
+                raise
+            self._login()
+            production = get_production_many(self.session, self.base_url, [device_id])
+        return production.get(device_id, [{"dataItemMap": {"active_power": None}}])
 
     def set_power(self, device_id: str, active_power: Optional[float]):
         self.power_map[device_id] = active_power
@@ -0,0 +1,52 @@
+from datetime import date, datetime, timedelta, timezone
+
+from app.workers.cadence import PollScheduler, sun_times
+
+WARSAW = (52.23, 21.01)
+
+
+def _scheduler() -> PollScheduler:
+    return PollScheduler(
+        min_interval=timedelta(minutes=1),
+        max_interval=timedelta(minutes=10),
+        night_interval=timedelta(hours=2),
+        twilight_margin=timedelta(minutes=30),
+    )
+
+
+def test_sun_times_matches_known_warsaw_summer_solstice():
+    sunrise, sunset = sun_times(date(2024, 6, 21), *WARSAW)
+
+    # Warsaw: sunrise 04:14 CEST (02:14 UTC), sunset 21:01 CEST (19:01 UTC).
+    assert abs(sunrise - datetime(2024, 6, 21, 2, 14, tzinfo=timezone.utc)) < timedelta(minutes=3)
+    assert abs(sunset - datetime(2024, 6, 21, 19, 1, tzinfo=timezone.utc)) < timedelta(minutes=3)
+
+
+def test_sun_times_polar_night():
+    assert sun_times(date(2024, 12, 21), 78.2, 15.6) == (None, None)
+
+
+def test_scheduler_backs_off_at_night_until_sunrise_window():
+    scheduler = _scheduler()
+    now = datetime(2024, 6, 21, 0, 30, tzinfo=timezone.utc)
+
+    next_due = scheduler.schedule(1, now, 0.0, *WARSAW)
+
+    sunrise, _ = sun_times(now.date(), *WARSAW)
+    assert next_due == sunrise - timedelta(minutes=30)
+    assert not scheduler.is_due(1, now + timedelta(minutes=30))
+    assert scheduler.is_due(1, next_due)
+
+
+def test_scheduler_polls_faster_while_power_is_changing():
+    scheduler = _scheduler()
+    noon = datetime(2024, 6, 21, 11, 0, tzinfo=timezone.utc)
+
+    assert scheduler.schedule(1, noon, 3000.0, *WARSAW) == noon + timedelta(minutes=10)
+    scheduler.schedule(2, noon, 3000.0, *WARSAW)
+
+    steady = scheduler.schedule(1, noon, 3000.0, *WARSAW)
+    changing = scheduler.schedule(2, noon, 4500.0, *WARSAW)
+
+    assert steady == noon + timedelta(minutes=10)
+    assert changing == noon + timedelta(minutes=1)
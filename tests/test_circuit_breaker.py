@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+from app.workers.circuit_breaker import AccountCircuitBreaker, Admission  # noqa: E402
+
+KEY = "circuit:huawei:user1"
+
+
+def _breaker(redis) -> AccountCircuitBreaker:
+    return AccountCircuitBreaker(
+        redis,
+        failure_threshold=3,
+        base_cooldown_seconds=60,
+        max_cooldown_seconds=300,
+        probe_lease_seconds=30,
+    )
+
+
+async def _end_cooldown(redis) -> None:
+    # Pretend the open period is over.
+    await redis.hset(KEY, "open_until", 1)
+
+
+def test_circuit_opens_after_threshold_consecutive_failures():
+    async def run():
+        breaker = _breaker(fakeredis.FakeAsyncRedis())
+        verdicts = []
+        for _ in range(3):
+            verdicts.append(await breaker.allow("huawei", "user1"))
+            await breaker.record_failure("huawei", "user1")
+        verdicts.append(await breaker.allow("huawei", "user1"))
+        return verdicts
+
+    assert asyncio.run(run()) == [Admission.CLOSED] * 3 + [Admission.DENIED]
+
+
+def test_success_resets_the_failure_count():
+    async def run():
+        breaker = _breaker(fakeredis.FakeAsyncRedis())
+        for _ in range(2):
+            await breaker.record_failure("huawei", "user1")
+        await breaker.record_success("huawei", "user1")
+        for _ in range(2):
+            await breaker.record_failure("huawei", "user1")
+        return await breaker.allow("huawei", "user1")
+
+    assert asyncio.run(run()) == Admission.CLOSED
+
+
+def test_half_open_admits_a_single_probe():
+    async def run():
+        redis = fakeredis.FakeAsyncRedis()
+        breaker = _breaker(redis)
+        for _ in range(3):
+            await breaker.record_failure("huawei", "user1")
+        await _end_cooldown(redis)
+        first = await breaker.allow("huawei", "user1")
+        # Other workers (or later cycles) wait while the probe holds its lease.
+        second = await breaker.allow("huawei", "user1")
+        await breaker.record_success("huawei", "user1")
+        after_success = await breaker.allow("huawei", "user1")
+        return first, second, after_success
+
+    assert asyncio.run(run()) == (Admission.PROBE, Admission.DENIED, Admission.CLOSED)
+
+
+def test_failed_probe_reopens_with_doubled_cooldown_up_to_the_cap():
+    async def run():
+        redis = fakeredis.FakeAsyncRedis()
+        breaker = _breaker(redis)
+        for _ in range(3):
+            await breaker.record_failure("huawei", "user1")
+        cooldowns = [int(await redis.hget(KEY, "cooldown"))]
+        for _ in range(3):
+            await _end_cooldown(redis)
+            assert await breaker.allow("huawei", "user1") == Admission.PROBE
+            await breaker.record_failure("huawei", "user1")
+            cooldowns.append(int(await redis.hget(KEY, "cooldown")))
+        return cooldowns, await breaker.allow("huawei", "user1")
+
+    cooldowns, verdict = asyncio.run(run())
+    assert cooldowns == [60_000, 120_000, 240_000, 300_000]
+    assert verdict == Admission.DENIED
+
+
+def test_redis_outage_keeps_the_circuit_closed():
+    async def run():
+        server = fakeredis.FakeServer()
+        server.connected = False
+        breaker = _breaker(fakeredis.FakeAsyncRedis(server=server))
+        await breaker.record_failure("huawei", "user1")
+        return await breaker.allow("huawei", "user1")
+
+    assert asyncio.run(run()) == Admission.CLOSED
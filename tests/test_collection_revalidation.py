@@ -0,0 +1,134 @@
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+
+from app.api.async_db import get_async_db
+from app.api.dependencies.current_user import get_current_user_async
+from app.api.dependencies.ownership import (get_installation_microcontroller,
+                                            get_installation_microcontroller_async)
+from app.api.routes import devices, installations, microcontrollers, providers
+from smart_common.core.db import get_db
+from smart_common.core.dependencies import get_current_user
+
+USER = SimpleNamespace(id=7)
+MICROCONTROLLER = SimpleNamespace(id=3)
+MC_PATH = f"/installations/1/microcontrollers/{uuid4()}"
+CHANGED = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+ENDPOINTS = [
+    ("/installations/", installations.installation_service, "list_for_user"),
+    (
+        "/installations/1/microcontrollers/",
+        microcontrollers.microcontroller_service,
+        "list_for_installation",
+    ),
+    (f"{MC_PATH}/devices/", devices.device_service, "list_for_microcontroller"),
+    (f"{MC_PATH}/providers/", providers.provider_service, "list_for_microcontroller"),
+]
+
+
+class FakeSession:
+    """Answers every version query with ``version`` (row count, newest update)."""
+
+    def __init__(self):
+        self.version = (2, CHANGED)
+
+    def execute(self, statement):
+        return SimpleNamespace(one=lambda: self.version)
+
+
+class FakeAsyncSession:
+    def __init__(self, sync: FakeSession):
+        self.sync = sync
+
+    async def execute(self, statement):
+        return self.sync.execute(statement)
+
+    async def run_sync(self, fn):
+        return fn(self.sync)
+
+
+def build_app(db: FakeSession) -> FastAPI:
+    async def async_db():
+        return FakeAsyncSession(db)
+
+    async def async_user():
+        return USER
+
+    async def async_microcontroller():
+        return MICROCONTROLLER
+
+    app = FastAPI()
+    for module in (installations, microcontrollers, devices, providers):
+        app.include_router(module.router)
+    app.dependency_overrides.update(
+        {
+            get_db: lambda: db,
+            get_async_db: async_db,
+            get_current_user: lambda: USER,
+            get_current_user_async: async_user,
+            get_installation_microcontroller: lambda: MICROCONTROLLER,
+            get_installation_microcontroller_async: async_microcontroller,
+        }
+    )
+    return app
+
+
+def get(app: FastAPI, path: str, headers: dict | None = None) -> tuple[int, dict, bytes]:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        "client": ("127.0.0.1", 0),
+        "server": ("test", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start = messages[0]
+    response_headers = {k.decode(): v.decode() for k, v in start["headers"]}
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return start["status"], response_headers, body
+
+
+@pytest.mark.parametrize("path, service, method", ENDPOINTS)
+def test_list_endpoint_answers_a_current_etag_with_304(monkeypatch, path, service, method):
+    calls = []
+    monkeypatch.setattr(service, method, lambda *args: calls.append(args) or [])
+    db = FakeSession()
+    app = build_app(db)
+
+    status, headers, body = get(app, path)
+    assert (status, body) == (200, b"[]")
+    assert headers["cache-control"] == "private, no-cache"
+    assert "last-modified" not in headers
+    etag = headers["etag"]
+
+    status, headers, body = get(app, path, {"If-None-Match": etag})
+    assert (status, body) == (304, b"")
+    assert headers["etag"] == etag
+    assert len(calls) == 1
+
+    # A hard delete: one row fewer, same newest update.
+    db.version = (1, CHANGED)
+    status, headers, _ = get(app, path, {"If-None-Match": etag})
+    assert status == 200
+    assert headers["etag"] != etag
+    assert len(calls) == 2
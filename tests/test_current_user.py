@@ -0,0 +1,77 @@
+import asyncio
+import inspect
+
+from fastapi import Depends, Request
+from fastapi.security import OAuth2PasswordBearer
+
+from app.api.dependencies.current_user import async_current_user
+from app.api.principal_cache import PrincipalCache
+from smart_common.core.db import get_db
+from smart_common.models.user import User
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+
+
+class FakeAsyncSession:
+    """Hands ``run_sync`` a marker instead of a session and records merges."""
+
+    def __init__(self):
+        self.merged = []
+
+    async def merge(self, instance, load=True):
+        self.merged.append((instance, load))
+        return instance
+
+    async def run_sync(self, fn):
+        return fn("sync-session")
+
+
+def make_request(token: str) -> Request:
+    headers = [(b"authorization", f"Bearer {token}".encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_async_dependency_resolves_on_the_session_once_then_hits_the_cache():
+    calls = []
+
+    def resolve(token: str = Depends(oauth2_scheme), db=Depends(get_db)):
+        calls.append((token, db))
+        return User(id=7)
+
+    dependency = async_current_user(resolve, PrincipalCache(ttl_seconds=30, max_size=10))
+    db = FakeAsyncSession()
+
+    def call():
+        return dependency(_principal_request=make_request("abc"), _principal_db=db, token="abc")
+
+    first = asyncio.run(call())
+    second = asyncio.run(call())
+
+    assert calls == [("abc", "sync-session")]
+    assert (first.id, second.id) == (7, 7)
+    assert db.merged == [(second, False)]
+
+
+def test_async_dependency_keeps_the_parameters_fastapi_resolves():
+    def resolve(token: str = Depends(oauth2_scheme), db=Depends(get_db)):
+        return None
+
+    dependency = async_current_user(resolve, PrincipalCache(ttl_seconds=30, max_size=10))
+
+    assert list(inspect.signature(dependency).parameters) == [
+        "_principal_request",
+        "_principal_db",
+        "token",
+    ]
+
+
+def test_resolvers_the_cache_cannot_call_are_used_uncached():
+    def resolve(request: Request, db=Depends(get_db)):
+        return None
+
+    async def resolve_async(token: str = Depends(oauth2_scheme)):
+        return None
+
+    cache = PrincipalCache(ttl_seconds=30, max_size=10)
+    assert async_current_user(resolve, cache) is resolve
+    assert async_current_user(resolve_async, cache) is resolve_async
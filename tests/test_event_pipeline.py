@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from app.workers.event_pipeline import EventPublishPipeline, PlateauPolicy
+from tests.mocks import FakeEventDispatcher
+
+
+class SlowFailingDispatcher(FakeEventDispatcher):
+    def __init__(self):
+        super().__init__()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def publish_event(self, subject: str, event):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if subject.endswith("fail"):
+            raise RuntimeError("no ack")
+        await super().publish_event(subject, event)
+
+
+def test_pipeline_bounds_in_flight_window_and_counts_acks():
+    dispatcher = SlowFailingDispatcher()
+
+    async def run():
+        pipeline = EventPublishPipeline(dispatcher.publish_event, max_in_flight=3)
+        for i in range(10):
+            await pipeline.submit(f"subject.{i}", event={"i": i})
+        await pipeline.submit("subject.fail", event={})
+        await pipeline.drain()
+        return pipeline
+
+    pipeline = asyncio.run(run())
+
+    assert dispatcher.max_in_flight == 3
+    assert len(dispatcher.published) == 10
+    assert pipeline.published == 10
+    assert pipeline.failed == 1
+
+
+def test_plateau_policy_heartbeat_publishes_every_nth_plateau():
+    policy = PlateauPolicy("heartbeat", heartbeat_cycles=3)
+
+    decisions = [policy.should_publish(1) for _ in range(6)]
+    assert decisions == [False, False, True, False, False, True]
+
+    policy.should_publish(1)
+    policy.reset(1)
+    assert [policy.should_publish(1) for _ in range(3)] == [False, False, True]
+
+
+def test_plateau_policy_modes():
+    assert PlateauPolicy("always").should_publish(1) is True
+    assert PlateauPolicy("suppress").should_publish(1) is False
+    with pytest.raises(ValueError):
+        PlateauPolicy("sometimes")
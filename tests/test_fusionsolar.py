@@ -0,0 +1,97 @@
+import pytest
+
+from app.workers.fusionsolar import (
+    FAIL_CODE_MUST_RELOGIN,
+    FAIL_CODE_RATE_LIMITED,
+    FusionSolarError,
+    get_production_many,
+    http_session,
+    logged_in,
+)
+from tests.mocks import FakeHuaweiAdapter
+
+BASE_URL = FakeHuaweiAdapter.base_url
+
+
+def _logged_in_adapter(power_map):
+    adapter = FakeHuaweiAdapter(power_map)
+    adapter._login()
+    return adapter
+
+
+def test_one_request_fetches_every_device():
+    adapter = _logged_in_adapter({"INV-1": 1000.0, "INV-2": 2500.0, "INV-3": None})
+    session = http_session(adapter)
+
+    production = get_production_many(session, BASE_URL, ["INV-1", "INV-2", "INV-3"])
+
+    assert adapter.transport.kpi_requests == [{"devIds": "INV-1,INV-2,INV-3", "devTypeId": 1}]
+    powers = {serial: item["dataItemMap"]["active_power"] for serial, [item] in production.items()}
+    assert powers == {"INV-1": 1000.0, "INV-2": 2500.0, "INV-3": None}
+
+
+def test_devices_missing_from_the_answer_are_left_out():
+    adapter = _logged_in_adapter({"INV-1": 1000.0})
+
+    production = get_production_many(http_session(adapter), BASE_URL, ["INV-1", "INV-9"])
+
+    assert list(production) == ["INV-1"]
+
+
+def test_items_are_matched_by_serial_number(monkeypatch):
+    adapter = _logged_in_adapter({})
+    monkeypatch.setattr(
+        adapter.transport,
+        "get_dev_real_kpi",
+        lambda body, token: {
+            "success": True,
+            "data": [{"devId": 1000001, "sn": "SN-1", "dataItemMap": {"active_power": 5.0}}],
+        },
+    )
+
+    production = get_production_many(http_session(adapter), BASE_URL, ["SN-1"])
+
+    assert production["SN-1"][0]["dataItemMap"]["active_power"] == 5.0
+
+
+@pytest.mark.parametrize("fail_code", [FAIL_CODE_RATE_LIMITED, 20400])
+def test_api_failures_raise_with_their_fail_code(monkeypatch, fail_code):
+    adapter = _logged_in_adapter({"INV-1": 1000.0})
+    monkeypatch.setattr(
+        adapter.transport,
+        "get_dev_real_kpi",
+        lambda body, token: {"success": False, "failCode": fail_code},
+    )
+
+    with pytest.raises(FusionSolarError) as excinfo:
+        get_production_many(http_session(adapter), BASE_URL, ["INV-1"])
+
+    assert excinfo.value.fail_code == fail_code
+
+
+def test_an_unknown_xsrf_token_must_log_in_again():
+    adapter = _logged_in_adapter({"INV-1": 1000.0})
+    session = http_session(adapter)
+    session.cookies.set("XSRF-TOKEN", "expired")
+
+    with pytest.raises(FusionSolarError) as excinfo:
+        get_production_many(session, BASE_URL, ["INV-1"])
+
+    assert excinfo.value.fail_code == FAIL_CODE_MUST_RELOGIN
+
+
+def test_login_state_follows_the_xsrf_cookie():
+    adapter = FakeHuaweiAdapter({"INV-1": 1000.0})
+    assert not logged_in(http_session(adapter))
+
+    adapter.get_production("INV-1")
+
+    assert logged_in(http_session(adapter))
+    assert adapter.login_calls == 1
+
+
+def test_adapters_without_a_requests_session_cannot_batch():
+    class PlainAdapter:
+        session = {"token": "abc"}
+
+    assert http_session(PlainAdapter()) is None
@@ -0,0 +1,67 @@
+from datetime import datetime
+
+from fastapi import Request, Response
+
+from app.api.http_cache import (CachedBody, collection_etag, conditional_collection,
+                                etag_matches, strong_etag)
+
+
+def make_request(if_none_match: str | None = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_strong_etag_is_quoted_and_content_based():
+    etag = strong_etag(b'{"a":1}')
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == strong_etag(b'{"a":1}')
+    assert etag != strong_etag(b'{"a":2}')
+
+
+def test_etag_matches_lists_wildcard_and_weak_tags():
+    etag = strong_etag(b"body")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches(f"W/{etag}", etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_cached_body_serves_body_then_304():
+    cached = CachedBody.from_bytes(b'{"vendors":[]}')
+
+    response = cached.response(make_request(), "public, max-age=60")
+    assert response.status_code == 200
+    assert response.body == b'{"vendors":[]}'
+    assert response.headers["etag"] == cached.etag
+    assert response.headers["cache-control"] == "public, max-age=60"
+
+    revalidated = cached.response(make_request(cached.etag), "public, max-age=60")
+    assert revalidated.status_code == 304
+    assert revalidated.body == b""
+    assert revalidated.headers["etag"] == cached.etag
+
+
+def test_collection_etag_changes_with_version_parts():
+    changed = datetime(2025, 1, 1, 12, 0)
+    etag = collection_etag("devices", 7, 3, changed)
+    assert etag == collection_etag("devices", 7, 3, changed)
+    assert etag != collection_etag("devices", 7, 2, changed)
+    assert etag != collection_etag("devices", 7, 3, datetime(2025, 1, 1, 12, 1))
+    assert etag != collection_etag("providers", 7, 3, changed)
+
+
+def test_conditional_collection_sets_validators_or_short_circuits():
+    changed = datetime(2025, 1, 1, 12, 0)
+    etag = collection_etag("installations", 1, 2, changed)
+
+    response = Response()
+    assert conditional_collection(make_request(), response, etag) is None
+    assert response.headers["etag"] == etag
+    assert response.headers["cache-control"] == "private, no-cache"
+    assert "last-modified" not in response.headers
+
+    not_modified = conditional_collection(make_request(etag), Response(), etag)
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
@@ -0,0 +1,110 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+# The models sit on the worker's own declarative base, which lives outside this tree.
+for module in ("app.core.db", "app.models.inverter_power_record"):
+    pytest.importorskip(module, reason="inverter worker modules are not installed")
+
+from app.core.db import Base  # noqa: E402
+from app.models.inverter_power_interval import InverterPowerInterval  # noqa: E402
+from app.models.inverter_power_record import InverterPowerRecord  # noqa: E402
+from app.workers.last_value_cache import LastValueCache  # noqa: E402
+from app.workers.power_interval_buffer import OpenIntervalIndex  # noqa: E402
+
+
+class FakePowerRepository:
+    def __init__(self, latest: dict):
+        self.latest = latest
+        self.calls = 0
+
+    def get_latest_for_inverter(self, inverter_id: int):
+        self.calls += 1
+        if inverter_id not in self.latest:
+            return None
+        return SimpleNamespace(active_power=self.latest[inverter_id])
+
+
+def test_last_value_cache_falls_back_to_repository_only_on_miss():
+    repo = FakePowerRepository({1: 1500.0})
+    cache = LastValueCache()
+
+    assert cache.lookup(repo, 1) == (True, 1500.0)
+    assert cache.lookup(repo, 1) == (True, 1500.0)
+    assert repo.calls == 1
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_last_value_cache_distinguishes_missing_history_from_none_power():
+    repo = FakePowerRepository({2: None})
+    cache = LastValueCache()
+
+    assert cache.lookup(repo, 2) == (True, None)
+    assert cache.lookup(repo, 3) == (False, None)
+    assert cache.lookup(repo, 3) == (False, None)
+    assert repo.calls == 2
+
+
+def test_last_value_cache_set_overrides_cached_value():
+    repo = FakePowerRepository({})
+    cache = LastValueCache()
+
+    assert cache.lookup(repo, 4) == (False, None)
+    cache.set(4, 2000.0)
+
+    assert cache.lookup(repo, 4) == (True, 2000.0)
+    assert repo.calls == 1
+
+
+def test_warm_prefers_the_newer_row_of_a_same_timestamp_step():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    changed_at = datetime(2024, 6, 21, 12, 0, tzinfo=timezone.utc)
+    with Session(engine) as db:
+        # A step from 1500 W to 900 W: the previous value is repeated at the change time.
+        db.execute(
+            insert(InverterPowerRecord),
+            [
+                {"inverter_id": 1, "active_power": 1500.0, "timestamp": changed_at},
+                {"inverter_id": 1, "active_power": 900.0, "timestamp": changed_at},
+            ],
+        )
+        db.commit()
+
+        cache = LastValueCache()
+        cache.warm(db)
+
+    assert cache.lookup(FakePowerRepository({}), 1) == (True, 900.0)
+
+
+def test_open_intervals_seed_the_cache_in_interval_storage():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    closed = datetime(2024, 6, 21, 11, 0, tzinfo=timezone.utc)
+    opened_at = datetime(2024, 6, 21, 12, 0, tzinfo=timezone.utc)
+    now = datetime(2024, 6, 21, 12, 30, tzinfo=timezone.utc)
+    with Session(engine) as db:
+        db.execute(
+            insert(InverterPowerInterval),
+            [
+                {"inverter_id": 1, "active_power": 1500.0, "start_at": closed, "end_at": opened_at},
+                {"inverter_id": 1, "active_power": 900.0, "start_at": opened_at, "end_at": now},
+                {"inverter_id": 2, "active_power": None, "start_at": opened_at, "end_at": now},
+            ],
+        )
+        db.commit()
+
+        cache = LastValueCache()
+        index = OpenIntervalIndex()
+        index.warm(db, cache)
+
+    repo = FakePowerRepository({})
+    assert cache.warmed
+    assert cache.lookup(repo, 1) == (True, 900.0)
+    assert cache.lookup(repo, 2) == (True, None)
+    assert repo.calls == 0
+    # SQLite hands back naive datetimes.
+    assert index.get(repo, 1).replace(tzinfo=timezone.utc) == opened_at
@@ -0,0 +1,92 @@
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.dependencies.ownership import (OwnedDevice, OwnedProvider, get_owned_device,
+                                            get_owned_device_async, get_owned_provider)
+
+USER = SimpleNamespace(id=7)
+MICROCONTROLLER = SimpleNamespace(id=3)
+DEVICE = SimpleNamespace(id=11, microcontroller_id=3)
+PROVIDER = SimpleNamespace(id=12, microcontroller_id=3)
+
+
+class FakeSession:
+    """Returns one preset row and records the statements it was asked to run."""
+
+    def __init__(self, row):
+        self.row = row
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(first=lambda: self.row)
+
+
+class FakeAsyncSession(FakeSession):
+    async def execute(self, statement):
+        return super().execute(statement)
+
+
+def test_owned_device_is_resolved_in_one_query_scoped_to_the_user():
+    db = FakeSession((MICROCONTROLLER, DEVICE))
+
+    owned = get_owned_device(1, uuid4(), DEVICE.id, db=db, current_user=USER)
+
+    assert owned == OwnedDevice(MICROCONTROLLER, DEVICE)
+    assert len(db.statements) == 1
+    params = db.statements[0].compile().params
+    assert USER.id in params.values()
+    assert DEVICE.id in params.values()
+
+
+@pytest.mark.parametrize(
+    "row, detail",
+    [
+        (None, "Microcontroller not found"),
+        ((MICROCONTROLLER, None), "Device not found for the selected microcontroller"),
+    ],
+)
+def test_foreign_or_missing_device_is_a_404(row, detail):
+    with pytest.raises(HTTPException) as exc:
+        get_owned_device(1, uuid4(), DEVICE.id, db=FakeSession(row), current_user=USER)
+    assert (exc.value.status_code, exc.value.detail) == (404, detail)
+
+
+def test_async_variant_shares_the_device_checks():
+    owned = asyncio.run(
+        get_owned_device_async(
+            1, uuid4(), DEVICE.id, db=FakeAsyncSession((MICROCONTROLLER, DEVICE)), current_user=USER
+        )
+    )
+    assert owned.device is DEVICE
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(
+            get_owned_device_async(
+                1, uuid4(), DEVICE.id, db=FakeAsyncSession(None), current_user=USER
+            )
+        )
+    assert exc.value.status_code == 404
+
+
+@pytest.mark.parametrize(
+    "row, detail",
+    [(None, "Microcontroller not found"), ((MICROCONTROLLER, None), "Provider not found")],
+)
+def test_foreign_or_missing_provider_is_a_404(row, detail):
+    with pytest.raises(HTTPException) as exc:
+        get_owned_provider(1, uuid4(), PROVIDER.id, db=FakeSession(row), current_user=USER)
+    assert (exc.value.status_code, exc.value.detail) == (404, detail)
+
+
+def test_owned_provider_is_resolved():
+    db = FakeSession((MICROCONTROLLER, PROVIDER))
+
+    owned = get_owned_provider(1, uuid4(), PROVIDER.id, db=db, current_user=USER)
+
+    assert owned == OwnedProvider(MICROCONTROLLER, PROVIDER)
+    assert len(db.statements) == 1
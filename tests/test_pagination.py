@@ -0,0 +1,76 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Integer, String, create_engine, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from app.api.pagination import (CursorPage, CursorPaginationMeta, _Explain, count_rows,
+                                decode_cursor, encode_cursor)
+from app.repositories.user_list_repository import UserListRepository
+from smart_common.schemas.pagination_schema import PaginatedResponse
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Row(Base):
+    __tablename__ = "rows"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String)
+
+
+def test_cursor_round_trips_and_is_opaque():
+    created_at = datetime(2025, 3, 1, 8, 30, tzinfo=timezone.utc)
+    cursor = encode_cursor(created_at, 42)
+
+    assert "2025" not in cursor
+    assert decode_cursor(cursor) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor(datetime(2025, 1, 1), 1)[:-4]])
+def test_invalid_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor)
+    assert exc.value.status_code == 400
+
+
+def test_count_modes_outside_postgres():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add_all([Row(name="a"), Row(name="b"), Row(name="a")])
+        db.commit()
+
+        where = [Row.name == "a"]
+        assert count_rows(db, Row, where, "exact") == (2, False)
+        assert count_rows(db, Row, where, "none") == (None, False)
+        # No planner statistics to read; falls back to an exact count.
+        assert count_rows(db, Row, [], "estimate") == (3, False)
+
+
+def test_explain_wraps_the_statement_on_postgres():
+    sql = str(_Explain(select(Row.id).where(Row.name == "a")).compile(dialect=postgresql.dialect()))
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT rows.id")
+    assert "%(name_1)s" in sql
+
+
+def test_user_email_filter_matches_wildcards_literally():
+    filters = {"email": "a_b%", "is_active": None, "role": None}
+    (condition,) = UserListRepository.conditions(filters)
+    sql = str(
+        condition.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    )
+    assert "a/_b/%" in sql
+    assert "ESCAPE '/'" in sql
+
+
+def test_offset_page_keeps_the_paginated_response_shape():
+    page = CursorPage[int](meta=CursorPaginationMeta(limit=2, offset=0, total=3), items=[1, 2])
+
+    assert isinstance(page, PaginatedResponse)
+    meta = page.model_dump()["meta"]
+    assert (meta["total"], meta["limit"], meta["offset"]) == (3, 2, 0)
@@ -0,0 +1,78 @@
+import io
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import Session
+
+from app.api.power_history_export import iter_arrow, iter_csv, iter_parquet
+from app.repositories.inverter_power_export_repository import (InverterPowerExportRepository,
+                                                               inverter_power_records, inverters)
+
+COLUMNS = [("serial_number", "string"), ("timestamp", "timestamp"), ("active_power", "float")]
+T0 = datetime(2024, 6, 21, 10, 0, tzinfo=timezone.utc)
+PARTITIONS = [
+    [("INV-1", T0, 1200.0), ("INV-1", T0.replace(minute=5), None)],
+    [("INV-2", T0, 300.5)],
+]
+
+
+def test_iter_csv_yields_one_chunk_per_partition():
+    chunks = list(iter_csv(COLUMNS, PARTITIONS))
+
+    assert len(chunks) == 2
+    assert b"".join(chunks).decode().splitlines() == [
+        "serial_number,timestamp,active_power",
+        "INV-1,2024-06-21T10:00:00+00:00,1200.0",
+        "INV-1,2024-06-21T10:05:00+00:00,",
+        "INV-2,2024-06-21T10:00:00+00:00,300.5",
+    ]
+
+
+def test_iter_parquet_round_trips_rows():
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    table = pq.read_table(io.BytesIO(b"".join(iter_parquet(COLUMNS, PARTITIONS))))
+
+    assert table.column("serial_number").to_pylist() == ["INV-1", "INV-1", "INV-2"]
+    assert table.column("active_power").to_pylist() == [1200.0, None, 300.5]
+
+
+def test_iter_arrow_round_trips_rows():
+    pa = pytest.importorskip("pyarrow")
+
+    table = pa.ipc.open_stream(b"".join(iter_arrow(COLUMNS, PARTITIONS))).read_all()
+
+    assert table.num_rows == 3
+    assert table.column("timestamp").to_pylist()[0] == T0
+
+
+def test_repository_streams_one_installations_records_in_chunks():
+    engine = create_engine("sqlite://")
+    with Session(engine) as db:
+        db.execute(text("CREATE TABLE inverters (id, installation_id, serial_number)"))
+        db.execute(
+            text("CREATE TABLE inverter_power_records (inverter_id, timestamp, active_power)")
+        )
+        db.execute(
+            insert(inverters),
+            [
+                {"id": 1, "installation_id": 1, "serial_number": "INV-1"},
+                {"id": 2, "installation_id": 2, "serial_number": "INV-2"},
+            ],
+        )
+        db.execute(
+            insert(inverter_power_records),
+            [
+                {"inverter_id": 1, "timestamp": T0.replace(minute=5), "active_power": None},
+                {"inverter_id": 1, "timestamp": T0, "active_power": 1200.0},
+                {"inverter_id": 2, "timestamp": T0, "active_power": 300.5},
+            ],
+        )
+
+        partitions = InverterPowerExportRepository(db).stream_records(
+            1, T0, T0.replace(hour=11), chunk_size=1
+        )
+        rows = [[(serial, power) for serial, _, power in partition] for partition in partitions]
+
+    assert rows == [[("INV-1", 1200.0)], [("INV-1", None)]]
@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+# The models sit on the worker's own declarative base, which lives outside this tree.
+pytest.importorskip("app.core.db", reason="inverter worker modules are not installed")
+
+from app.repositories.inverter_power_interval_repository import expand_intervals  # noqa: E402
+
+T0 = datetime(2024, 6, 21, 8, 0, tzinfo=timezone.utc)
+
+
+def _interval(value, start_minutes: int, end_minutes: int):
+    return SimpleNamespace(
+        active_power=value,
+        start_at=T0 + timedelta(minutes=start_minutes),
+        end_at=T0 + timedelta(minutes=end_minutes),
+    )
+
+
+def test_expand_intervals_emits_start_and_end_of_each_plateau():
+    points = expand_intervals([_interval(1000.0, 0, 30), _interval(None, 30, 45)])
+
+    assert points == [
+        (T0, 1000.0),
+        (T0 + timedelta(minutes=30), 1000.0),
+        (T0 + timedelta(minutes=30), None),
+        (T0 + timedelta(minutes=45), None),
+    ]
+
+
+def test_expand_intervals_single_point_for_zero_length_interval():
+    assert expand_intervals([_interval(500.0, 5, 5)]) == [(T0 + timedelta(minutes=5), 500.0)]
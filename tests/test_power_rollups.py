@@ -0,0 +1,143 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+# The models sit on the worker's own declarative base, which lives outside this tree.
+pytest.importorskip("app.core.db", reason="inverter worker modules are not installed")
+
+from app.core.db import Base  # noqa: E402
+from app.models.inverter_power_rollup import InverterPowerRollup  # noqa: E402
+from app.repositories.inverter_power_rollup_repository import (  # noqa: E402
+    InverterPowerRollupRepository,
+    pick_bucket,
+)
+from app.workers.power_rollups import PowerRollupAccumulator  # noqa: E402
+
+T0 = datetime(2024, 6, 21, 10, 0, tzinfo=timezone.utc)
+
+
+def _rows_by_key(accumulator: PowerRollupAccumulator) -> dict:
+    return {(row["bucket"], row["bucket_start"]): row for row in accumulator.pending_rows()}
+
+
+def test_accumulator_integrates_step_function_across_bucket_boundaries():
+    accumulator = PowerRollupAccumulator(max_gap=timedelta(hours=1))
+    accumulator.observe(1, 1200.0, T0 + timedelta(minutes=50))
+    accumulator.observe(1, 600.0, T0 + timedelta(minutes=70))
+
+    rows = _rows_by_key(accumulator)
+
+    first_hour = rows[("1h", T0)]
+    assert first_hour["energy_wh"] == 1200.0 * 10 / 60
+    assert first_hour["covered_seconds"] == 600
+    second_hour = rows[("1h", T0 + timedelta(hours=1))]
+    assert second_hour["energy_wh"] == 1200.0 * 10 / 60
+    assert (second_hour["min_power"], second_hour["max_power"]) == (600.0, 1200.0)
+    assert rows[("1d", datetime(2024, 6, 21, tzinfo=timezone.utc))]["energy_wh"] == 400.0
+
+
+def test_accumulator_skips_gaps_and_failed_readings():
+    accumulator = PowerRollupAccumulator(max_gap=timedelta(minutes=30))
+    accumulator.observe(1, 1000.0, T0)
+    accumulator.observe(1, None, T0 + timedelta(hours=2))
+    accumulator.observe(1, 500.0, T0 + timedelta(hours=2, minutes=5))
+
+    assert all(row["energy_wh"] == 0 for row in accumulator.pending_rows())
+
+
+def test_without_max_gap_a_value_holds_until_the_next_reading():
+    # Stored change-only history: a three hour plateau has no rows in between.
+    accumulator = PowerRollupAccumulator(max_gap=None)
+    accumulator.observe(1, 1000.0, T0)
+    accumulator.observe(1, 500.0, T0 + timedelta(hours=3))
+
+    rows = _rows_by_key(accumulator)
+    day = rows[("1d", datetime(2024, 6, 21, tzinfo=timezone.utc))]
+    assert day["energy_wh"] == 3000.0
+    assert day["covered_seconds"] == 3 * 3600
+
+
+def test_take_completed_returns_only_buckets_ending_before_boundary():
+    accumulator = PowerRollupAccumulator(max_gap=timedelta(hours=1))
+    accumulator.observe(1, 1000.0, T0 + timedelta(minutes=50))
+    accumulator.observe(1, 1000.0, T0 + timedelta(minutes=70))
+
+    completed = accumulator.take_completed(T0 + timedelta(hours=1))
+
+    assert ("1h", T0) in {(row["bucket"], row["bucket_start"]) for row in completed}
+    assert all(row["bucket"] != "1d" for row in completed)
+    remaining = _rows_by_key(accumulator)
+    assert ("1h", T0) not in remaining
+    assert ("1h", T0 + timedelta(hours=1)) in remaining
+
+
+def test_forgotten_inverter_starts_a_new_span():
+    accumulator = PowerRollupAccumulator(max_gap=timedelta(hours=1))
+    accumulator.observe(1, 1000.0, T0)
+    accumulator.observe(2, 1000.0, T0)
+    # Shard handed back: another worker polled inverter 1 in the meantime.
+    accumulator.forget_where(lambda inverter_id: inverter_id == 1)
+    accumulator.observe(1, 1000.0, T0 + timedelta(minutes=10))
+    accumulator.observe(2, 1000.0, T0 + timedelta(minutes=10))
+
+    rows = accumulator.pending_rows()
+    energy = {row["inverter_id"]: row["energy_wh"] for row in rows if row["bucket"] == "1h"}
+    assert energy[1] == 0
+    assert round(energy[2], 6) == round(1000.0 * 10 / 60, 6)
+
+
+def test_failed_flush_keeps_at_most_max_pending_buckets():
+    class FailingSession:
+        def execute(self, *args, **kwargs):
+            raise RuntimeError("db down")
+
+        def rollback(self):
+            pass
+
+    accumulator = PowerRollupAccumulator(max_gap=timedelta(hours=1), max_pending=3)
+    accumulator.observe(1, 1000.0, T0)
+    accumulator.observe(1, 1000.0, T0 + timedelta(days=1))
+
+    with pytest.raises(RuntimeError):
+        accumulator.flush(FailingSession())
+
+    kept = {(row["bucket"], row["bucket_start"]) for row in accumulator.pending_rows()}
+    assert len(kept) == 3
+    # The newest buckets survive: everything of the second day.
+    assert all(start >= datetime(2024, 6, 22, tzinfo=timezone.utc) for _, start in kept)
+
+
+def test_pick_bucket_prefers_coarsest_bucket_within_resolution_and_window():
+    month = (T0, T0 + timedelta(days=30))
+
+    assert pick_bucket(*month, timedelta(days=1)) == "1d"
+    assert pick_bucket(*month, timedelta(hours=6)) == "1h"
+    assert pick_bucket(T0, T0 + timedelta(hours=2), timedelta(days=1)) == "1h"
+    assert pick_bucket(T0, T0 + timedelta(hours=2), timedelta(minutes=5)) == "1m"
+    assert pick_bucket(T0, T0 + timedelta(hours=2), timedelta(seconds=10)) == "1m"
+
+
+def test_delete_before_removes_expired_buckets_of_one_size_in_chunks():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    minute = timedelta(minutes=1)
+    with Session(engine) as db:
+        db.execute(
+            insert(InverterPowerRollup),
+            [
+                {"inverter_id": 1, "bucket": "1m", "bucket_start": T0 - 2 * minute},
+                {"inverter_id": 1, "bucket": "1m", "bucket_start": T0 - minute},
+                {"inverter_id": 1, "bucket": "1m", "bucket_start": T0},
+                {"inverter_id": 1, "bucket": "15m", "bucket_start": T0 - 15 * minute},
+            ],
+        )
+        repository = InverterPowerRollupRepository(db)
+
+        assert repository.delete_before("1m", T0, limit=1) == 1
+        assert repository.delete_before("1m", T0, limit=10) == 1
+        assert repository.delete_before("1m", T0, limit=10) == 0
+        kept = db.execute(select(InverterPowerRollup.bucket)).scalars().all()
+
+    assert sorted(kept) == ["15m", "1m"]
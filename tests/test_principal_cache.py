@@ -0,0 +1,162 @@
+import base64
+import enum
+import json
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from sqlalchemy import Boolean, DateTime, Enum, Integer, String
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from app.api.principal_cache import PrincipalCache, _encode, decode_snapshot, snapshot_user
+
+
+class Role(enum.Enum):
+    ADMIN = "admin"
+    CLIENT = "client"
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class CachedUser(Base):
+    __tablename__ = "cached_users"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    email: Mapped[str] = mapped_column(String)
+    role: Mapped[Role] = mapped_column(Enum(Role))
+    is_active: Mapped[bool] = mapped_column(Boolean)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    password_hash: Mapped[str] = mapped_column(String)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def jwt(exp: float) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).rstrip(b"=")
+    return f"header.{payload.decode()}.signature"
+
+
+def make_user(user_id: int = 1) -> CachedUser:
+    return CachedUser(
+        id=user_id,
+        email=f"user{user_id}@example.com",
+        role=Role.CLIENT,
+        is_active=True,
+        created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        password_hash="$2b$12$secret",
+    )
+
+
+def test_hit_until_ttl_expires():
+    clock = FakeClock()
+    cache = PrincipalCache(ttl_seconds=30, max_size=10, clock=clock)
+    token = jwt(time.time() + 3600)
+    cache.put(token, make_user())
+
+    assert cache.get(token, CachedUser)["email"] == "user1@example.com"
+    clock.now = 31
+    assert cache.get(token, CachedUser) is None
+
+
+def test_ttl_never_outlives_token():
+    clock = FakeClock()
+    cache = PrincipalCache(ttl_seconds=30, max_size=10, clock=clock)
+    token = jwt(time.time() + 5)
+    cache.put(token, make_user())
+
+    clock.now = 6
+    assert cache.get(token, CachedUser) is None
+
+    expired = jwt(time.time() - 1)
+    cache.put(expired, make_user())
+    assert cache.get(expired, CachedUser) is None
+
+
+def test_lru_is_bounded():
+    cache = PrincipalCache(ttl_seconds=30, max_size=2, clock=FakeClock())
+    exp = time.time() + 3600
+    tokens = [jwt(exp + i) for i in range(3)]
+    cache.put(tokens[0], make_user(1))
+    cache.put(tokens[1], make_user(2))
+    cache.get(tokens[0], CachedUser)
+    cache.put(tokens[2], make_user(3))
+
+    assert cache.get(tokens[0], CachedUser) is not None
+    assert cache.get(tokens[1], CachedUser) is None
+    assert cache.get(tokens[2], CachedUser) is not None
+
+
+def test_invalidate_user_drops_all_their_tokens():
+    cache = PrincipalCache(ttl_seconds=30, max_size=10, clock=FakeClock())
+    exp = time.time() + 3600
+    first, second, other = jwt(exp), jwt(exp + 1), jwt(exp + 2)
+    cache.put(first, make_user(1))
+    cache.put(second, make_user(1))
+    cache.put(other, make_user(2))
+
+    cache.invalidate_user(1)
+
+    assert cache.get(first, CachedUser) is None
+    assert cache.get(second, CachedUser) is None
+    assert cache.get(other, CachedUser) is not None
+
+
+def test_disabled_with_zero_ttl():
+    cache = PrincipalCache(ttl_seconds=0, max_size=10)
+    token = jwt(time.time() + 3600)
+    cache.put(token, make_user())
+    assert cache.get(token, CachedUser) is None
+
+
+def test_snapshot_round_trips_through_json():
+    snapshot = snapshot_user(make_user())
+    restored = decode_snapshot(CachedUser, _encode(snapshot))
+
+    assert restored == snapshot
+    assert restored["role"] is Role.CLIENT
+
+
+def test_snapshot_keeps_only_principal_fields():
+    snapshot = snapshot_user(make_user())
+
+    assert set(snapshot) == {"id", "email", "role", "is_active"}
+    assert "$2b$12$secret" not in _encode(snapshot)
+
+
+def test_put_after_invalidation_is_dropped():
+    cache = PrincipalCache(ttl_seconds=30, max_size=10, clock=FakeClock())
+    token = jwt(time.time() + 3600)
+    generation = cache.generation()
+    # The user is updated and invalidated while the request is still loading it.
+    cache.invalidate_user(1)
+    cache.put(token, make_user(), generation)
+
+    assert cache.get(token, CachedUser) is None
+    cache.put(token, make_user(), cache.generation())
+    assert cache.get(token, CachedUser) is not None
+
+
+def test_redis_tier_is_shared_and_invalidated_across_processes():
+    fakeredis = pytest.importorskip("fakeredis")
+    redis = fakeredis.FakeRedis()
+    token = jwt(time.time() + 3600)
+    cache = PrincipalCache(ttl_seconds=30, max_size=10, redis=redis, clock=FakeClock())
+    other_process = PrincipalCache(ttl_seconds=30, max_size=10, redis=redis)
+
+    cache.put(token, make_user())
+    assert other_process.get(token, CachedUser) == snapshot_user(make_user())
+
+    cache.invalidate_user(1)
+    assert redis.keys("auth:principal:*") == []
+    # The other process only drops its copy once the listener gets the message.
+    other_process._drop_local(1)
+    assert other_process.get(token, CachedUser) is None
@@ -0,0 +1,46 @@
+import asyncio
+
+from fastapi import FastAPI
+
+from app.api.routes.provider_definitions import CATALOG, DETAILS, _catalog, _detail
+from smart_common.providers.registry import PROVIDER_DEFINITIONS
+from smart_common.schemas.provider_definitions_schema import (
+    ProviderDefinitionDetail,
+    ProviderDefinitionsResponse,
+)
+
+
+def fastapi_body(response_model, model) -> bytes:
+    """What a plain FastAPI route with ``response_model`` sends for ``model``."""
+    app = FastAPI()
+    app.get("/", response_model=response_model)(lambda: model)
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "raw_path": b"/",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "server": ("test", 80),
+    }
+    asyncio.run(app(scope, receive, send))
+    return b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+
+
+def test_catalog_bytes_match_the_response_model_serialization():
+    assert CATALOG.body == fastapi_body(ProviderDefinitionsResponse, _catalog())
+
+
+def test_detail_bytes_match_the_response_model_serialization():
+    for vendor, meta in PROVIDER_DEFINITIONS.items():
+        expected = fastapi_body(ProviderDefinitionDetail, _detail(vendor, meta))
+        assert DETAILS[vendor].body == expected, vendor
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+from app.workers.rate_limiter import BucketPolicy, VendorRateLimiter  # noqa: E402
+
+ACCOUNT_KEY = "ratelimit:huawei:user1"
+
+
+def _limiter(redis, burst: int = 2) -> VendorRateLimiter:
+    return VendorRateLimiter(
+        redis,
+        vendor_policy=BucketPolicy(100.0, 100, 1.0, 1.0),
+        account_policy=BucketPolicy(1.0, burst, 0.1, 0.5),
+        throttle_backoff_seconds=5.0,
+    )
+
+
+def _take(limiter: VendorRateLimiter, key: str = ACCOUNT_KEY):
+    policy = limiter.account_policy
+    return limiter._acquire(
+        keys=[key],
+        args=[policy.rate_per_second, policy.burst, policy.recovery_per_second, limiter.ttl_ms],
+    )
+
+
+def test_bucket_serves_the_burst_then_asks_to_wait():
+    async def run():
+        limiter = _limiter(fakeredis.FakeAsyncRedis(), burst=2)
+        return [int(await _take(limiter)) for _ in range(3)]
+
+    first, second, third = asyncio.run(run())
+    assert (first, second) == (0, 0)
+    # One token per second refill: about a second until the next token.
+    assert 900 <= third <= 1000
+
+
+def test_throttle_halves_the_rate_and_blocks_the_account():
+    async def run():
+        redis = fakeredis.FakeAsyncRedis()
+        limiter = _limiter(redis)
+        await limiter.report_throttled("huawei", "user1")
+        wait = int(await _take(limiter))
+        rate = float(await redis.hget(ACCOUNT_KEY, "rate"))
+        other_account = int(await _take(limiter, "ratelimit:huawei:user2"))
+        return wait, rate, other_account
+
+    wait, rate, other_account = asyncio.run(run())
+    assert 4900 <= wait <= 5000
+    assert rate == pytest.approx(0.5)
+    assert other_account == 0
+
+
+def test_throttled_rate_recovers_additively_and_is_capped():
+    async def run():
+        redis = fakeredis.FakeAsyncRedis()
+        limiter = _limiter(redis)
+        await limiter.report_throttled("huawei", "user1")
+        await limiter.report_throttled("huawei", "user1")
+        throttled = float(await redis.hget(ACCOUNT_KEY, "rate"))
+
+        # Pretend the last update was 1s ago and the backoff is over.
+        ts = int(await redis.hget(ACCOUNT_KEY, "ts"))
+        await redis.hset(ACCOUNT_KEY, mapping={"ts": ts - 1000, "blocked_until": 0})
+        await _take(limiter)
+        recovered = float(await redis.hget(ACCOUNT_KEY, "rate"))
+
+        await redis.hset(ACCOUNT_KEY, "ts", ts - 60_000)
+        await _take(limiter)
+        capped = float(await redis.hget(ACCOUNT_KEY, "rate"))
+        return throttled, recovered, capped
+
+    throttled, recovered, capped = asyncio.run(run())
+    assert throttled == pytest.approx(0.25)
+    # 0.5 tokens/s of rate regained per second.
+    assert recovered == pytest.approx(0.75, abs=0.05)
+    assert capped == pytest.approx(1.0)
+
+
+def test_min_rate_bounds_repeated_throttling():
+    async def run():
+        redis = fakeredis.FakeAsyncRedis()
+        limiter = _limiter(redis)
+        for _ in range(10):
+            await limiter.report_throttled("huawei", "user1")
+        return float(await redis.hget(ACCOUNT_KEY, "rate"))
+
+    assert asyncio.run(run()) == pytest.approx(0.1)
@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import DateTime, create_engine, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.types import TypeDecorator
+
+pytest.importorskip("celery")
+pytest.importorskip("smart_common.core.config")
+# Retention runs on the worker's own models and declarative base, outside this tree.
+for module in ("app.core.db", "app.models.inverter_power_record"):
+    pytest.importorskip(module, reason="inverter worker modules are not installed")
+
+from app.core.db import Base  # noqa: E402
+from app.models.inverter_power_interval import InverterPowerInterval  # noqa: E402
+from app.models.inverter_power_rollup import InverterPowerRollup  # noqa: E402
+from app.tasks.retention_tasks import _prune_inverter_intervals  # noqa: E402
+
+CUTOFF = datetime(2024, 6, 21, tzinfo=timezone.utc)
+HOUR = timedelta(hours=1)
+
+
+def _interval(power, start: datetime, end: datetime, inverter_id: int = 1) -> dict:
+    return {"inverter_id": inverter_id, "active_power": power, "start_at": start, "end_at": end}
+
+
+class _UtcDateTime(TypeDecorator):
+    """SQLite drops the UTC offset that Postgres' timestamptz keeps; put it back."""
+
+    impl = DateTime
+    cache_ok = True
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else value.replace(tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    for column in (
+        InverterPowerInterval.__table__.c.start_at,
+        InverterPowerInterval.__table__.c.end_at,
+        InverterPowerRollup.__table__.c.bucket_start,
+    ):
+        monkeypatch.setattr(column, "type", _UtcDateTime())
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def _intervals(db: Session) -> list[tuple]:
+    return db.execute(
+        select(InverterPowerInterval.active_power, InverterPowerInterval.start_at)
+        .order_by(InverterPowerInterval.start_at)
+    ).all()
+
+
+def test_intervals_past_the_cutoff_are_rolled_up_and_deleted_in_chunks(db):
+    start = CUTOFF - 4 * HOUR
+    db.execute(
+        insert(InverterPowerInterval),
+        [
+            _interval(1000.0, start, start + HOUR),
+            _interval(2000.0, start + HOUR, start + 2 * HOUR),
+            _interval(None, start + 2 * HOUR, start + 3 * HOUR),
+            # Ends after the cutoff, so it is kept along with the open interval.
+            _interval(500.0, start + 3 * HOUR, CUTOFF + HOUR),
+            _interval(800.0, CUTOFF + HOUR, CUTOFF + 2 * HOUR),
+        ],
+    )
+    db.commit()
+
+    deleted = _prune_inverter_intervals(db, 1, CUTOFF, CUTOFF - 1000 * HOUR, chunk_size=2)
+
+    assert deleted == 3
+    assert [power for power, _ in _intervals(db)] == [500.0, 800.0]
+    hourly = dict(
+        db.execute(
+            select(InverterPowerRollup.bucket_start, InverterPowerRollup.energy_wh).where(
+                InverterPowerRollup.bucket == "1h"
+            )
+        ).all()
+    )
+    # The failed reading integrates nothing; the kept intervals' hour is left to the worker.
+    assert hourly == {start: 1000.0, start + HOUR: 2000.0, start + 2 * HOUR: 0.0}
+
+
+def test_the_open_interval_is_kept_however_old(db):
+    start = CUTOFF - 10 * HOUR
+    db.execute(
+        insert(InverterPowerInterval),
+        [_interval(1000.0, start, start + HOUR), _interval(0.0, start + HOUR, start + 2 * HOUR)],
+    )
+    db.commit()
+
+    assert _prune_inverter_intervals(db, 1, CUTOFF, CUTOFF, chunk_size=100) == 1
+    assert [power for power, _ in _intervals(db)] == [0.0]
@@ -0,0 +1,163 @@
+import asyncio
+
+import pytest
+
+from app.workers.sharding import ShardCoordinator
+
+
+class FakeRedis:
+    def register_script(self, script):
+        return None
+
+
+def _coordinator(worker_id: str) -> ShardCoordinator:
+    return ShardCoordinator(FakeRedis(), worker_id, shard_count=64)
+
+
+def test_assignment_partitions_all_shards_between_members():
+    members = ["a", "b", "c"]
+    assigned = [_coordinator(member).assign(members) for member in members]
+
+    assert set().union(*assigned) == set(range(64))
+    assert sum(len(shards) for shards in assigned) == 64
+
+
+def test_member_leaving_only_moves_its_own_shards():
+    before = {member: _coordinator(member).assign(["a", "b", "c"]) for member in "abc"}
+    after = {member: _coordinator(member).assign(["a", "b"]) for member in "ab"}
+
+    assert before["a"] <= after["a"]
+    assert before["b"] <= after["b"]
+    assert after["a"] | after["b"] == set(range(64))
+
+
+def test_owns_uses_stable_shard_of_inverter():
+    coordinator = _coordinator("a")
+    coordinator.owned = {coordinator.shard_for(42)}
+
+    assert coordinator.owns(42)
+    assert coordinator.shard_for(42) == _coordinator("b").shard_for(42)
+
+
+@pytest.fixture
+def redis():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    return fakeredis.FakeAsyncRedis()
+
+
+def _leased(redis, worker_id: str, **kwargs) -> ShardCoordinator:
+    return ShardCoordinator(redis, worker_id, shard_count=8, **kwargs)
+
+
+async def _lease_holders(redis) -> dict[int, bytes]:
+    return {shard: await redis.get(f"inverter_worker:shards:{shard}") for shard in range(8)}
+
+
+def test_lone_worker_claims_and_renews_every_lease(redis):
+    async def run():
+        worker = _leased(redis, "a", lease_seconds=30)
+        gained = await worker.rebalance()
+        await redis.pexpire("inverter_worker:shards:0", 1000)
+        renewed = await worker.rebalance()
+        return gained, renewed, await redis.pttl("inverter_worker:shards:0")
+
+    gained, renewed, ttl = asyncio.run(run())
+
+    assert gained == set(range(8))
+    assert renewed == set()
+    assert ttl > 1000
+
+
+def test_held_lease_is_not_taken_until_it_expires(redis):
+    async def run():
+        a, b = _leased(redis, "a"), _leased(redis, "b")
+        await a.rebalance()
+        await b.rebalance()
+        # b joined, but a has not rebalanced yet and still holds b's shards.
+        blocked = set(b.owned)
+
+        await a.rebalance()
+        handed_over = await b.rebalance()
+        return blocked, handed_over, a.owned, b.owned
+
+    blocked, handed_over, a_owned, b_owned = asyncio.run(run())
+
+    assert blocked == set()
+    assert handed_over == b_owned
+    assert a_owned | b_owned == set(range(8))
+    assert not a_owned & b_owned
+
+
+def test_leases_of_a_dead_worker_expire_and_are_taken_over(redis):
+    async def run():
+        a, b = _leased(redis, "a"), _leased(redis, "b")
+        await a.rebalance()
+        await b.rebalance()
+        await a.rebalance()
+        await b.rebalance()
+        b_shards = set(b.owned)
+
+        # b dies: its membership and leases run out instead of being released.
+        await redis.pexpire("inverter_worker:members:b", 1)
+        for shard in b_shards:
+            await redis.pexpire(f"inverter_worker:shards:{shard}", 1)
+        await asyncio.sleep(0.01)
+
+        gained = await a.rebalance()
+        return b_shards, gained, a.owned, await _lease_holders(redis)
+
+    b_shards, gained, a_owned, holders = asyncio.run(run())
+
+    assert b_shards and gained == b_shards
+    assert a_owned == set(range(8))
+    assert set(holders.values()) == {b"a"}
+
+
+def test_released_leases_go_to_the_remaining_worker(redis):
+    async def run():
+        a, b = _leased(redis, "a"), _leased(redis, "b")
+        await a.rebalance()
+        await b.rebalance()
+        await a.rebalance()
+        await b.rebalance()
+        a_shards = set(a.owned)
+
+        await a.release_all()
+        released = await _lease_holders(redis)
+        gained = await b.rebalance()
+        return a_shards, released, gained, b.owned
+
+    a_shards, released, gained, b_owned = asyncio.run(run())
+
+    assert all(released[shard] is None for shard in a_shards)
+    assert gained == a_shards
+    assert b_owned == set(range(8))
+
+
+def test_lease_renewal_survives_a_failing_rebalance(monkeypatch):
+    inverter_service = pytest.importorskip(
+        "app.workers.inverter_service", reason="inverter worker modules are not installed"
+    )
+    monkeypatch.setattr(
+        inverter_service.worker_settings, "INVERTER_WORKER_SHARD_LEASE_SECONDS", 0.03
+    )
+    service = inverter_service.InverterWorkerService(interval_seconds=60, sharding_enabled=True)
+    calls = []
+
+    async def rebalance():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            raise RuntimeError("Redis went away")
+        if len(calls) == 3:
+            service.stop()
+
+    monkeypatch.setattr(service, "_rebalance_shards", rebalance)
+
+    async def run():
+        service._stop_event = asyncio.Event()
+        await asyncio.wait_for(service._keep_leases(), timeout=1)
+
+    asyncio.run(run())
+
+    assert len(calls) == 3
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.fernet import Fernet  # noqa: E402
+
+from app.workers.vendor_sessions import AdapterPool, VendorSessionStore  # noqa: E402
+from tests.mocks import FakeFusionSolar, FakeHuaweiAdapter  # noqa: E402
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values: dict[str, bytes] = {}
+        self.writes = 0
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.writes += 1
+        self.values[key] = value
+
+    async def expire(self, key, seconds):
+        return key in self.values
+
+
+def _user(user_id: int, password: str = "secret"):
+    return SimpleNamespace(
+        id=user_id, huawei_username=f"user{user_id}", huawei_password_encrypted=password
+    )
+
+
+@pytest.fixture
+def store():
+    return VendorSessionStore(FakeRedis(), Fernet(Fernet.generate_key()), ttl_seconds=1800)
+
+
+def test_store_encrypts_sessions(store):
+    async def run():
+        await store.save("huawei", "user1", {"token": "abc"})
+        return await store.load("huawei", "user1")
+
+    assert asyncio.run(run()) == {"token": "abc"}
+    assert b"abc" not in store.redis.values["vendor_session:huawei:user1"]
+
+
+def test_new_adapter_restores_stored_session_without_login(store):
+    vendor = FakeFusionSolar({"INV-1": 1000.0})
+
+    def build():
+        return FakeHuaweiAdapter(vendor.power_map, vendor)
+
+    async def run():
+        first_pool = AdapterPool()
+        adapter = await first_pool.get(_user(1), "huawei", store, build)
+        adapter.get_production("INV-1")
+        await first_pool.after_success(_user(1), store)
+
+        # A restarted worker picks the session up from Redis.
+        restarted_pool = AdapterPool()
+        restored = await restarted_pool.get(_user(1), "huawei", store, build)
+        production = restored.get_production("INV-1")
+        await restarted_pool.after_success(_user(1), store)
+        return restored, restarted_pool, production
+
+    restored, pool, production = asyncio.run(run())
+
+    assert production[0]["dataItemMap"]["active_power"] == 1000.0
+    assert restored.login_calls == 0
+    assert len(vendor.tokens) == 1
+    assert pool.restored == 1
+    assert store.redis.writes == 1
+
+
+def test_session_hooks_take_precedence_over_cookies(store):
+    class HookedAdapter(FakeHuaweiAdapter):
+        restored_with = None
+
+        def export_session(self):
+            return {"token": "abc"}
+
+        def restore_session(self, session):
+            self.restored_with = session
+
+    async def run():
+        await AdapterPool().get(_user(1), "huawei", store, HookedAdapter)
+        await store.save("huawei", "user1", {"token": "abc"})
+        return await AdapterPool().get(_user(1), "huawei", store, HookedAdapter)
+
+    assert asyncio.run(run()).restored_with == {"token": "abc"}
+
+
+def test_pool_evicts_least_recently_used_and_keys_on_credentials(store):
+    async def run():
+        pool = AdapterPool(max_size=2)
+        first = await pool.get(_user(1), "huawei", store, FakeHuaweiAdapter)
+        await pool.get(_user(2), "huawei", store, FakeHuaweiAdapter)
+        assert await pool.get(_user(1), "huawei", store, FakeHuaweiAdapter) is first
+        await pool.get(_user(3), "huawei", store, FakeHuaweiAdapter)
+        return pool, first
+
+    pool, first = asyncio.run(run())
+
+    assert len(pool) == 2
+    assert asyncio.run(pool.get(_user(1), "huawei", store, FakeHuaweiAdapter)) is first
+    changed = asyncio.run(pool.get(_user(1, "changed"), "huawei", store, FakeHuaweiAdapter))
+    assert changed is not first
+
+
+def test_adapter_is_built_off_the_event_loop(store):
+    threads = []
+
+    def build():
+        threads.append(threading.current_thread())
+        return FakeHuaweiAdapter()
+
+    asyncio.run(AdapterPool().get(_user(1), "huawei", store, build))
+
+    assert threads and threads[0] is not threading.main_thread()
@@ -0,0 +1,59 @@
+import json
+import logging
+
+import pytest
+
+from app.workers.worker_logging import EventSamplingFilter, JsonLogFormatter, parse_sampling
+
+
+def _record(event=None, level=logging.INFO, **extra):
+    record = logging.makeLogRecord(
+        {
+            "name": "app.workers.inverter_worker",
+            "levelno": level,
+            "levelname": "INFO",
+            "msg": "inverter %s: %s",
+            "args": ("INV-1", 1200.0),
+            **extra,
+        }
+    )
+    if event is not None:
+        record.event = event
+    return record
+
+
+def test_parse_sampling():
+    assert parse_sampling("plateau=10, published=5,") == {"plateau": 10, "published": 5}
+    with pytest.raises(ValueError):
+        parse_sampling("plateau=often")
+
+
+def test_filter_keeps_one_in_n_per_event_type():
+    sampling = EventSamplingFilter({"plateau": 3})
+
+    kept = [sampling.filter(_record("plateau")) for _ in range(7)]
+
+    assert kept == [True, False, False, True, False, False, True]
+    assert all(sampling.filter(_record("updated")) for _ in range(3))
+    assert sampling.filter(_record()) is True
+    assert sampling.dropped == 4
+
+
+def test_filter_rate_limits_each_event_type_but_never_warnings():
+    now = [0.0]
+    sampling = EventSamplingFilter(max_per_second=2, clock=lambda: now[0])
+
+    assert [sampling.filter(_record("plateau")) for _ in range(3)] == [True, True, False]
+    assert sampling.filter(_record("plateau", level=logging.WARNING)) is True
+    now[0] = 0.5
+    assert sampling.filter(_record("plateau")) is True
+    assert sampling.filter(_record("plateau")) is False
+
+
+def test_json_formatter_emits_extra_fields():
+    entry = json.loads(JsonLogFormatter().format(_record("updated", serial="INV-1")))
+
+    assert entry["msg"] == "inverter INV-1: 1200.0"
+    assert entry["event"] == "updated"
+    assert entry["serial"] == "INV-1"
+    assert entry["level"] == "INFO"